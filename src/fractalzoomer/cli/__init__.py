@@ -0,0 +1,20 @@
+# Command line interface: headless batch rendering of job files and animations
+from fractalzoomer.cli.animate import AnimationSpec, load_animation, render_animation
+from fractalzoomer.cli.batch import BatchSummary, JobResult, render_job, run_batch
+from fractalzoomer.cli.jobs import FRACTAL_TYPES, JobSpec, load_jobs
+from fractalzoomer.cli.main import build_parser, main
+
+__all__ = [
+    "AnimationSpec",
+    "BatchSummary",
+    "FRACTAL_TYPES",
+    "JobResult",
+    "JobSpec",
+    "build_parser",
+    "load_animation",
+    "load_jobs",
+    "main",
+    "render_animation",
+    "render_job",
+    "run_batch",
+]
@@ -0,0 +1,5 @@
+import sys
+
+from fractalzoomer.cli.main import main
+
+sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Zoom animation specifications for the headless renderer.
+
+An animation file (JSON or TOML) names the fractal, the frame size, the
+output and a list of keyframes:
+
+    fractal = "mandelbrot"
+    output = "zoom.gif"          # .gif, .png/.apng, or "frames/{:05d}.png"
+    size = [480, 320]
+    fps = 25
+
+    [[keyframes]]
+    frame = 0
+    center = [-0.5, 0.0]
+    zoom = 1
+    max_iter = 100
+
+    [[keyframes]]
+    frame = 250
+    center = [-0.743643, 0.131825]
+    zoom = 5000
+    max_iter = 1500
+
+Keyframe values left out are taken from the previous keyframe (the first one
+from the animation's defaults). Frames are streamed to the output as they
+are rendered (see AnimationRenderer).
+"""
+
+import json
+import tomllib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional, Union
+
+from fractalzoomer.cli.jobs import BASE_HALF_WIDTH, KEY_ALIASES, JobSpec, _convert
+from fractalzoomer.core import FractalSet
+from fractalzoomer.render import AnimationRenderer, Keyframe, View
+from fractalzoomer.render.animation import DEFAULT_REFERENCE_SCALE
+from fractalzoomer.utils.exporter import FractalExporter
+
+DEFAULT_FPS = 25.0
+
+# Keyframe fields and their types, in spec file terms
+KEYFRAME_FIELDS = {
+    "frame": int,
+    "center_x": float,
+    "center_y": float,
+    "zoom": float,
+    "max_iter": int,
+    "julia_c_real": float,
+    "julia_c_imag": float,
+}
+
+
+@dataclass(frozen=True)
+class AnimationSpec:
+    """One animation to render."""
+
+    job: JobSpec  # Fractal, output, frame size and the defaults of the first keyframe
+    keyframes: tuple[Keyframe, ...]
+    fps: float = DEFAULT_FPS
+    loop: int = 0
+    reference_scale: float = DEFAULT_REFERENCE_SCALE
+
+    def __post_init__(self) -> None:
+        if not self.keyframes:
+            raise ValueError("An animation needs at least one keyframe")
+        if self.fps <= 0:
+            raise ValueError("fps must be positive")
+        if self.reference_scale < 1:
+            raise ValueError("reference_scale must be at least 1")
+
+    @property
+    def frames(self) -> int:
+        """Get the number of frames of the animation."""
+        first: int = self.keyframes[0].frame
+        last: int = self.keyframes[-1].frame
+        return last - first + 1
+
+    @property
+    def base_view(self) -> View:
+        """Get the view at zoom 1, at the output size."""
+        return View(0.0, 0.0, BASE_HALF_WIDTH, BASE_HALF_WIDTH * self.job.aspect, self.job.width, self.job.height)
+
+    def engine(self) -> FractalSet:
+        """Build the engine of the animation."""
+        return self.job.engine()
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> "AnimationSpec":
+        """
+        Build a spec from the contents of an animation file.
+
+        Raises:
+            ValueError: If a value is invalid or the keyframes are missing.
+        """
+        data = dict(data)
+        entries = data.pop("keyframes", None)
+        if not isinstance(entries, list) or not entries:
+            raise ValueError("Animation has no keyframes")
+        try:
+            options = {
+                name: _convert(kind, data.pop(name))
+                for name, kind in (("fps", float), ("loop", int), ("reference_scale", float))
+                if name in data
+            }
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid animation value: {exc}") from None
+        job = JobSpec.from_mapping(data)
+
+        previous = {
+            "frame": 0, "center_x": job.center_x, "center_y": job.center_y, "zoom": job.zoom,
+            "max_iter": job.max_iter, "julia_c_real": job.julia_c_real, "julia_c_imag": job.julia_c_imag,
+        }
+        keyframes = []
+        for index, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                raise ValueError(f"Keyframe {index + 1} is not a table/object")
+            values = dict(previous)
+            if index > 0:
+                values["frame"] = None  # Frame numbers are never inherited
+            for key, value in entry.items():
+                if key == "center":
+                    values["center_x"], values["center_y"] = value
+                    continue
+                name = KEY_ALIASES.get(key, key)
+                if name not in KEYFRAME_FIELDS:
+                    raise ValueError(f"Unknown keyframe key: {key!r}")
+                values[name] = value
+            if values["frame"] is None:
+                raise ValueError(f"Keyframe {index + 1} is missing 'frame'")
+            try:
+                values = {name: _convert(KEYFRAME_FIELDS[name], value) for name, value in values.items()}
+            except (TypeError, ValueError) as exc:
+                raise ValueError(f"Keyframe {index + 1}: invalid value: {exc}") from None
+            keyframes.append(Keyframe(
+                values["frame"], values["center_x"], values["center_y"], values["zoom"], values["max_iter"],
+                values["julia_c_real"], values["julia_c_imag"]
+            ))
+            previous = values
+        keyframes.sort(key=lambda keyframe: keyframe.frame)
+        return cls(job, tuple(keyframes), **options)
+
+
+def load_animation(path: Union[str, Path], output_dir: Optional[Union[str, Path]] = None) -> AnimationSpec:
+    """
+    Read an animation file.
+
+    Args:
+        path: Animation file (.json or .toml).
+        output_dir: Directory a relative output path is resolved against
+            (the current directory if None).
+
+    Raises:
+        ValueError: If the file type is not supported or the animation is invalid.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        with open(path, encoding="utf-8") as stream:
+            document = json.load(stream)
+    elif suffix == ".toml":
+        with open(path, "rb") as stream:
+            document = tomllib.load(stream)
+    else:
+        raise ValueError(f"{path}: unsupported animation file type {path.suffix!r} (expected .json or .toml)")
+    if not isinstance(document, dict):
+        raise ValueError(f"{path}: an animation file must hold a table/object")
+    document.setdefault("output", f"{path.stem}.gif")
+    if output_dir is not None:
+        document["output"] = str(Path(output_dir) / document["output"])
+    try:
+        return AnimationSpec.from_mapping(document)
+    except ValueError as exc:
+        raise ValueError(f"{path}: {exc}") from None
+
+
+def render_animation(
+    spec: AnimationSpec,
+    workers: Optional[int] = None,
+    backend: Optional[str] = None,
+    progress: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Render an animation and stream its frames to spec.job.output.
+
+    Args:
+        spec: Animation to render.
+        workers: Frames rendered at the same time (defaults to the CPU count).
+        backend: Compute backend name (see fractalzoomer.core.backends).
+        progress: Called with the number of frames written after each frame.
+
+    Returns:
+        The number of frames written.
+    """
+    output = Path(spec.job.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    exporter = FractalExporter()
+    with AnimationRenderer(workers=workers, reference_scale=spec.reference_scale) as renderer, \
+            exporter.open_animation(str(output), duration=round(1000 / spec.fps), loop=spec.loop) as writer:
+        shade = exporter.shader(spec.job.palette, equalize=spec.job.equalize)
+        for frame in renderer.render(spec.engine(), spec.keyframes, spec.base_view, shade, backend):
+            writer.add_frame(frame)
+            if progress is not None:
+                progress(writer.frames)
+        frames: int = writer.frames
+        return frames
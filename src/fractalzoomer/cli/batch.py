@@ -0,0 +1,160 @@
+"""
+Batch execution of render jobs.
+
+Jobs run on a pool of worker processes, at most `concurrency` at a time; each
+job renders its frame with a few threads of its own (see ParallelRenderer) and
+writes the image itself, so only the spec and a short result cross the
+process boundary. Results are reported as jobs finish, and a summary gives
+the overall pixel throughput.
+
+TIFF outputs, and PNG outputs above POSTER_PIXELS, are rendered as posters:
+tile by tile, streamed to the file, so image size is not limited by memory.
+"""
+
+import multiprocessing as mp
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional, Sequence
+
+from fractalzoomer.cli.jobs import JobSpec
+from fractalzoomer.render import PosterRenderer
+from fractalzoomer.utils.exporter import FractalExporter
+
+
+# PNG images larger than this are streamed to disk tile by tile (TIFF images always are)
+POSTER_PIXELS = 4096 * 4096
+
+
+def is_poster(spec: JobSpec) -> bool:
+    """Whether a job is rendered tile by tile into a streaming writer."""
+    suffix = Path(spec.output).suffix.lower()
+    return suffix in (".tif", ".tiff") or (suffix == ".png" and spec.width * spec.height > POSTER_PIXELS)
+
+
+class JobResult(NamedTuple):
+    """Outcome of one job."""
+
+    spec: JobSpec
+    seconds: float  # Render and save time
+    error: Optional[str]  # Formatted traceback if the job failed
+
+
+class BatchSummary(NamedTuple):
+    """Totals of a batch run."""
+
+    jobs: int
+    failed: int
+    pixels: int  # Pixels of the jobs that succeeded
+    seconds: float  # Wall-clock time of the whole batch
+
+    @property
+    def pixels_per_second(self) -> float:
+        """Get the pixel throughput of the batch."""
+        return self.pixels / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def jobs_per_second(self) -> float:
+        """Get the job throughput of the batch."""
+        return (self.jobs - self.failed) / self.seconds if self.seconds > 0 else 0.0
+
+
+def render_job(spec: JobSpec, threads: int = 1, backend: Optional[str] = None) -> None:
+    """
+    Render a job and save its image (with metadata to re-render it) to spec.output.
+
+    Posters (see is_poster) are streamed to the file tile by tile.
+
+    Args:
+        spec: Job to render.
+        threads: Worker threads of the job's renderer.
+        backend: Compute backend name (see fractalzoomer.core.backends).
+    """
+    fractal = spec.engine()
+    output = Path(spec.output)
+    exporter = FractalExporter()
+    if is_poster(spec):
+        output.parent.mkdir(parents=True, exist_ok=True)
+        shade = exporter.shader(spec.palette, equalize=spec.equalize)
+        with PosterRenderer(workers=threads) as renderer, exporter.open_poster(
+            str(output), spec.width, spec.height, shade.channels, renderer.tile_size, metadata=spec.metadata()
+        ) as writer:
+            renderer.render(
+                fractal, spec.view, writer, shade, backend, antialias=spec.antialias,
+                equalize=shade.equalized if spec.equalize else None
+            )
+        return
+    output.parent.mkdir(parents=True, exist_ok=True)
+    exporter.export_view(
+        fractal, spec.view, str(output), spec.antialias, metadata=spec.metadata(), backend=backend,
+        workers=threads, colormap=spec.palette, equalize=spec.equalize
+    )
+
+
+# Run one job, turning failures into a result (runs in the worker processes)
+def _run_job(spec: JobSpec, threads: int, backend: Optional[str]) -> JobResult:
+    start = time.perf_counter()
+    try:
+        render_job(spec, threads, backend)
+    except Exception:
+        return JobResult(spec, time.perf_counter() - start, traceback.format_exc())
+    return JobResult(spec, time.perf_counter() - start, None)
+
+
+def run_batch(
+    jobs: Sequence[JobSpec],
+    concurrency: Optional[int] = None,
+    threads: Optional[int] = None,
+    backend: Optional[str] = None,
+    progress: Optional[Callable[[int, JobResult], None]] = None,
+    start_method: str = "spawn"
+) -> tuple[list[JobResult], BatchSummary]:
+    """
+    Render jobs on a process pool.
+
+    Args:
+        jobs: Jobs to render.
+        concurrency: Jobs running at the same time (defaults to the CPU
+            count). 1 renders in this process.
+        threads: Worker threads per job (defaults to the CPUs left to each
+            concurrent job).
+        backend: Compute backend name (see fractalzoomer.core.backends).
+        progress: Called with the number of finished jobs and the result of
+            each job as it finishes.
+        start_method: multiprocessing start method for the workers.
+
+    Returns:
+        Tuple of (results in job order, summary).
+    """
+    if concurrency is not None and concurrency <= 0:
+        raise ValueError("concurrency must be a positive integer")
+    if threads is not None and threads <= 0:
+        raise ValueError("threads must be a positive integer")
+    cpus = os.cpu_count() or 1
+    concurrency = min(concurrency or cpus, max(len(jobs), 1))
+    threads = threads or max(1, cpus // concurrency)
+
+    start = time.perf_counter()
+    results: list[Optional[JobResult]] = [None] * len(jobs)
+    if concurrency == 1:
+        for index, spec in enumerate(jobs):
+            result = _run_job(spec, threads, backend)
+            results[index] = result
+            if progress is not None:
+                progress(index + 1, result)
+    else:
+        with ProcessPoolExecutor(max_workers=concurrency, mp_context=mp.get_context(start_method)) as pool:
+            futures = {pool.submit(_run_job, spec, threads, backend): index for index, spec in enumerate(jobs)}
+            for done, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                results[futures[future]] = result
+                if progress is not None:
+                    progress(done, result)
+    seconds = time.perf_counter() - start
+
+    finished = [result for result in results if result is not None]
+    failed = sum(result.error is not None for result in finished)
+    pixels = sum(result.spec.width * result.spec.height for result in finished if result.error is None)
+    return finished, BatchSummary(len(jobs), failed, pixels, seconds)
@@ -0,0 +1,248 @@
+"""
+Render job specifications for the headless renderer.
+
+A job names a fractal type, the center of the view, the zoom level (in the
+UI's convention: 3.5 / visible width), the aspect ratio of the visible region
+(the UI's 1.0 / 1.75 unless the spec gives one), the image size, the iteration limit,
+the Julia constant, the anti-aliasing sub-samples, the palette (optionally
+histogram-equalized) and the output file. Jobs are read from JSON or TOML files,
+or from the metadata export_image writes into PNG files, so a saved image can
+be rendered again at another size or iteration count.
+"""
+
+import json
+import tomllib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping, Optional, Union, get_type_hints
+
+from PIL import Image
+
+from fractalzoomer.core import (
+    BurningShipSet,
+    DEFAULT_JULIA_C_IMAG,
+    DEFAULT_JULIA_C_REAL,
+    FractalSet,
+    JuliaSet,
+    MandelbrotSet,
+)
+from fractalzoomer.render import View
+from fractalzoomer.ui.coordinates import DEFAULT_HEIGHT, DEFAULT_WIDTH
+from fractalzoomer.utils.palettes import get_palette
+
+FRACTAL_TYPES = ("mandelbrot", "julia", "burning_ship")
+
+# Complex plane extent shown at zoom 1, as in the UI
+BASE_HALF_WIDTH = 1.75
+BASE_HALF_HEIGHT = 1.0
+
+DEFAULT_MAX_ITER = 256
+
+# Boolean values as strings (PNG metadata holds strings only)
+BOOLEAN_STRINGS = {"true": True, "yes": True, "1": True, "false": False, "no": False, "0": False}
+
+# Spec file keys accepted in place of the JobSpec field names (the PNG metadata keys among them)
+KEY_ALIASES = {
+    "fractal_type": "fractal",
+    "max_iterations": "max_iter",
+    "c_real": "julia_c_real",
+    "c_imag": "julia_c_imag",
+    "colormap": "palette",
+}
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    """One image to render."""
+
+    fractal: str
+    output: str
+    center_x: float = -0.5
+    center_y: float = 0.0
+    zoom: float = 1.0
+    aspect: float = BASE_HALF_HEIGHT / BASE_HALF_WIDTH  # Visible height / width of the complex plane
+    width: int = DEFAULT_WIDTH
+    height: int = DEFAULT_HEIGHT
+    max_iter: int = DEFAULT_MAX_ITER
+    julia_c_real: float = DEFAULT_JULIA_C_REAL
+    julia_c_imag: float = DEFAULT_JULIA_C_IMAG
+    antialias: int = 1  # Sub-samples per axis of pixels along edges (1 for none)
+    palette: str = "grayscale"  # Colour palette (see fractalzoomer.utils.palettes)
+    equalize: bool = False  # Colour by histogram equalization (see fractalzoomer.render.histogram)
+
+    def __post_init__(self) -> None:
+        if self.fractal not in FRACTAL_TYPES:
+            raise ValueError(f"Unknown fractal type {self.fractal!r} (expected one of {', '.join(FRACTAL_TYPES)})")
+        if not self.output:
+            raise ValueError("output must be a file path")
+        if self.zoom <= 0:
+            raise ValueError("zoom must be positive")
+        if self.aspect <= 0:
+            raise ValueError("aspect must be positive")
+        if self.width <= 0 or self.height <= 0:
+            raise ValueError("width and height must be positive integers")
+        if self.max_iter <= 0:
+            raise ValueError("max_iter must be a positive integer")
+        if self.antialias <= 0:
+            raise ValueError("antialias must be a positive integer")
+        get_palette(self.palette)
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any], strict: bool = True) -> "JobSpec":
+        """
+        Build a spec from a mapping of field names (or KEY_ALIASES) to values.
+
+        Values may be strings, as in PNG metadata; "center" and "size" may
+        give [x, y] and [width, height] pairs.
+
+        Args:
+            data: Field values.
+            strict: Reject keys that are not fields (off for PNG metadata,
+                which holds unrelated entries too).
+
+        Raises:
+            ValueError: If a key is unknown (strict only), a value cannot be
+                converted or a required field is missing.
+        """
+        types = get_type_hints(cls)
+        values: dict[str, Any] = {}
+        for key, value in data.items():
+            if key == "center":
+                values["center_x"], values["center_y"] = value
+                continue
+            if key == "size":
+                values["width"], values["height"] = value
+                continue
+            name = KEY_ALIASES.get(key, key)
+            if name in types:
+                values[name] = value
+            elif strict:
+                raise ValueError(f"Unknown job key: {key!r}")
+        for name in ("fractal", "output"):
+            if name not in values:
+                raise ValueError(f"Job is missing {name!r}")
+        try:
+            converted = {name: _convert(types[name], value) for name, value in values.items()}
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid job value: {exc}") from None
+        return cls(**converted)
+
+    @property
+    def view(self) -> View:
+        """Get the region and pixel grid to render (the region shape follows aspect, not the image size)."""
+        half_width = BASE_HALF_WIDTH / self.zoom
+        return View(
+            self.center_x, self.center_y,
+            half_width, half_width * self.aspect,
+            self.width, self.height
+        )
+
+    def engine(self) -> FractalSet:
+        """Build the engine that renders the job."""
+        if self.fractal == "mandelbrot":
+            return MandelbrotSet(max_iter=self.max_iter)
+        if self.fractal == "julia":
+            return JuliaSet(c_real=self.julia_c_real, c_imag=self.julia_c_imag, max_iter=self.max_iter)
+        return BurningShipSet(max_iter=self.max_iter)
+
+    def metadata(self) -> dict[str, str]:
+        """PNG metadata in the format export_image writes (and load_jobs reads back)."""
+        metadata = {
+            "fractal_type": self.fractal,
+            "center_x": str(self.center_x),
+            "center_y": str(self.center_y),
+            "zoom": str(self.zoom),
+            "aspect": str(self.aspect),
+            "max_iterations": str(self.max_iter),
+        }
+        if self.fractal == "julia":
+            metadata["julia_c_real"] = str(self.julia_c_real)
+            metadata["julia_c_imag"] = str(self.julia_c_imag)
+        if self.palette != "grayscale":
+            metadata["palette"] = self.palette
+        if self.equalize:
+            metadata["equalize"] = "true"
+        return metadata
+
+
+# Convert a spec value (possibly a string from PNG metadata) to a field type
+def _convert(kind: type, value: Any) -> Any:
+    if kind is bool and isinstance(value, str):
+        if value.strip().lower() not in BOOLEAN_STRINGS:
+            raise ValueError(f"{value!r} is not a boolean")
+        return BOOLEAN_STRINGS[value.strip().lower()]
+    if kind is int and isinstance(value, str):
+        return int(float(value))
+    if kind is int and isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"{value!r} is not an integer")
+    return kind(value)
+
+
+def load_jobs(path: Union[str, Path], output_dir: Optional[Union[str, Path]] = None) -> list[JobSpec]:
+    """
+    Read the jobs of a spec file.
+
+    JSON and TOML files hold one job, a list of jobs, or a "jobs" list whose
+    sibling keys are defaults for every job. A PNG file gives one job from
+    its export metadata, at the size of the image.
+
+    Jobs without an output are named after the spec file: <stem>.png
+    (<stem>-<n>.png for several jobs, <stem>-render.png for a PNG spec).
+
+    Args:
+        path: Spec file (.json, .toml or .png).
+        output_dir: Directory relative output paths are resolved against
+            (the current directory if None).
+
+    Returns:
+        The jobs, in file order.
+
+    Raises:
+        ValueError: If the file type is not supported or a job is invalid.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".png":
+        with Image.open(path) as image:
+            metadata = dict(getattr(image, "text", {}))
+            size = image.size
+        if "fractal_type" not in metadata:
+            raise ValueError(f"{path}: no fractal metadata (only images saved by FractalZoomer can be re-rendered)")
+        entries = [{"size": size, **metadata}]
+        defaults: dict[str, Any] = {}
+        strict = False
+    elif suffix in (".json", ".toml"):
+        if suffix == ".json":
+            with open(path, encoding="utf-8") as stream:
+                document = json.load(stream)
+        else:
+            with open(path, "rb") as stream:
+                document = tomllib.load(stream)
+        if isinstance(document, list):
+            entries, defaults = document, {}
+        elif isinstance(document, dict) and "jobs" in document:
+            defaults = {key: value for key, value in document.items() if key != "jobs"}
+            entries = document["jobs"]
+        else:
+            entries, defaults = [document], {}
+        strict = True
+    else:
+        raise ValueError(f"{path}: unsupported job file type {path.suffix!r} (expected .json, .toml or .png)")
+
+    jobs = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"{path}: job {index + 1} is not a table/object")
+        data = {**defaults, **entry}
+        if "output" not in data:
+            if suffix == ".png":
+                data["output"] = f"{path.stem}-render.png"
+            else:
+                data["output"] = f"{path.stem}-{index + 1}.png" if len(entries) > 1 else f"{path.stem}.png"
+        if output_dir is not None:
+            data["output"] = str(Path(output_dir) / data["output"])
+        try:
+            jobs.append(JobSpec.from_mapping(data, strict=strict))
+        except ValueError as exc:
+            raise ValueError(f"{path}: job {index + 1}: {exc}") from None
+    return jobs
@@ -0,0 +1,136 @@
+"""
+Command line entry point.
+
+    fractalzoomer                      launch the interactive UI
+    fractalzoomer render SPEC [...]    render job files without a display
+    fractalzoomer animate SPEC         render a keyframed zoom animation
+
+The UI (and tkinter) is only imported when it is launched, so rendering works
+on machines without a display or a Tk installation.
+"""
+
+import argparse
+import sys
+import time
+from typing import Optional, Sequence
+
+from fractalzoomer.cli.animate import load_animation, render_animation
+from fractalzoomer.cli.batch import JobResult, run_batch
+from fractalzoomer.cli.jobs import load_jobs
+from fractalzoomer.core.backends import available_backends
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser of the fractalzoomer command."""
+    parser = argparse.ArgumentParser(prog="fractalzoomer", description="Explore and render fractals.")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("ui", help="launch the interactive explorer (the default)")
+
+    render = commands.add_parser(
+        "render",
+        help="render job files headlessly",
+        description="Render the jobs of JSON/TOML job files, or re-render PNG images saved by the explorer.",
+    )
+    render.add_argument("specs", nargs="+", metavar="SPEC", help="job file (.json, .toml or .png)")
+    render.add_argument("-o", "--output-dir", help="directory relative output paths are resolved against")
+    render.add_argument(
+        "-j", "--jobs", type=int, default=None, metavar="N",
+        help="jobs rendered at the same time (default: CPU count)",
+    )
+    render.add_argument(
+        "-t", "--threads", type=int, default=None, metavar="N",
+        help="threads per job (default: CPUs left to each concurrent job)",
+    )
+    render.add_argument("--backend", choices=available_backends(), help="compute backend")
+    render.add_argument("-q", "--quiet", action="store_true", help="only print failures and the summary")
+
+    animate = commands.add_parser(
+        "animate",
+        help="render a zoom animation headlessly",
+        description="Render the frames of a keyframed animation file into a GIF, an APNG or numbered images.",
+    )
+    animate.add_argument("spec", metavar="SPEC", help="animation file (.json or .toml)")
+    animate.add_argument("-o", "--output-dir", help="directory a relative output path is resolved against")
+    animate.add_argument(
+        "-j", "--jobs", type=int, default=None, metavar="N",
+        help="frames rendered at the same time (default: CPU count)",
+    )
+    animate.add_argument("--backend", choices=available_backends(), help="compute backend")
+    animate.add_argument("-q", "--quiet", action="store_true", help="only print the summary")
+    return parser
+
+
+def render_command(args: argparse.Namespace) -> int:
+    """Run the render subcommand; returns the process exit status."""
+    try:
+        jobs = [job for spec in args.specs for job in load_jobs(spec, args.output_dir)]
+    except (OSError, ValueError) as exc:
+        print(f"fractalzoomer render: error: {exc}", file=sys.stderr)
+        return 2
+
+    def report(done: int, result: JobResult) -> None:
+        spec = result.spec
+        status = "failed" if result.error is not None else f"{result.seconds:.2f} s"
+        if result.error is not None or not args.quiet:
+            print(f"[{done}/{len(jobs)}] {spec.fractal} {spec.width}x{spec.height} -> {spec.output} ({status})")
+        if result.error is not None:
+            print(result.error, file=sys.stderr)
+
+    try:
+        _, summary = run_batch(jobs, args.jobs, args.threads, args.backend, progress=report)
+    except ValueError as exc:
+        print(f"fractalzoomer render: error: {exc}", file=sys.stderr)
+        return 2
+    print(
+        f"Rendered {summary.jobs - summary.failed}/{summary.jobs} jobs"
+        f"{f' ({summary.failed} failed)' if summary.failed else ''}: "
+        f"{summary.pixels / 1e6:.2f} Mpixel in {summary.seconds:.2f} s, "
+        f"{summary.pixels_per_second / 1e6:.2f} Mpixel/s, {summary.jobs_per_second:.2f} jobs/s"
+    )
+    return 1 if summary.failed else 0
+
+
+def animate_command(args: argparse.Namespace) -> int:
+    """Run the animate subcommand; returns the process exit status."""
+    try:
+        spec = load_animation(args.spec, args.output_dir)
+        if args.jobs is not None and args.jobs <= 0:
+            raise ValueError("jobs must be a positive integer")
+    except (OSError, ValueError) as exc:
+        print(f"fractalzoomer animate: error: {exc}", file=sys.stderr)
+        return 2
+
+    def report(done: int) -> None:
+        if not args.quiet:
+            print(f"\r[{done}/{spec.frames}] {spec.job.output}", end="", flush=True)
+
+    start = time.perf_counter()
+    try:
+        frames = render_animation(spec, args.jobs, args.backend, progress=report)
+    except (OSError, ValueError) as exc:
+        print(f"\nfractalzoomer animate: error: {exc}", file=sys.stderr)
+        return 1
+    seconds = time.perf_counter() - start
+    if not args.quiet:
+        print()
+    print(
+        f"Rendered {frames} frames of {spec.job.width}x{spec.job.height} to {spec.job.output} "
+        f"in {seconds:.2f} s, {frames / seconds if seconds > 0 else 0.0:.2f} frames/s"
+    )
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Parse the command line and run the selected command."""
+    args = build_parser().parse_args(argv)
+    if args.command == "render":
+        return render_command(args)
+    if args.command == "animate":
+        return animate_command(args)
+    from fractalzoomer.ui.app import main as launch_ui
+    launch_ui()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,4 @@
-from .base import FractalSet
+from .base import FractalSet, EscapeResult, EscapeState, DEFAULT_ESCAPE_RADIUS, OUTPUT_MODES, count_dtype
 from .mandelbrot import MandelbrotSet
 from .julia import JuliaSet, DEFAULT_JULIA_C_REAL, DEFAULT_JULIA_C_IMAG
 from .burning_ship import BurningShipSet
@@ -9,6 +9,11 @@ JULIA_CI = DEFAULT_JULIA_C_IMAG
 
 __all__ = [
     "FractalSet",
+    "EscapeResult",
+    "EscapeState",
+    "DEFAULT_ESCAPE_RADIUS",
+    "OUTPUT_MODES",
+    "count_dtype",
     "MandelbrotSet",
     "JuliaSet",
     "BurningShipSet",
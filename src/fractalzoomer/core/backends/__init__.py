@@ -0,0 +1,104 @@
+"""
+Compute backend registry.
+
+Backends implement the escape-time loop behind FractalSet.compute_array. The
+backend is chosen per call (``backend=...``), else from the
+FRACTALZOOMER_BACKEND environment variable, else DEFAULT_BACKEND. Backends
+whose optional dependency is missing fall back to NumPy with a warning.
+"""
+
+import os
+import warnings
+from typing import Callable, Optional
+
+from .base import ComputeBackend, FORMULAS
+from .buffers import BufferPool, PoolStats
+from .numpy_backend import NumpyBackend
+
+# Environment variable selecting the default backend
+BACKEND_ENV_VAR = "FRACTALZOOMER_BACKEND"
+DEFAULT_BACKEND = "numpy"
+
+_factories: dict[str, Callable[[], ComputeBackend]] = {}
+_instances: dict[str, ComputeBackend] = {}
+
+
+def register_backend(name: str, factory: Callable[[], ComputeBackend]) -> None:
+    """
+    Register a backend factory under a name.
+
+    Args:
+        name: Name used to select the backend.
+        factory: Zero-argument callable building the backend. It may raise
+            ImportError when an optional dependency is missing.
+    """
+    _factories[name] = factory
+    _instances.pop(name, None)
+
+
+def available_backends() -> list[str]:
+    """Return the names of registered backends that can actually be loaded."""
+    names = []
+    for name in _factories:
+        try:
+            _load(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_backend(name: Optional[str] = None) -> ComputeBackend:
+    """
+    Resolve a backend by name.
+
+    Args:
+        name: Backend name. None uses FRACTALZOOMER_BACKEND, then DEFAULT_BACKEND.
+
+    Returns:
+        The (cached) backend instance.
+
+    Raises:
+        ValueError: If no backend is registered under the name.
+    """
+    if name is None:
+        name = os.environ.get(BACKEND_ENV_VAR) or DEFAULT_BACKEND
+    if name not in _factories:
+        raise ValueError(f"Unknown compute backend: {name}")
+    try:
+        return _load(name)
+    except ImportError as exc:
+        warnings.warn(
+            f"Compute backend {name!r} is unavailable ({exc}); falling back to {DEFAULT_BACKEND!r}",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return _load(DEFAULT_BACKEND)
+
+
+def _load(name: str) -> ComputeBackend:
+    if name not in _instances:
+        _instances[name] = _factories[name]()
+    return _instances[name]
+
+
+def _numba_factory() -> ComputeBackend:
+    from .numba_backend import NumbaBackend
+    return NumbaBackend()
+
+
+register_backend("numpy", NumpyBackend)
+register_backend("numba", _numba_factory)
+
+__all__ = [
+    "ComputeBackend",
+    "BufferPool",
+    "PoolStats",
+    "NumpyBackend",
+    "FORMULAS",
+    "BACKEND_ENV_VAR",
+    "DEFAULT_BACKEND",
+    "register_backend",
+    "available_backends",
+    "get_backend",
+]
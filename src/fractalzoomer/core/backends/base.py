@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+import numpy as np
+
+# Iteration formulas understood by every backend:
+#   quadratic     z -> z^2 + c                      (Mandelbrot, Julia)
+#   burning_ship  z -> (|Re z| + i|Im z|)^2 + c     (Burning Ship)
+FORMULAS = ("quadratic", "burning_ship")
+
+
+# Abstract base class for escape-time compute backends
+class ComputeBackend(ABC):
+
+    # Name the backend is registered under
+    name: str = ""
+
+# Iterate formula on flat complex64 or complex128 arrays z and c (same dtype, left unmodified)
+# with bailout.
+# Returns the value each point escaped with (or reached after max_iter) and the escape
+# iteration, max_iter for points that stayed bounded. escape_radius None disables bailout.
+# periodicity_tol enables cycle detection: orbits found to repeat within the tolerance are
+# retired early as bounded (their z is then a point of the cycle, not the value at max_iter).
+    @abstractmethod
+    def escape_time(
+        self,
+        formula: str,
+        z: np.ndarray,
+        c: np.ndarray,
+        max_iter: int,
+        escape_radius: Optional[float],
+        counts_dtype: np.dtype,
+        periodicity_tol: Optional[float] = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        pass
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
@@ -0,0 +1,109 @@
+"""
+Scratch buffer pool.
+
+The NumPy backend iterates on split real and imaginary planes that are
+updated in place with out= ufunc calls, so an iteration allocates nothing.
+The planes themselves are borrowed from a pool held by the backend, which
+every engine and renderer shares: the bands and tiles of a frame, and the
+frames that follow at the same size, reuse the same memory instead of
+allocating and freeing several full-size arrays per call.
+
+Buffers are keyed by element count and dtype. Returned buffers are kept up
+to a byte budget; beyond it, the least recently used sizes are dropped.
+"""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple
+
+import numpy as np
+
+# Bytes of idle buffers a pool keeps by default
+DEFAULT_POOL_BYTES = 256 << 20
+
+
+class PoolStats(NamedTuple):
+    """Buffer pool counters."""
+
+    hits: int  # Buffers served from the pool
+    misses: int  # Buffers allocated because none of the size was idle
+    idle_bytes: int  # Bytes of the buffers currently kept in the pool
+
+
+class BufferPool:
+    """Thread-safe pool of flat scratch arrays."""
+
+    def __init__(self, max_bytes: int = DEFAULT_POOL_BYTES):
+        """
+        Initialize the pool.
+
+        Args:
+            max_bytes: Bytes of idle buffers kept for reuse (0 keeps none).
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative")
+        self._max_bytes = max_bytes
+        self._free: OrderedDict[tuple[int, str], list[np.ndarray]] = OrderedDict()
+        self._idle_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_bytes(self) -> int:
+        """Get the byte budget of idle buffers."""
+        return self._max_bytes
+
+    @property
+    def stats(self) -> PoolStats:
+        """Get the pool counters."""
+        with self._lock:
+            return PoolStats(self._hits, self._misses, self._idle_bytes)
+
+    def take(self, size: int, dtype: np.dtype) -> np.ndarray:
+        """Get an uninitialized flat array of size elements, reused if one is idle."""
+        dtype = np.dtype(dtype)
+        key = (size, dtype.str)
+        with self._lock:
+            idle = self._free.get(key)
+            if idle:
+                buffer = idle.pop()
+                self._idle_bytes -= buffer.nbytes
+                self._free.move_to_end(key)
+                self._hits += 1
+                return buffer
+            self._misses += 1
+        return np.empty(size, dtype=dtype)
+
+    def give(self, buffer: np.ndarray) -> None:
+        """Return an array obtained from take (it must no longer be used)."""
+        if buffer.nbytes > self._max_bytes:
+            return
+        key = (buffer.size, buffer.dtype.str)
+        with self._lock:
+            self._free.setdefault(key, []).append(buffer)
+            self._free.move_to_end(key)
+            self._idle_bytes += buffer.nbytes
+            # Drop the buffers of the least recently used sizes first
+            while self._idle_bytes > self._max_bytes:
+                oldest, idle = next(iter(self._free.items()))
+                self._idle_bytes -= idle.pop().nbytes
+                if not idle:
+                    del self._free[oldest]
+
+    @contextmanager
+    def borrow(self, size: int, dtype: np.dtype, count: int) -> Iterator[list[np.ndarray]]:
+        """Context manager lending count uninitialized arrays of size elements."""
+        buffers = [self.take(size, dtype) for _ in range(count)]
+        try:
+            yield buffers
+        finally:
+            for buffer in buffers:
+                self.give(buffer)
+
+    def clear(self) -> None:
+        """Drop every idle buffer."""
+        with self._lock:
+            self._free.clear()
+            self._idle_bytes = 0
@@ -0,0 +1,95 @@
+from typing import Optional
+import numpy as np
+import numba  # Optional dependency: importing this module fails without it
+from .base import ComputeBackend
+
+
+# Per-pixel escape loops with optional Brent cycle detection. They are plain Python at module
+# level so numba can cache the compiled machine code on disk (next to this file, or under
+# NUMBA_CACHE_DIR).
+def _quadratic_kernel(z, c, max_iter, radius_sq, tol_sq, z_out, counts):
+    for i in range(z.size):
+        zr = z[i].real
+        zi = z[i].imag
+        cr = c[i].real
+        ci = c[i].imag
+        n = max_iter
+        saved_r = zr
+        saved_i = zi
+        checkpoint = 1
+        for k in range(1, max_iter + 1):
+            zr, zi = zr * zr - zi * zi + cr, (zr + zr) * zi + ci
+            if zr * zr + zi * zi > radius_sq:
+                n = k
+                break
+            # Brent cycle detection, disabled when tol_sq <= 0
+            if tol_sq > 0:
+                if k == checkpoint:
+                    saved_r = zr
+                    saved_i = zi
+                    checkpoint *= 2
+                elif (zr - saved_r) * (zr - saved_r) + (zi - saved_i) * (zi - saved_i) < tol_sq:
+                    break
+        z_out[i] = complex(zr, zi)
+        counts[i] = n
+
+
+def _burning_ship_kernel(z, c, max_iter, radius_sq, tol_sq, z_out, counts):
+    for i in range(z.size):
+        zr = z[i].real
+        zi = z[i].imag
+        cr = c[i].real
+        ci = c[i].imag
+        n = max_iter
+        saved_r = zr
+        saved_i = zi
+        checkpoint = 1
+        for k in range(1, max_iter + 1):
+            zr = abs(zr)
+            zi = abs(zi)
+            zr, zi = zr * zr - zi * zi + cr, (zr + zr) * zi + ci
+            if zr * zr + zi * zi > radius_sq:
+                n = k
+                break
+            # Brent cycle detection, disabled when tol_sq <= 0
+            if tol_sq > 0:
+                if k == checkpoint:
+                    saved_r = zr
+                    saved_i = zi
+                    checkpoint *= 2
+                elif (zr - saved_r) * (zr - saved_r) + (zi - saved_i) * (zi - saved_i) < tol_sq:
+                    break
+        z_out[i] = complex(zr, zi)
+        counts[i] = n
+
+
+# JIT-compiled per-pixel backend. Kernels release the GIL so they can run on threads.
+class NumbaBackend(ComputeBackend):
+
+    name = "numba"
+
+    def __init__(self) -> None:
+        jit = numba.njit(cache=True, nogil=True)
+        self._kernels = {
+            "quadratic": jit(_quadratic_kernel),
+            "burning_ship": jit(_burning_ship_kernel),
+        }
+
+    def escape_time(
+        self,
+        formula: str,
+        z: np.ndarray,
+        c: np.ndarray,
+        max_iter: int,
+        escape_radius: Optional[float],
+        counts_dtype: np.dtype,
+        periodicity_tol: Optional[float] = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        kernel = self._kernels[formula]
+        real_type = z.real.dtype.type
+        radius_sq = np.inf if escape_radius is None else escape_radius * escape_radius
+        tol_sq = 0.0 if periodicity_tol is None else periodicity_tol * periodicity_tol
+        z_out = np.empty_like(z)
+        counts = np.empty(z.size, dtype=counts_dtype)
+        kernel(z, c, max_iter, real_type(radius_sq), real_type(tol_sq), z_out, counts)
+        return z_out, counts
@@ -0,0 +1,159 @@
+from typing import Optional
+import numpy as np
+from .base import ComputeBackend, FORMULAS
+from .buffers import BufferPool
+
+
+# One iteration z -> f(z) + c on split planes, in place. zr2 and zi2 hold the squares of the current
+# z on entry and of the new z on exit; tmp is scratch. Both formulas share the real part
+# Re z^2 - Im z^2 + Re c (squares ignore signs), and Burning Ship's imaginary part
+# 2 |Re z| |Im z| + Im c is 2 |Re z Im z| + Im c. Returns the planes now holding Im z and the scratch.
+def _step(
+    abs_product: bool,
+    zr: np.ndarray,
+    zi: np.ndarray,
+    cr: np.ndarray,
+    ci: np.ndarray,
+    zr2: np.ndarray,
+    zi2: np.ndarray,
+    tmp: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    np.multiply(zr, zi, out=tmp)
+    if abs_product:
+        np.abs(tmp, out=tmp)
+    tmp += tmp
+    tmp += ci
+    np.subtract(zr2, zi2, out=zr)
+    zr += cr
+    np.multiply(zr, zr, out=zr2)
+    np.multiply(tmp, tmp, out=zi2)
+    return tmp, zi
+
+
+# Keep the first count elements selected by keep at the front of a plane, and return them
+def _compact(plane: np.ndarray, keep: np.ndarray, count: int) -> np.ndarray:
+    plane[:count] = plane[keep]
+    return plane[:count]
+
+
+# Vectorized NumPy backend, always available
+class NumpyBackend(ComputeBackend):
+
+    name = "numpy"
+
+    def __init__(self, pool: Optional[BufferPool] = None):
+        # Scratch planes are borrowed from the pool, so calls of the same size reuse their memory
+        self.pool = pool if pool is not None else BufferPool()
+
+# z and c are split into real and imaginary planes updated in place with out= ufunc calls, so an
+# iteration allocates nothing. Escaped points are frozen at the value they escaped with and parked
+# at z = c = 0 (a fixed point of every formula); the active set is compacted once enough of it is
+# parked, so work follows the number of points that are still bounded. With periodicity_tol, the
+# orbit is checkpointed at iterations 1, 2, 4, 8, ... (Brent) and points that come back within the
+# tolerance of their checkpoint are on a cycle: they are retired as interior.
+    def escape_time(
+        self,
+        formula: str,
+        z: np.ndarray,
+        c: np.ndarray,
+        max_iter: int,
+        escape_radius: Optional[float],
+        counts_dtype: np.dtype,
+        periodicity_tol: Optional[float] = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        if formula not in FORMULAS:
+            raise KeyError(formula)
+        abs_product = formula == "burning_ship"
+        z_out = z.copy()
+        counts = np.full(z.size, max_iter, dtype=counts_dtype)
+        if z.size == 0:
+            return z_out, counts
+
+        real_dtype = z.real.dtype
+        real_type = real_dtype.type
+        detect_cycles = escape_radius is not None and periodicity_tol is not None
+        with self.pool.borrow(z.size, real_dtype, 10 if detect_cycles else 7) as planes, \
+                self.pool.borrow(z.size, np.dtype(bool), 3) as masks:
+            zr, zi, cr, ci, zr2, zi2, tmp = planes[:7]
+            np.copyto(zr, z.real)
+            np.copyto(zi, z.imag)
+            np.copyto(cr, c.real)
+            np.copyto(ci, c.imag)
+            np.multiply(zr, zr, out=zr2)
+            np.multiply(zi, zi, out=zi2)
+
+            if escape_radius is None:
+                for _ in range(max_iter):
+                    zi, tmp = _step(abs_product, zr, zi, cr, ci, zr2, zi2, tmp)
+                z_out.real = zr
+                z_out.imag = zi
+                return z_out, counts
+
+            radius_sq = real_type(escape_radius * escape_radius)
+            retire, live, cycle = masks
+            live[:] = True
+            active = np.arange(z.size)
+            n_live = z.size
+
+            tol_sq = real_type(periodicity_tol ** 2 if periodicity_tol is not None else 0.0)
+            checkpoint = 1
+            if detect_cycles:
+                saved_r, saved_i, spare = planes[7:]
+
+            for n in range(1, max_iter + 1):
+                zi, tmp = _step(abs_product, zr, zi, cr, ci, zr2, zi2, tmp)
+                np.add(zr2, zi2, out=tmp)
+                np.greater(tmp, radius_sq, out=retire)
+                # Positions of the retiring points: parking and recording them only touches those
+                retiring = np.flatnonzero(retire)
+                if retiring.size:
+                    escaped_idx = active[retiring]
+                    z_out.real[escaped_idx] = zr[retiring]
+                    z_out.imag[escaped_idx] = zi[retiring]
+                    counts[escaped_idx] = n
+
+                if detect_cycles:
+                    if n == checkpoint:
+                        np.copyto(saved_r, zr)
+                        np.copyto(saved_i, zi)
+                        checkpoint *= 2
+                    else:
+                        np.subtract(zr, saved_r, out=tmp)
+                        tmp *= tmp
+                        np.subtract(zi, saved_i, out=spare)
+                        spare *= spare
+                        tmp += spare
+                        np.less(tmp, tol_sq, out=cycle)
+                        cycle &= live
+                        np.greater(cycle, retire, out=cycle)  # cycle and not retire
+                        cycling = np.flatnonzero(cycle)
+                        if cycling.size:
+                            # Counts stay at max_iter: these points never escape
+                            cycle_idx = active[cycling]
+                            z_out.real[cycle_idx] = zr[cycling]
+                            z_out.imag[cycle_idx] = zi[cycling]
+                            retiring = np.concatenate([retiring, cycling])
+
+                if retiring.size == 0:
+                    continue
+                for plane in (zr, zi, cr, ci, zr2, zi2):
+                    plane[retiring] = 0
+                live[retiring] = False
+                n_live -= retiring.size
+                if n_live == 0:
+                    return z_out, counts
+                # Compact once a quarter of the active set is parked
+                if n_live < 0.75 * active.size:
+                    active = active[live]
+                    zr, zi, cr, ci, zr2, zi2 = (_compact(plane, live, n_live) for plane in (zr, zi, cr, ci, zr2, zi2))
+                    if detect_cycles:
+                        saved_r, saved_i = (_compact(plane, live, n_live) for plane in (saved_r, saved_i))
+                        spare = spare[:n_live]
+                    tmp = tmp[:n_live]
+                    retire, cycle = retire[:n_live], cycle[:n_live]
+                    live = live[:n_live]
+                    live[:] = True
+            remaining = active[live]
+            z_out.real[remaining] = zr[live]
+            z_out.imag[remaining] = zi[live]
+        return z_out, counts
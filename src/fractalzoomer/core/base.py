@@ -1,25 +1,106 @@
 from abc import ABC, abstractmethod
+from typing import NamedTuple, Optional
 import numpy as np
+from .backends import get_backend
+from .precision import complex_dtype, validate_precision
 
-#Abstract base class for fractal sets computation 
+# Orbits leaving the disk of radius 2 are guaranteed to diverge
+DEFAULT_ESCAPE_RADIUS = 2.0
+
+# Values accepted by compute_array(output=...)
+OUTPUT_MODES = ("z", "counts", "smooth")
+
+
+# Per-pixel results of one escape-time pass
+class EscapeResult(NamedTuple):
+    z: np.ndarray  # complex64/complex128, value at escape (or after max_iter for bounded points)
+    counts: np.ndarray  # uint16/uint32, escape iteration, max_iter for bounded points
+    smooth: np.ndarray  # float32, normalized (continuous) iteration count
+
+
+# Per-pixel progress of an escape-time computation that can be continued to more iterations
+# (see FractalSet.compute_state). Escaped and known-interior points are final; active points
+# are still bounded after `iterations` steps and resume from their current z.
+class EscapeState(NamedTuple):
+    z: np.ndarray  # complex64/complex128, value at escape, or after `iterations` steps for active points
+    c: np.ndarray  # Constant of every point (same shape and dtype as z)
+    counts: np.ndarray  # uint32, escape iteration of escaped points (undefined elsewhere)
+    escaped: np.ndarray  # bool, the point has escaped
+    active: np.ndarray  # bool, the point is still iterating (neither escaped nor known interior)
+    iterations: int  # Iterations every active point has run
+
+
+# Smallest unsigned dtype able to hold counts up to max_iter
+def count_dtype(max_iter: int) -> np.dtype:
+    if max_iter <= np.iinfo(np.uint16).max:
+        return np.dtype(np.uint16)
+    return np.dtype(np.uint32)
+
+
+#Abstract base class for fractal sets computation
 class FractalSet(ABC):
 
-    def __init__(self, max_iter: int = 256):
+    # Iteration formula the compute backends run for this fractal (see backends.FORMULAS)
+    formula: str = ""
+
+    # Bailout is on by default: with escape_radius set, compute_array(points) freezes z at the
+    # first iterate outside the radius instead of running every point for max_iter iterations
+    # (bounded points are unaffected). escape_radius=None restores the full-length iteration.
+    def __init__(
+        self,
+        max_iter: int = 256,
+        escape_radius: Optional[float] = DEFAULT_ESCAPE_RADIUS,
+        precision: str = "auto",
+        periodicity_tol: Optional[float] = None
+    ):
         if max_iter <= 0:
             raise ValueError("max_iter must be a positive integer")
+        if escape_radius is not None and escape_radius <= 0:
+            raise ValueError("escape_radius must be positive or None")
         self._max_iter = max_iter
+        self._escape_radius = escape_radius
+        self._precision = validate_precision(precision)
+        self.periodicity_tol = periodicity_tol
 
     @property
     def max_iter(self) -> int:
         """Get the maximum iteration count."""
         return self._max_iter
+
+    @property
+    def escape_radius(self) -> Optional[float]:
+        """Get the bailout radius (None iterates every point for max_iter)."""
+        return self._escape_radius
+
+    @property
+    def precision(self) -> str:
+        """Get the precision policy ("float32", "float64" or "auto")."""
+        return self._precision
+
+    @precision.setter
+    def precision(self, precision: str) -> None:
+        self._precision = validate_precision(precision)
+
+    @property
+    def periodicity_tol(self) -> Optional[float]:
+        """Get the cycle detection tolerance (None disables periodicity checking)."""
+        return self._periodicity_tol
+
+    @periodicity_tol.setter
+    def periodicity_tol(self, tol: Optional[float]) -> None:
+        if tol is not None and tol <= 0:
+            raise ValueError("periodicity_tol must be positive or None")
+        self._periodicity_tol = tol
 #Compute fractal for a single point
     @abstractmethod
     def compute(self, point: np.complex64) -> np.complex64:
         pass
-#Compute the fractal iteration for an array of complex points
+#Compute the fractal iteration for an array of complex points. output selects the final z (the
+#value at escape for escaping points, see __init__), the escape iteration counts or the smooth
+#iteration counts (see OUTPUT_MODES); backend names the compute backend, defaulting to
+#FRACTALZOOMER_BACKEND or numpy
     @abstractmethod
-    def compute_array(self, points: np.ndarray) -> np.ndarray:
+    def compute_array(self, points: np.ndarray, output: str = "z", backend: Optional[str] = None) -> np.ndarray:
         pass
 #Get current parameters of the fractal
     @abstractmethod
@@ -28,4 +109,141 @@ class FractalSet(ABC):
 #Set parameters of the fractal
     @abstractmethod
     def set_parameters(self, **kwargs) -> None:
-        pass
\ No newline at end of file
+        pass
+#Compute final z, escape counts and smooth counts for an array of points in a single pass
+    def compute_escape(self, points: np.ndarray, backend: Optional[str] = None) -> EscapeResult:
+        if self._escape_radius is None:
+            raise ValueError("Iteration count output requires an escape_radius")
+        z, c = self._start(self._working_points(points))
+        return self._escape_time(z, c, smooth=True, backend=backend)
+#Resumable variant of compute_escape: run the points for max_iter iterations and keep what is
+#needed to continue them later (see resume) or to derive any lower max_iter (see from_state)
+    def compute_state(self, points: np.ndarray, backend: Optional[str] = None) -> EscapeState:
+        if self._escape_radius is None:
+            raise ValueError("Resumable iteration requires an escape_radius")
+        points = self._working_points(points)
+        z, c = self._start(points)
+        c = np.ascontiguousarray(np.broadcast_to(c, z.shape), dtype=z.dtype)
+        interior = self._known_interior(points)
+        active = np.ones(z.shape, dtype=bool) if interior is None else ~interior
+        state = EscapeState(
+            np.array(z, copy=True), c, np.zeros(z.shape, dtype=np.uint32),
+            np.zeros(z.shape, dtype=bool), active, 0
+        )
+        return self.resume(state, backend=backend)
+#Continue the active points of a state up to max_iter iterations (this engine's max_iter if
+#None). The state is not modified; a state already past max_iter is returned as is.
+    def resume(self, state: EscapeState, max_iter: Optional[int] = None, backend: Optional[str] = None) -> EscapeState:
+        if self._escape_radius is None:
+            raise ValueError("Resumable iteration requires an escape_radius")
+        max_iter = self._max_iter if max_iter is None else max_iter
+        extra = max_iter - state.iterations
+        if extra <= 0:
+            return state
+        z, counts = state.z.copy(), state.counts.copy()
+        escaped, active = state.escaped.copy(), state.active.copy()
+        todo = np.flatnonzero(active)
+        if todo.size:
+            z_out, steps = get_backend(backend).escape_time(
+                self.formula, z.ravel()[todo], state.c.ravel()[todo], extra, self._escape_radius,
+                count_dtype(extra), self._periodicity_tol
+            )
+            # Bounded points end inside the bailout disk, escaped ones outside it (counts alone
+            # cannot tell escaping on the last iteration from staying bounded)
+            radius_sq = z_out.real.dtype.type(self._escape_radius * self._escape_radius)
+            done = (z_out.real * z_out.real + z_out.imag * z_out.imag) > radius_sq
+            z.ravel()[todo] = z_out
+            counts.ravel()[todo[done]] = steps[done].astype(np.uint32) + state.iterations
+            escaped.ravel()[todo[done]] = True
+            active.ravel()[todo[done]] = False
+        return EscapeState(z, state.c, counts, escaped, active, max_iter)
+#Escape counts or smooth counts at max_iter (this engine's max_iter if None), derived from a state
+#that has run at least that many iterations without iterating again
+    def from_state(self, state: EscapeState, output: str = "counts", max_iter: Optional[int] = None) -> np.ndarray:
+        if output not in ("counts", "smooth"):
+            raise ValueError(f"Unsupported output mode for a resumable state: {output}")
+        max_iter = self._max_iter if max_iter is None else max_iter
+        if max_iter > state.iterations:
+            raise ValueError(f"State has run {state.iterations} iterations, fewer than max_iter={max_iter}")
+        escaped = state.escaped & (state.counts <= max_iter)
+        counts = np.where(escaped, state.counts, max_iter).astype(count_dtype(max_iter))
+        if output == "counts":
+            return counts
+        return self._smooth_counts(state.z, counts, max_iter)
+#Initial z and constant c for an array of points
+    def _start(self, points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        raise NotImplementedError
+#Points known analytically never to escape (None if the engine has no such test). Like cycle
+#detection, this shortcut is only taken when the final z is not requested.
+    def _known_interior(self, points: np.ndarray) -> Optional[np.ndarray]:
+        return None
+# Shared implementation of compute_array for the escape-time engines
+    def _compute(self, points: np.ndarray, output: str, backend: Optional[str]) -> np.ndarray:
+        if output not in OUTPUT_MODES:
+            raise ValueError(f"Unsupported output mode: {output}")
+        if output != "z" and self._escape_radius is None:
+            raise ValueError("Iteration count output requires an escape_radius")
+        points = self._working_points(points)
+        z, c = self._start(points)
+        shortcuts = output != "z"
+        result = self._escape_time(
+            z, c, smooth=output == "smooth", backend=backend,
+            interior=self._known_interior(points) if shortcuts else None,
+            periodicity=shortcuts
+        )
+        frame: np.ndarray = getattr(result, output)
+        return frame
+# Cast points to the working precision. "auto" keeps double precision input (the renderers
+# pick the grid dtype from the pixel spacing) and uses single precision otherwise.
+    def _working_points(self, points: np.ndarray) -> np.ndarray:
+        points = np.asarray(points)
+        dtype: np.dtype
+        if self._precision == "float32":
+            dtype = np.dtype(np.complex64)
+        elif self._precision == "float64":
+            dtype = np.dtype(np.complex128)
+        else:
+            dtype = complex_dtype(np.dtype(np.float64 if points.real.dtype == np.float64 else np.float32))
+        return points.astype(dtype, copy=False)
+# Run the escape-time loop on the selected backend and derive the smooth counts
+    def _escape_time(
+        self,
+        z: np.ndarray,
+        c: np.ndarray,
+        smooth: bool = False,
+        backend: Optional[str] = None,
+        interior: Optional[np.ndarray] = None,
+        periodicity: bool = False
+    ) -> EscapeResult:
+        shape = z.shape
+        z_flat = np.ascontiguousarray(z).ravel()
+        c_flat = np.ascontiguousarray(np.broadcast_to(c, shape), dtype=z.dtype).ravel()
+        compute_backend = get_backend(backend)
+        tol = self._periodicity_tol if periodicity else None
+        if interior is None or not interior.any():
+            z_out, counts = compute_backend.escape_time(
+                self.formula, z_flat, c_flat, self._max_iter, self._escape_radius,
+                count_dtype(self._max_iter), tol
+            )
+        else:
+            # Only iterate the points not already classified as interior (their z is left at
+            # its starting value)
+            todo = ~interior.ravel()
+            z_out = z_flat.copy()
+            counts = np.full(z_flat.size, self._max_iter, dtype=count_dtype(self._max_iter))
+            z_out[todo], counts[todo] = compute_backend.escape_time(
+                self.formula, z_flat[todo], c_flat[todo], self._max_iter, self._escape_radius,
+                count_dtype(self._max_iter), tol
+            )
+        smooth_counts = self._smooth_counts(z_out, counts) if smooth else counts.astype(np.float32)
+        return EscapeResult(z_out.reshape(shape), counts.reshape(shape), smooth_counts.reshape(shape))
+# Normalized iteration count n + 1 - log2(ln|z| / ln R), continuous across escape bands
+    def _smooth_counts(self, z: np.ndarray, counts: np.ndarray, max_iter: Optional[int] = None) -> np.ndarray:
+        smooth = counts.astype(np.float32)
+        if self._escape_radius is None:
+            return smooth
+        escaped = counts < (self._max_iter if max_iter is None else max_iter)
+        log_radius = np.float32(np.log(self._escape_radius))
+        log_z = np.log(np.abs(z[escaped]))
+        smooth[escaped] += np.float32(1.0) - np.log2(log_z / log_radius)
+        return smooth
@@ -1,30 +1,35 @@
+from typing import Optional
 import numpy as np
-from .base import FractalSet
+from .base import FractalSet, DEFAULT_ESCAPE_RADIUS
 
 #Burning Ship fractal set computation
 class BurningShipSet(FractalSet):
-    def __init__(self, max_iter: int = 256):
-        super().__init__(max_iter)
+
+    formula = "burning_ship"
+
+    def __init__(
+        self,
+        max_iter: int = 256,
+        escape_radius: Optional[float] = DEFAULT_ESCAPE_RADIUS,
+        precision: str = "auto",
+        periodicity_tol: Optional[float] = None
+    ):
+        super().__init__(max_iter, escape_radius, precision, periodicity_tol)
 # COmpute Burning Ship iteration for a single point
     def compute(self, c: np.complex64) -> np.complex64:
-        z = np.complex64(0.0 + 0.0j)
+        # Iterate the real and imaginary parts as float32 scalars; z is assembled once at the end
+        zr = zi = np.float32(0.0)
+        cr, ci = np.float32(c.real), np.float32(c.imag)
         for _ in range(self._max_iter):
-            zx = abs(z.real)
-            zy = abs(z.imag)
-            z_real_new = zx * zx - zy * zy + c.real
-            z_imag_new = 2.0 * zx * zy + c.imag
-            z = np.complex64(z_real_new + 1j * z_imag_new)
-        return z
+            product = zr * zi
+            zr, zi = zr * zr - zi * zi + cr, 2.0 * abs(product) + ci
+        return np.complex64(complex(zr, zi))
 # Compute Burning Ship iteration for an array of points
-    def compute_array(self, c_array: np.ndarray) -> np.ndarray:
-        z = np.zeros_like(c_array, dtype=np.complex64)
-        for _ in range(self._max_iter):
-            # Take absolute values element-wise
-            zx = np.abs(z.real)
-            zy = np.abs(z.imag)
-            # Compute new values
-            z = (zx * zx - zy * zy + c_array.real) + 1j * (2.0 * zx * zy + c_array.imag)
-        return z.astype(np.complex64)
+    def compute_array(self, c_array: np.ndarray, output: str = "z", backend: Optional[str] = None) -> np.ndarray:
+        return self._compute(c_array, output, backend)
+
+    def _start(self, c_array: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        return np.zeros_like(c_array), c_array
 
     def get_parameters(self) -> dict:
         return {"max_iter": self._max_iter}
@@ -1,5 +1,6 @@
+from typing import Optional
 import numpy as np
-from .base import FractalSet
+from .base import FractalSet, DEFAULT_ESCAPE_RADIUS
 
 
 # Default Julia constant (dendrite shape)
@@ -8,13 +9,19 @@ DEFAULT_JULIA_C_IMAG = 0.6
 
 # Julia Set fractal computation
 class JuliaSet(FractalSet):
+
+    formula = "quadratic"
+
     def __init__(
         self,
         c_real: float = DEFAULT_JULIA_C_REAL,
         c_imag: float = DEFAULT_JULIA_C_IMAG,
-        max_iter: int = 256
+        max_iter: int = 256,
+        escape_radius: Optional[float] = DEFAULT_ESCAPE_RADIUS,
+        precision: str = "auto",
+        periodicity_tol: Optional[float] = None
     ):
-        super().__init__(max_iter)
+        super().__init__(max_iter, escape_radius, precision, periodicity_tol)
         self._c_real = float(c_real)
         self._c_imag = float(c_imag)
         self._c = np.complex64(c_real + 1j * c_imag)
@@ -39,11 +46,12 @@ class JuliaSet(FractalSet):
             z = z * z + self._c
         return z
 # COmpute Jlia iteration for an array of starting point
-    def compute_array(self, z0_array: np.ndarray) -> np.ndarray:
-        z = z0_array.copy().astype(np.complex64)
-        for _ in range(self._max_iter):
-            z = z * z + self._c
-        return z
+    def compute_array(self, z0_array: np.ndarray, output: str = "z", backend: Optional[str] = None) -> np.ndarray:
+        return self._compute(z0_array, output, backend)
+
+    def _start(self, z0_array: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        c = complex(self._c_real, self._c_imag)
+        return z0_array.copy(), np.full(z0_array.shape, c, dtype=z0_array.dtype)
 
     def get_parameters(self) -> dict:
         return {
@@ -1,11 +1,32 @@
+from typing import Optional
 import numpy as np
-from .base import FractalSet
+from .base import FractalSet, EscapeResult, OUTPUT_MODES, DEFAULT_ESCAPE_RADIUS, count_dtype
+from .perturbation import HighPrecision, digits_for_scale, reference_orbit, perturbation_escape_time
 
 # Mandelbrot set fractal computation. The Mandelbrot set has no additional parameters beyond max_iter as the constant c varies across the complex plane (each pixel is a different c)
 class MandelbrotSet(FractalSet):
 
-    def __init__(self, max_iter: int = 256):
-        super().__init__(max_iter)
+    formula = "quadratic"
+
+    def __init__(
+        self,
+        max_iter: int = 256,
+        escape_radius: Optional[float] = DEFAULT_ESCAPE_RADIUS,
+        precision: str = "auto",
+        periodicity_tol: Optional[float] = None,
+        interior_check: bool = True
+    ):
+        super().__init__(max_iter, escape_radius, precision, periodicity_tol)
+        self._interior_check = bool(interior_check)
+
+    @property
+    def interior_check(self) -> bool:
+        """Get whether main cardioid and period-2 bulb points skip iteration."""
+        return self._interior_check
+
+    @interior_check.setter
+    def interior_check(self, enabled: bool) -> None:
+        self._interior_check = bool(enabled)
 # Compute Mandelbrot iteration for a single point
     def compute(self, c: np.complex64) -> np.complex64:
         z = np.complex64(0.0 + 0.0j)
@@ -13,11 +34,61 @@ class MandelbrotSet(FractalSet):
             z = z * z + c
         return z
 # Compute Mandelbrot iteration for an array of points
-    def compute_array(self, c_array: np.ndarray) -> np.ndarray:
-        z = np.zeros_like(c_array, dtype=np.complex64)
-        for _ in range(self._max_iter):
-            z = z * z + c_array
-        return z
+    def compute_array(self, c_array: np.ndarray, output: str = "z", backend: Optional[str] = None) -> np.ndarray:
+        return self._compute(c_array, output, backend)
+
+# Deep-zoom mode: compute pixels given as float64 offsets from a high precision center (strings or
+# Decimals keep every digit). One reference orbit is iterated in arbitrary precision and every
+# pixel runs as a low precision delta from it, so views far below float64 resolution stay sharp.
+    def compute_deep(
+        self,
+        center_x: HighPrecision,
+        center_y: HighPrecision,
+        offsets: np.ndarray,
+        output: str = "counts"
+    ) -> np.ndarray:
+        if output not in OUTPUT_MODES:
+            raise ValueError(f"Unsupported output mode: {output}")
+        result = self.compute_deep_escape(center_x, center_y, offsets)
+        frame: np.ndarray = getattr(result, output)
+        return frame
+# Deep-zoom counterpart of compute_escape
+    def compute_deep_escape(
+        self,
+        center_x: HighPrecision,
+        center_y: HighPrecision,
+        offsets: np.ndarray
+    ) -> EscapeResult:
+        if self._escape_radius is None:
+            raise ValueError("Deep zoom requires an escape_radius")
+        offsets = np.asarray(offsets, dtype=np.complex128)
+        scale = float(np.max(np.abs(offsets))) if offsets.size else 0.0
+        orbit = reference_orbit(center_x, center_y, self._max_iter, self._escape_radius, digits_for_scale(scale))
+        z, counts = perturbation_escape_time(
+            orbit, offsets, self._max_iter, self._escape_radius, count_dtype(self._max_iter)
+        )
+        smooth = self._smooth_counts(z, counts)
+        shape = offsets.shape
+        return EscapeResult(z.astype(np.complex64).reshape(shape), counts.reshape(shape), smooth.reshape(shape))
+
+# Points inside the main cardioid or the period-2 bulb never escape:
+#   cardioid  q (q + (x - 1/4)) <= y^2 / 4  with  q = (x - 1/4)^2 + y^2
+#   bulb      (x + 1)^2 + y^2 <= 1/16
+    def _known_interior(self, c_array: np.ndarray) -> Optional[np.ndarray]:
+        if not self._interior_check:
+            return None
+        x = c_array.real
+        y = c_array.imag
+        y_sq = y * y
+        x_shift = x - 0.25
+        q = x_shift * x_shift + y_sq
+        cardioid = q * (q + x_shift) <= 0.25 * y_sq
+        bulb = (x + 1.0) * (x + 1.0) + y_sq <= 0.0625
+        interior: np.ndarray = cardioid | bulb
+        return interior
+
+    def _start(self, c_array: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        return np.zeros_like(c_array), c_array
 
     def get_parameters(self) -> dict:
         return {"max_iter": self._max_iter}
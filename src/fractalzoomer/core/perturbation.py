@@ -0,0 +1,115 @@
+from decimal import Decimal, localcontext
+from typing import Union
+import numpy as np
+
+try:  # Optional: faster arbitrary precision arithmetic
+    import mpmath
+except ImportError:  # pragma: no cover - depends on the environment
+    mpmath = None
+
+# High precision coordinate accepted by the deep-zoom API
+HighPrecision = Union[str, Decimal, float]
+
+# Decimal digits kept beyond the pixel spacing when computing the reference orbit
+GUARD_DIGITS = 20
+
+# Below this many digits a plain float64 reference orbit is already exact enough
+MIN_DIGITS = 30
+
+
+# Number of decimal digits needed to resolve offsets of the given magnitude
+def digits_for_scale(scale: float) -> int:
+    if scale <= 0 or not np.isfinite(scale):
+        return MIN_DIGITS
+    return max(MIN_DIGITS, int(np.ceil(-np.log10(scale))) + GUARD_DIGITS)
+
+
+# Mandelbrot orbit of the reference point c = center_x + i*center_y, iterated in arbitrary
+# precision and rounded to complex128. The orbit stops early if the reference escapes.
+def reference_orbit(
+    center_x: HighPrecision,
+    center_y: HighPrecision,
+    max_iter: int,
+    escape_radius: float,
+    digits: int
+) -> np.ndarray:
+    orbit = np.zeros(max_iter + 1, dtype=np.complex128)
+    radius_sq = escape_radius * escape_radius
+    if mpmath is not None:
+        with mpmath.workdps(digits):
+            cr = mpmath.mpf(str(center_x))
+            ci = mpmath.mpf(str(center_y))
+            zr = mpmath.mpf(0)
+            zi = mpmath.mpf(0)
+            for n in range(1, max_iter + 1):
+                zr, zi = zr * zr - zi * zi + cr, 2 * zr * zi + ci
+                orbit[n] = complex(float(zr), float(zi))
+                if float(zr * zr + zi * zi) > radius_sq:
+                    return orbit[:n + 1]
+        return orbit
+
+    with localcontext() as ctx:
+        ctx.prec = digits
+        cr = Decimal(str(center_x))
+        ci = Decimal(str(center_y))
+        zr = Decimal(0)
+        zi = Decimal(0)
+        two = Decimal(2)
+        for n in range(1, max_iter + 1):
+            zr, zi = zr * zr - zi * zi + cr, two * zr * zi + ci
+            orbit[n] = complex(float(zr), float(zi))
+            if float(zr * zr + zi * zi) > radius_sq:
+                return orbit[:n + 1]
+    return orbit
+
+
+# Iterate every pixel as a float64 delta from the reference orbit:
+#   delta_{n+1} = (2 Z_m + delta_n) delta_n + delta_c,  z = Z_{m+1} + delta_{n+1}
+# A pixel whose full value z becomes smaller than its delta has drifted away from the reference
+# (a glitch): it is rebased onto the start of the orbit (delta = z, m = 0), which turns the
+# orbit's critical point into its new reference. Pixels reaching the end of a reference that
+# escaped early are rebased the same way. Returns the escape values and counts.
+def perturbation_escape_time(
+    orbit: np.ndarray,
+    delta_c: np.ndarray,
+    max_iter: int,
+    escape_radius: float,
+    counts_dtype: np.dtype
+) -> tuple[np.ndarray, np.ndarray]:
+    size = delta_c.size
+    dc_act = np.ascontiguousarray(delta_c, dtype=np.complex128).ravel()
+    z_out = np.zeros(size, dtype=np.complex128)
+    counts = np.full(size, max_iter, dtype=counts_dtype)
+    radius_sq = escape_radius * escape_radius
+    last = orbit.size - 1
+
+    active = np.arange(size)
+    delta = np.zeros(size, dtype=np.complex128)
+    ref_index = np.zeros(size, dtype=np.intp)
+    for n in range(1, max_iter + 1):
+        delta = (2.0 * orbit[ref_index] + delta) * delta + dc_act
+        ref_index += 1
+        z = orbit[ref_index] + delta
+        z_abs_sq = z.real * z.real + z.imag * z.imag
+
+        escaped = z_abs_sq > radius_sq
+        if escaped.any():
+            z_out[active[escaped]] = z[escaped]
+            counts[active[escaped]] = n
+            bounded = ~escaped
+            active = active[bounded]
+            if active.size == 0:
+                break
+            delta = delta[bounded]
+            dc_act = dc_act[bounded]
+            ref_index = ref_index[bounded]
+            z = z[bounded]
+            z_abs_sq = z_abs_sq[bounded]
+
+        rebase = (z_abs_sq < delta.real * delta.real + delta.imag * delta.imag) | (ref_index == last)
+        if rebase.any():
+            delta[rebase] = z[rebase]
+            ref_index[rebase] = 0
+    else:
+        z_out[active] = orbit[ref_index] + delta
+    return z_out, counts
@@ -0,0 +1,33 @@
+import numpy as np
+
+# Precision policies accepted by FractalSet(precision=...) and the renderers
+PRECISIONS = ("float32", "float64", "auto")
+
+# "auto" escalates to float64 once a pixel spans fewer float32 ulps than this. Iterating
+# amplifies rounding error, so escalation happens well before adjacent pixels collapse.
+AUTO_PRECISION_ULPS = 64
+
+
+def validate_precision(precision: str) -> str:
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unsupported precision: {precision}")
+    return precision
+
+
+# Real dtype needed to sample a grid with the given pixel spacing around coordinates of the
+# given magnitude (the largest |coordinate| in the view)
+def select_precision(precision: str, pixel_size: float, magnitude: float) -> np.dtype:
+    validate_precision(precision)
+    if precision == "float32":
+        return np.dtype(np.float32)
+    if precision == "float64":
+        return np.dtype(np.float64)
+    ulp = float(np.finfo(np.float32).eps) * max(magnitude, float(np.finfo(np.float32).tiny))
+    if pixel_size > AUTO_PRECISION_ULPS * ulp:
+        return np.dtype(np.float32)
+    return np.dtype(np.float64)
+
+
+# Complex dtype built from a real dtype
+def complex_dtype(real_dtype: np.dtype) -> np.dtype:
+    return np.result_type(real_dtype, np.complex64)
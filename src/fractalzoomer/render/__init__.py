@@ -0,0 +1,69 @@
+# Rendering orchestration on top of the fractalzoomer.core engines
+from fractalzoomer.render.view import Lattice, View
+from fractalzoomer.render.parallel import ParallelRenderer, output_dtype, row_bands, schedule_bands
+from fractalzoomer.render.disk_cache import DiskCacheStats, DiskTileCache
+from fractalzoomer.render.incremental import (
+    count_edges,
+    engine_key,
+    exposed_blocks,
+    render_translated,
+    reproject_frame,
+    reprojection_priority,
+    resample_frame,
+    translate_frame,
+)
+from fractalzoomer.render.histogram import cumulative_distribution, iteration_histogram
+from fractalzoomer.render.poster import PosterRenderer, PosterTile, poster_tiles
+from fractalzoomer.render.processes import ProcessRenderer
+from fractalzoomer.render.progressive import ProgressivePass, ProgressiveRenderer, lattice_preview
+from fractalzoomer.render.antialias import AntialiasStats, antialias, refine_mask
+from fractalzoomer.render.animation import AnimationFrame, AnimationRenderer, Keyframe, interpolate_keyframes
+from fractalzoomer.render.resumable import ResumableRenderer, resumable_key
+from fractalzoomer.render.scheduler import RenderJob, RenderScheduler
+from fractalzoomer.render.subdivision import SubdivisionRenderer, SubdivisionStats
+from fractalzoomer.render.tiles import CacheStats, TileCache, TiledRenderer, TileKey
+
+__all__ = [
+    "Lattice",
+    "View",
+    "AnimationFrame",
+    "AnimationRenderer",
+    "AntialiasStats",
+    "Keyframe",
+    "ParallelRenderer",
+    "PosterRenderer",
+    "PosterTile",
+    "ProcessRenderer",
+    "ProgressivePass",
+    "ProgressiveRenderer",
+    "RenderJob",
+    "RenderScheduler",
+    "ResumableRenderer",
+    "SubdivisionRenderer",
+    "SubdivisionStats",
+    "CacheStats",
+    "DiskCacheStats",
+    "DiskTileCache",
+    "TileCache",
+    "TiledRenderer",
+    "TileKey",
+    "antialias",
+    "count_edges",
+    "cumulative_distribution",
+    "engine_key",
+    "exposed_blocks",
+    "interpolate_keyframes",
+    "iteration_histogram",
+    "lattice_preview",
+    "output_dtype",
+    "poster_tiles",
+    "render_translated",
+    "reproject_frame",
+    "refine_mask",
+    "reprojection_priority",
+    "resample_frame",
+    "resumable_key",
+    "row_bands",
+    "schedule_bands",
+    "translate_frame",
+]
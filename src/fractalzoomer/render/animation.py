@@ -0,0 +1,327 @@
+"""
+Zoom animation renderer.
+
+An animation is described by keyframes (center, zoom, iteration limit and,
+for Julia sets, the constant c) at given frame numbers. Frames in between are
+interpolated: the zoom geometrically, the center so that it moves across the
+screen at a constant speed, the rest linearly.
+
+Consecutive frames of a zoom overlap almost entirely, so frames are not all
+rendered from scratch. A reference frame is rendered at reference_scale times
+the output resolution, and every following frame that still lies inside it
+with at least one reference sample per output pixel is area-resampled from
+it. With the default scale of 2, a zoom needs one reference per halving of
+the view width instead of one render per frame, and every frame comes out
+anti-aliased. References go through a tile cache, so pans and pauses reuse
+the tiles of earlier references as well.
+
+Frames are rendered on a thread pool, at most max_pending at a time, and
+handed out in order, so memory does not grow with the length of the
+animation.
+"""
+
+import copy
+import math
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from fractalzoomer.core import FractalSet
+from fractalzoomer.render.incremental import resample_frame
+from fractalzoomer.render.resumable import resumable_key
+from fractalzoomer.render.tiles import TileCache, TiledRenderer
+from fractalzoomer.render.view import View
+
+# Resolution of reference frames relative to the output frames
+DEFAULT_REFERENCE_SCALE = 2.0
+
+# Turns smooth iteration counts and the iteration limit into pixels (e.g. FractalExporter.shade)
+Shader = Callable[[np.ndarray, int], np.ndarray]
+
+
+class Keyframe(NamedTuple):
+    """State of the animation at one frame."""
+
+    frame: int  # Frame number the keyframe is reached at
+    center_x: float
+    center_y: float
+    zoom: float  # Magnification relative to the animation's base view
+    max_iter: int
+    c_real: Optional[float] = None  # Julia constant (None keeps the engine's)
+    c_imag: Optional[float] = None
+
+
+class AnimationFrame(NamedTuple):
+    """One interpolated frame."""
+
+    number: int  # Frame number
+    view: View
+    fractal: FractalSet  # Engine with this frame's parameters
+
+
+def _validate_keyframes(keyframes: Sequence[Keyframe]) -> list[Keyframe]:
+    keyframes = sorted(keyframes, key=lambda keyframe: keyframe.frame)
+    if not keyframes:
+        raise ValueError("An animation needs at least one keyframe")
+    for keyframe in keyframes:
+        if keyframe.zoom <= 0:
+            raise ValueError("zoom must be positive")
+        if keyframe.max_iter <= 0:
+            raise ValueError("max_iter must be a positive integer")
+    for first, second in zip(keyframes, keyframes[1:]):
+        if first.frame == second.frame:
+            raise ValueError(f"Two keyframes at frame {first.frame}")
+    return keyframes
+
+
+def interpolate_keyframes(fractal: FractalSet, keyframes: Sequence[Keyframe], base_view: View) -> list[AnimationFrame]:
+    """
+    Interpolate every frame between the first and the last keyframe.
+
+    The zoom is interpolated in log space; the center follows the zoom so
+    that it crosses the screen at a constant speed (linearly when the zoom
+    does not change); the iteration limit (rounded) and the Julia constant
+    linearly.
+
+    Args:
+        fractal: Engine of the animation (copied, not modified).
+        keyframes: Keyframes, in any order, at distinct frame numbers.
+        base_view: View at zoom 1; its center is ignored.
+
+    Returns:
+        The frames from the first keyframe's frame number to the last one's.
+    """
+    keyframes = _validate_keyframes(keyframes)
+    julia = "c_real" in fractal.get_parameters()
+    frames = []
+    for number in range(keyframes[0].frame, keyframes[-1].frame + 1):
+        # Keyframes bracketing the frame, and the position between them
+        after = next(i for i, keyframe in enumerate(keyframes) if keyframe.frame >= number)
+        end = keyframes[after]
+        start = keyframes[max(after - 1, 0)]
+        t = 0.0 if end.frame == start.frame else (number - start.frame) / (end.frame - start.frame)
+
+        ratio = start.zoom / end.zoom  # Width of the end view relative to the start view
+        zoom = math.exp(math.log(start.zoom) + t * (math.log(end.zoom) - math.log(start.zoom)))
+        travel = t if abs(ratio - 1.0) < 1e-12 else (1.0 - ratio ** t) / (1.0 - ratio)
+        center_x = start.center_x + travel * (end.center_x - start.center_x)
+        center_y = start.center_y + travel * (end.center_y - start.center_y)
+
+        engine = copy.deepcopy(fractal)
+        parameters = {"max_iter": max(1, round(start.max_iter + t * (end.max_iter - start.max_iter)))}
+        if julia:
+            for name in ("c_real", "c_imag"):
+                first, last = getattr(start, name), getattr(end, name)
+                if first is not None and last is not None:
+                    parameters[name] = first + t * (last - first)
+                elif first is not None or last is not None:
+                    parameters[name] = first if first is not None else last
+        engine.set_parameters(**parameters)
+        view = View(
+            center_x, center_y, base_view.half_width / zoom, base_view.half_height / zoom,
+            base_view.width, base_view.height
+        )
+        frames.append(AnimationFrame(number, view, engine))
+    return frames
+
+
+def reference_view(view: View, scale: float) -> View:
+    """The view sampled at scale times its resolution."""
+    return View(
+        view.center_x, view.center_y, view.half_width, view.half_height,
+        max(1, round(view.width * scale)), max(1, round(view.height * scale))
+    )
+
+
+def covers(reference: View, view: View) -> bool:
+    """Whether view lies inside reference, sampled at least as densely."""
+    tolerance = 1e-9
+    inside: bool = (
+        reference.column_step <= view.column_step * (1 + tolerance)
+        and reference.row_step <= view.row_step * (1 + tolerance)
+        and view.center_x - view.half_width >= reference.center_x - reference.half_width - reference.column_step / 2
+        and view.center_x + view.half_width <= reference.center_x + reference.half_width + reference.column_step / 2
+        and view.center_y - view.half_height >= reference.center_y - reference.half_height - reference.row_step / 2
+        and view.center_y + view.half_height <= reference.center_y + reference.half_height + reference.row_step / 2
+    )
+    return inside
+
+
+class _Reference:
+    # A reference frame shared by consecutive frames, rendered by the first one that needs it
+    # and dropped once the last one is done
+
+    def __init__(self, view: View, fractal: FractalSet, users: int):
+        self.view = view
+        self.fractal = fractal
+        self.users = users
+        self.frame: Optional[np.ndarray] = None
+        self.lock = threading.Lock()
+
+    def acquire(self, render: Callable[[], Optional[np.ndarray]]) -> Optional[np.ndarray]:
+        with self.lock:
+            if self.frame is None:
+                self.frame = render()
+            return self.frame
+
+    def release(self) -> None:
+        with self.lock:
+            self.users -= 1
+            if self.users == 0:
+                self.frame = None
+
+
+def plan_references(frames: Sequence[AnimationFrame], scale: float) -> list[_Reference]:
+    """
+    Assign every frame the reference frame it is resampled from.
+
+    A reference is opened at the first frame that no earlier reference
+    covers, and rendered at the highest iteration limit of the frames it
+    serves (lower limits are derived from its smooth counts).
+
+    Returns:
+        The reference of every frame, in frame order.
+    """
+    plan: list[_Reference] = []
+    start = 0
+    while start < len(frames):
+        view = reference_view(frames[start].view, scale)
+        key = resumable_key(frames[start].fractal)
+        end = start + 1
+        while end < len(frames) and resumable_key(frames[end].fractal) == key and covers(view, frames[end].view):
+            end += 1
+        fractal = copy.deepcopy(frames[start].fractal)
+        fractal.set_parameters(max_iter=max(frame.fractal.max_iter for frame in frames[start:end]))
+        reference = _Reference(view, fractal, end - start)
+        plan.extend([reference] * (end - start))
+        start = end
+    return plan
+
+
+class AnimationRenderer:
+    """Renders keyframed animations frame by frame, reusing reference frames across frames."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        reference_scale: float = DEFAULT_REFERENCE_SCALE,
+        cache: Optional[TileCache] = None
+    ):
+        """
+        Initialize the renderer.
+
+        Args:
+            workers: Number of frames rendered at the same time (defaults to
+                the CPU count).
+            max_pending: Frames rendered or waiting to be handed out at any
+                time, which bounds memory use (defaults to twice workers).
+            reference_scale: Resolution of reference frames relative to the
+                output (1 renders every frame exactly, sharing only tiles).
+            cache: Tile cache of the reference frames (a new one if None).
+        """
+        if reference_scale < 1:
+            raise ValueError("reference_scale must be at least 1")
+        self._workers = workers or os.cpu_count() or 1
+        if max_pending is not None and max_pending <= 0:
+            raise ValueError("max_pending must be a positive integer")
+        self._max_pending = max_pending or 2 * self._workers
+        self._reference_scale = reference_scale
+        self._tiles = TiledRenderer(cache, workers=self._workers)
+        self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="fractal-frame")
+
+    @property
+    def reference_scale(self) -> float:
+        """Get the resolution of reference frames relative to the output."""
+        return self._reference_scale
+
+    @property
+    def cache(self) -> TileCache:
+        """Get the tile cache of the reference frames."""
+        return self._tiles.cache
+
+    def render(
+        self,
+        fractal: FractalSet,
+        keyframes: Sequence[Keyframe],
+        base_view: View,
+        shade: Shader,
+        backend: Optional[str] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> Iterator[np.ndarray]:
+        """
+        Render an animation.
+
+        Args:
+            fractal: Engine of the animation (copied, not modified).
+            keyframes: Keyframes, in any order (see interpolate_keyframes).
+            base_view: View at zoom 1, fixing the output size; its center is ignored.
+            shade: Turns smooth counts and the frame's iteration limit into pixels.
+            backend: Compute backend name (see fractalzoomer.core.backends).
+            cancel: Optional event that ends the generator early when set.
+
+        Yields:
+            The shaded frames, in order.
+        """
+        frames = interpolate_keyframes(fractal, keyframes, base_view)
+        plan = plan_references(frames, self._reference_scale)
+        cancel = cancel if cancel is not None else threading.Event()
+        pending: deque[Future] = deque()
+        try:
+            for frame, reference in zip(frames, plan):
+                pending.append(self._pool.submit(self._render_frame, frame, reference, shade, backend, cancel))
+                if len(pending) >= self._max_pending:
+                    result = pending.popleft().result()
+                    if result is None:
+                        return
+                    yield result
+            while pending:
+                result = pending.popleft().result()
+                if result is None:
+                    return
+                yield result
+        finally:
+            # Abandoned early: stop the frames still queued or running
+            cancel.set()
+            for future in pending:
+                future.cancel()
+
+    def _render_frame(
+        self,
+        frame: AnimationFrame,
+        reference: _Reference,
+        shade: Shader,
+        backend: Optional[str],
+        cancel: threading.Event
+    ) -> Optional[np.ndarray]:
+        # Resample one frame from its reference (None once cancelled)
+        try:
+            if cancel.is_set():
+                return None
+            smooth = reference.acquire(
+                lambda: self._tiles.render(reference.fractal, reference.view, output="smooth", backend=backend, cancel=cancel)
+            )
+            if smooth is None:
+                return None
+            pixels = shade(smooth, frame.fractal.max_iter)
+            if reference.view == frame.view:
+                return pixels
+            resampled: np.ndarray = resample_frame(reference.view, pixels, frame.view)
+            return resampled
+        finally:
+            reference.release()
+
+    def close(self) -> None:
+        """Shut down the worker threads."""
+        self._pool.shutdown(wait=True)
+        self._tiles.close()
+
+    def __enter__(self) -> "AnimationRenderer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
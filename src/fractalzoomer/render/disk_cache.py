@@ -0,0 +1,218 @@
+"""
+Persistent on-disk tile cache.
+
+Tiles are stored as individual .npy files in a cache directory, so they
+survive the process and can be shared by several processes (a restarted app,
+render workers). Reads memory-map the file instead of loading it, and files
+are published with an atomic rename, so readers never see a partial tile and
+need no lock. Writers serialize on a lock file while they update the index
+file (index.json: the tiles present, their keys and sizes) and evict the
+least recently used tiles beyond the size budget; a hit refreshes the tile
+file's modification time, which serves as its last-use time.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
+
+import numpy as np
+
+if sys.platform == "win32":  # pragma: no cover - depends on the platform
+    import msvcrt  # Windows byte-range locks
+else:
+    import fcntl  # POSIX advisory locks
+
+# Size budget of a DiskTileCache when none is given
+DEFAULT_DISK_CACHE_BYTES = 1024 * 1024 * 1024
+
+# Bumped whenever the file layout or the key encoding changes
+INDEX_VERSION = 1
+
+INDEX_FILE = "index.json"
+LOCK_FILE = "index.lock"
+
+
+class DiskCacheStats(NamedTuple):
+    """Counters of a disk tile cache (hits and misses of this process only)."""
+
+    hits: int
+    misses: int
+    evictions: int
+    tiles: int  # Tiles currently in the directory
+    nbytes: int  # Bytes of tile files currently in the directory
+
+
+# File name of a tile: a digest of the key's repr, stable across processes
+def tile_filename(key: tuple) -> str:
+    digest = hashlib.sha256(f"{INDEX_VERSION}:{key!r}".encode()).hexdigest()
+    return f"{digest[:40]}.npy"
+
+
+@contextmanager
+def _exclusive(path: Path) -> Iterator[None]:
+    # Hold an exclusive lock on path, shared by every process using the directory
+    with open(path, "a+b") as handle:
+        if sys.platform == "win32":  # pragma: no cover - depends on the platform
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if sys.platform == "win32":  # pragma: no cover - depends on the platform
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+class DiskTileCache:
+    """Size-bounded tile cache in a directory, safe to share between processes."""
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = DEFAULT_DISK_CACHE_BYTES):
+        """
+        Open (or create) a cache directory.
+
+        Args:
+            directory: Directory holding the tiles and the index.
+            max_bytes: Total size of tile files kept before the least
+                recently used ones are deleted.
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer")
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()  # Threads of this process; _exclusive covers other processes
+
+    @property
+    def directory(self) -> Path:
+        """Get the cache directory."""
+        return self._directory
+
+    @property
+    def max_bytes(self) -> int:
+        """Get the size budget in bytes."""
+        return self._max_bytes
+
+    @property
+    def stats(self) -> DiskCacheStats:
+        """Get this process's hit, miss and eviction counters and the directory's size."""
+        tiles = self._read_index()
+        return DiskCacheStats(
+            self._hits, self._misses, self._evictions,
+            len(tiles), sum(entry["nbytes"] for entry in tiles.values())
+        )
+
+    def __contains__(self, key: tuple) -> bool:
+        return (self._directory / tile_filename(key)).exists()
+
+    def get(self, key: tuple) -> Optional[np.ndarray]:
+        """
+        Memory-map a tile.
+
+        Returns:
+            A read-only array backed by the tile file, or None on a miss.
+        """
+        path = self._directory / tile_filename(key)
+        try:
+            tile: np.ndarray = np.load(path, mmap_mode="r", allow_pickle=False)
+            os.utime(path)
+        except (FileNotFoundError, ValueError, OSError):
+            # Missing, or evicted by another process between open and touch
+            with self._lock:
+                self._misses += 1
+            return None
+        with self._lock:
+            self._hits += 1
+        return tile
+
+    def put(self, key: tuple, tile: np.ndarray) -> None:
+        """Store a tile, evicting least recently used tiles beyond the budget."""
+        self.put_many([(key, tile)])
+
+    def put_many(self, items: list[tuple[tuple, np.ndarray]]) -> None:
+        """Store several tiles with a single index update."""
+        entries = {}
+        for key, tile in items:
+            name = tile_filename(key)
+            path = self._directory / name
+            handle, temporary = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+            try:
+                with os.fdopen(handle, "wb") as stream:
+                    np.save(stream, np.ascontiguousarray(tile), allow_pickle=False)
+                os.replace(temporary, path)
+            except BaseException:
+                if os.path.exists(temporary):
+                    os.remove(temporary)
+                raise
+            entries[name] = {"key": repr(key), "nbytes": path.stat().st_size}
+
+        with self._lock, _exclusive(self._directory / LOCK_FILE):
+            tiles = self._read_index()
+            tiles.update(entries)
+            self._evict(tiles, keep=entries.keys())
+            self._write_index(tiles)
+
+    def clear(self) -> None:
+        """Delete every tile (the counters are kept)."""
+        with self._lock, _exclusive(self._directory / LOCK_FILE):
+            for name in self._read_index():
+                self._remove(name)
+            self._write_index({})
+
+    def _evict(self, tiles: dict, keep: Iterable[str]) -> None:
+        # Delete least recently used tiles until the index fits the budget (index lock held)
+        total = sum(entry["nbytes"] for entry in tiles.values())
+        if total <= self._max_bytes:
+            return
+        last_used = {}
+        for name in tiles:
+            try:
+                last_used[name] = (self._directory / name).stat().st_mtime
+            except FileNotFoundError:
+                last_used[name] = float("-inf")
+        for name in sorted(tiles, key=last_used.__getitem__):
+            if total <= self._max_bytes:
+                break
+            if name in keep:
+                continue
+            total -= tiles.pop(name)["nbytes"]
+            self._remove(name)
+            self._evictions += 1
+
+    def _remove(self, name: str) -> None:
+        try:
+            os.remove(self._directory / name)
+        except FileNotFoundError:
+            pass
+        except OSError:  # pragma: no cover - e.g. still memory-mapped on Windows
+            pass
+
+    def _read_index(self) -> dict:
+        try:
+            with open(self._directory / INDEX_FILE, encoding="utf-8") as stream:
+                index = json.load(stream)
+        except (FileNotFoundError, ValueError):
+            return {}
+        if index.get("version") != INDEX_VERSION:
+            return {}
+        tiles: dict = index.get("tiles", {})
+        return tiles
+
+    def _write_index(self, tiles: dict) -> None:
+        # Atomic replace so readers of the index never see a partial file
+        handle, temporary = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        with os.fdopen(handle, "w", encoding="utf-8") as stream:
+            json.dump({"version": INDEX_VERSION, "tiles": tiles}, stream)
+        os.replace(temporary, self._directory / INDEX_FILE)
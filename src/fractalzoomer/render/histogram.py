@@ -0,0 +1,57 @@
+"""
+Iteration histograms.
+
+Histogram equalization colours a frame by the rank of every point's
+iteration count among all escaping points instead of by the count itself,
+so that every palette entry covers the same share of the image whatever
+the distribution of the counts. The ranks come from the cumulative
+distribution of a histogram of whole iteration counts, built with a single
+np.bincount over the frame.
+
+Histograms are additive: the histogram of an image is the sum of the
+histograms of its tiles, so tiled renders collect them tile by tile and
+colour in a second pass (see PosterRenderer).
+"""
+
+import numpy as np
+
+
+def iteration_histogram(values: np.ndarray, max_iter: int) -> np.ndarray:
+    """
+    Count the escaping points at every whole iteration count.
+
+    Args:
+        values: Iteration counts (integer dtype) or smooth iteration counts
+            (float dtype, counted at their whole part); values at or above
+            max_iter are interior and not counted.
+        max_iter: Iteration limit the buffer was computed with.
+
+    Returns:
+        int64 array of length max_iter: the number of points escaping after
+        0, 1, ..., max_iter - 1 iterations.
+    """
+    if max_iter <= 0:
+        raise ValueError("max_iter must be a positive integer")
+    if np.issubdtype(values.dtype, np.integer):
+        counts = values.ravel()
+    else:
+        counts = np.clip(values, 0, max_iter).astype(np.intp).ravel()
+    return np.bincount(counts, minlength=max_iter + 1)[:max_iter]
+
+
+def cumulative_distribution(histogram: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fraction of the escaping points below every iteration count.
+
+    Args:
+        histogram: Iteration histogram (see iteration_histogram).
+
+    Returns:
+        Tuple of (below, share) float32 arrays: the fraction of the points
+        escaping before each count, and the fraction escaping at it. A
+        smooth count c falls at below[k] + (c - k) * share[k], k = floor(c).
+        Both are zero if no point escaped.
+    """
+    share = histogram / max(int(histogram.sum()), 1)
+    below = np.cumsum(share) - share
+    return below.astype(np.float32), share.astype(np.float32)
@@ -0,0 +1,254 @@
+"""
+Incremental rendering from a previous frame.
+
+Dragging the view by a whole number of pixels does not change any sample that
+stays on screen: the previous frame is translated and only the strips of
+pixels scrolled into view are computed, costing O(W + H) evaluations instead
+of O(W * H).
+
+Zooming moves samples off the pixel grid, but the previous frame still gives a
+close preview of the new one: it is resampled into the new view straight away,
+and the pixels the preview is least sure about (outside the old frame or on an
+iteration-count edge) are the first to be recomputed. A frame rendered at a
+higher resolution than needed can also be area-resampled into every view it
+covers at no less than one sample per pixel (see resample_frame).
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from fractalzoomer.core import FractalSet
+from fractalzoomer.render.view import View
+
+
+def engine_key(fractal: FractalSet) -> tuple:
+    """Hashable description of everything that determines an engine's output."""
+    return (
+        type(fractal).__name__,
+        tuple(sorted(fractal.get_parameters().items())),
+        fractal.escape_radius,
+        fractal.precision,
+        fractal.periodicity_tol,
+    )
+
+
+def translate_frame(frame: np.ndarray, cols: int, rows: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Move a frame by whole pixels.
+
+    out[r, c] = frame[r + rows, c + cols] wherever the source pixel exists;
+    the exposed pixels (see exposed_blocks) are left untouched.
+
+    Args:
+        frame: Source frame.
+        cols: Columns to move by (see View.translated).
+        rows: Rows to move by.
+        out: Optional destination buffer, which must not be frame itself.
+
+    Returns:
+        The destination buffer.
+    """
+    if out is None:
+        out = np.empty_like(frame)
+    height, width = frame.shape
+    if abs(cols) < width and abs(rows) < height:
+        src_rows = slice(max(rows, 0), height + min(rows, 0))
+        src_cols = slice(max(cols, 0), width + min(cols, 0))
+        dst_rows = slice(max(-rows, 0), height + min(-rows, 0))
+        dst_cols = slice(max(-cols, 0), width + min(-cols, 0))
+        out[dst_rows, dst_cols] = frame[src_rows, src_cols]
+    return out
+
+
+def exposed_blocks(shape: tuple[int, int], cols: int, rows: int) -> list[tuple[slice, slice]]:
+    """
+    List the blocks of a translated frame that have no source pixel.
+
+    Args:
+        shape: (height, width) of the frame.
+        cols: Columns the view moved by.
+        rows: Rows the view moved by.
+
+    Returns:
+        Non-overlapping (row slice, column slice) blocks.
+    """
+    height, width = shape
+    if abs(cols) >= width or abs(rows) >= height:
+        return [(slice(0, height), slice(0, width))]
+    blocks = []
+    if cols > 0:
+        blocks.append((slice(0, height), slice(width - cols, width)))
+    elif cols < 0:
+        blocks.append((slice(0, height), slice(0, -cols)))
+    # Rows span only the columns the column strip has not covered already
+    kept_cols = slice(max(-cols, 0), width - max(cols, 0))
+    if rows > 0:
+        blocks.append((slice(height - rows, height), kept_cols))
+    elif rows < 0:
+        blocks.append((slice(0, -rows), kept_cols))
+    return blocks
+
+
+def render_translated(
+    fractal: FractalSet,
+    base_view: View,
+    base_frame: np.ndarray,
+    view: View,
+    output: str = "counts",
+    backend: Optional[str] = None
+) -> Optional[np.ndarray]:
+    """
+    Render a view by reusing the frame of a view it is a whole-pixel pan of.
+
+    Args:
+        fractal: Engine that rendered base_frame.
+        base_view: View of base_frame.
+        base_frame: Previous frame, rendered with the same output mode.
+        view: View to render.
+        output: compute_array output mode ("z", "counts" or "smooth").
+        backend: Compute backend name (see fractalzoomer.core.backends).
+
+    Returns:
+        The new frame, or None if view is not a whole-pixel translation of
+        base_view (the caller then has to render it from scratch).
+    """
+    offset = base_view.pixel_offset(view)
+    if offset is None or base_frame.shape != view.shape:
+        return None
+    cols, rows = offset
+    frame = translate_frame(base_frame, cols, rows)
+    dtype = view.coordinate_dtype(fractal.precision)
+    for block_rows, block_cols in exposed_blocks(view.shape, cols, rows):
+        points = view.grid(rows=block_rows, cols=block_cols, dtype=dtype)
+        if points.size:
+            frame[block_rows, block_cols] = fractal.compute_array(points, output=output, backend=backend)
+    return frame
+
+
+# Nearest source index of every fractional pixel position, -1 outside range(size)
+def _source_indices(positions: np.ndarray, size: int) -> np.ndarray:
+    indices = np.rint(positions)
+    return np.where((indices >= 0) & (indices < size), indices, -1).astype(np.intp)
+
+
+def reproject_frame(base_view: View, base_frame: np.ndarray, view: View) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Resample a frame into another view by nearest-neighbour lookup.
+
+    Args:
+        base_view: View of base_frame.
+        base_frame: Frame to resample.
+        view: View to resample into.
+
+    Returns:
+        Tuple of (frame, source rows, source columns). Pixels without a
+        source sample have source index -1 and an unspecified value.
+    """
+    left = base_view.center_x - base_view.half_width
+    top = base_view.center_y + base_view.half_height
+    src_cols = _source_indices((view.x_coords(np.dtype(np.float64)) - left) / base_view.column_step, base_view.width)
+    src_rows = _source_indices((top - view.y_coords(np.dtype(np.float64))) / base_view.row_step, base_view.height)
+    frame = base_frame[np.ix_(np.maximum(src_rows, 0), np.maximum(src_cols, 0))]
+    return frame, src_rows, src_cols
+
+
+def count_edges(frame: np.ndarray) -> np.ndarray:
+    """
+    Mark the pixels whose iteration count differs from a 4-neighbour.
+
+    Smooth counts are compared by their whole part, so only the escape band
+    boundaries count as edges.
+
+    Args:
+        frame: counts or smooth frame.
+
+    Returns:
+        Boolean mask of the edge pixels.
+    """
+    counts = np.floor(frame) if frame.dtype.kind == "f" else frame
+    edges = np.zeros(frame.shape, dtype=bool)
+    vertical = counts[1:] != counts[:-1]
+    horizontal = counts[:, 1:] != counts[:, :-1]
+    edges[1:] |= vertical
+    edges[:-1] |= vertical
+    edges[:, 1:] |= horizontal
+    edges[:, :-1] |= horizontal
+    return edges
+
+
+def reprojection_priority(base_frame: np.ndarray, src_rows: np.ndarray, src_cols: np.ndarray) -> np.ndarray:
+    """
+    Mark the pixels of a reprojected frame that should be recomputed first.
+
+    Args:
+        base_frame: Frame the preview was resampled from.
+        src_rows: Source row of every preview row (-1 if none).
+        src_cols: Source column of every preview column (-1 if none).
+
+    Returns:
+        Boolean mask of the pixels without a source sample or whose source
+        lies on an iteration-count edge.
+    """
+    edges = count_edges(base_frame)[np.ix_(np.maximum(src_rows, 0), np.maximum(src_cols, 0))]
+    return edges | (src_rows < 0)[:, None] | (src_cols < 0)[None, :]
+
+
+# Box-filter one axis: average the source pixels covering [start, start + width) (in source
+# pixels) for every destination pixel, using the running integral of the source
+def _area_average(frame: np.ndarray, start: np.ndarray, width: float, axis: int) -> np.ndarray:
+    size = frame.shape[axis]
+    integral = np.concatenate([
+        np.zeros_like(np.take(frame, [0], axis=axis), dtype=np.float64),
+        np.cumsum(frame, axis=axis, dtype=np.float64),
+    ], axis=axis)
+
+    shape = [1] * frame.ndim
+    shape[axis] = -1
+
+    def integrate(position: np.ndarray) -> np.ndarray:
+        whole = np.minimum(np.floor(position).astype(np.intp), size - 1)
+        fraction = (position - whole).reshape(shape)
+        area: np.ndarray = np.take(integral, whole, axis=axis) + fraction * np.take(frame, whole, axis=axis)
+        return area
+
+    # Only the part of a pixel inside the source counts; pixels entirely outside repeat the edge
+    low = np.clip(start, 0, size)
+    high = np.clip(start + width, 0, size)
+    covered = high - low
+    inside = covered > 1e-9
+    average = (integrate(high) - integrate(low)) / np.where(inside, covered, 1.0).reshape(shape)
+    edge = np.take(frame, np.clip(np.floor(start), 0, size - 1).astype(np.intp), axis=axis)
+    averaged: np.ndarray = np.where(inside.reshape(shape), average, edge)
+    return averaged
+
+
+def resample_frame(base_view: View, base_frame: np.ndarray, view: View) -> np.ndarray:
+    """
+    Resample a frame into a view it covers by averaging the area of every pixel.
+
+    Meant for a base frame sampled at least as densely as the view (e.g.
+    rendered at a higher resolution), where nearest-neighbour lookup would
+    alias. Pixels reaching outside base_view average only the part inside.
+
+    Args:
+        base_view: View of base_frame.
+        base_frame: Frame to resample, of shape base_view.shape, optionally
+            with a trailing channel axis (e.g. RGB).
+        view: View to resample into.
+
+    Returns:
+        The resampled frame, of the same dtype as base_frame (rounded for integers).
+    """
+    left = base_view.center_x - base_view.half_width
+    top = base_view.center_y + base_view.half_height
+    # Pixel i of a view is centred on its coordinate and spans one step
+    cols = (view.x_coords(np.dtype(np.float64)) - view.column_step / 2 - left) / base_view.column_step + 0.5
+    rows = (top - view.y_coords(np.dtype(np.float64)) - view.row_step / 2) / base_view.row_step + 0.5
+    frame = _area_average(base_frame, cols, view.column_step / base_view.column_step, axis=1)
+    frame = _area_average(frame, rows, view.row_step / base_view.row_step, axis=0)
+    if np.issubdtype(base_frame.dtype, np.integer):
+        info = np.iinfo(base_frame.dtype)
+        frame = np.clip(np.rint(frame), info.min, info.max)
+    resampled: np.ndarray = frame.astype(base_frame.dtype)
+    return resampled
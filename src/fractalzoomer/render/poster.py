@@ -0,0 +1,317 @@
+"""
+Poster renderer.
+
+Renders views far larger than memory: the image is cut into tiles that are
+computed on a thread pool, shaded and handed to a streaming writer (see
+fractalzoomer.utils.writers) in row order, at most max_pending at a time.
+Peak memory is therefore a few tiles per worker (plus one band of rows for
+PNG output), whatever the size of the image, and a 50000 x 50000 print
+renders on an ordinary workstation.
+
+Tiles sample the view's global lattice, so a poster is pixel-identical to
+rendering the same view in one piece. With anti-aliasing, every tile is
+computed with a one-pixel apron so that edge detection sees the neighbours
+across tile borders.
+
+Histogram-equalized posters need the iteration histogram of the whole image
+before the first tile can be coloured. They are rendered in two passes: the
+first computes every tile, adds its histogram to the image's and spills its
+smooth counts to a temporary memory-mapped file; the second reads the tiles
+back, colours them with the complete histogram and streams them to the
+writer. Memory stays bounded by the tiles in flight; the spill file takes 4
+bytes per pixel of disk space.
+"""
+
+import os
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, NamedTuple, Optional, Protocol
+
+import numpy as np
+
+from fractalzoomer.core import FractalSet
+from fractalzoomer.render.animation import Shader
+from fractalzoomer.render.antialias import DEFAULT_AA_THRESHOLD, refine_mask, supersample
+from fractalzoomer.render.histogram import iteration_histogram
+from fractalzoomer.render.view import View
+
+# Side length of poster tiles (a multiple of 16, as tiled TIFF requires)
+DEFAULT_POSTER_TILE_SIZE = 512
+
+
+class TileSink(Protocol):
+    """Receives shaded tiles (e.g. StripPngWriter, TiledTiffWriter)."""
+
+    def write_tile(self, top: int, left: int, tile: np.ndarray) -> None:
+        ...
+
+
+# Builds the shader of an equalized render from the iteration histogram of the whole image
+# (e.g. ColorMap.equalized)
+HistogramShader = Callable[[np.ndarray], Shader]
+
+
+class PosterTile(NamedTuple):
+    """Pixel rectangle of one poster tile."""
+
+    top: int
+    left: int
+    height: int
+    width: int
+
+
+def poster_tiles(view: View, tile_size: int) -> list[PosterTile]:
+    """Cut a view into tiles of at most tile_size pixels a side, row by row."""
+    return [
+        PosterTile(top, left, min(tile_size, view.height - top), min(tile_size, view.width - left))
+        for top in range(0, view.height, tile_size)
+        for left in range(0, view.width, tile_size)
+    ]
+
+
+class PosterRenderer:
+    """Renders views tile by tile into a streaming writer."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        tile_size: int = DEFAULT_POSTER_TILE_SIZE,
+        max_pending: Optional[int] = None
+    ):
+        """
+        Initialize the renderer.
+
+        Args:
+            workers: Number of worker threads (defaults to the CPU count).
+            tile_size: Pixels along each side of a tile.
+            max_pending: Tiles computed or waiting to be written at any time
+                (defaults to twice workers), which bounds memory use.
+        """
+        if tile_size <= 0:
+            raise ValueError("tile_size must be a positive integer")
+        if max_pending is not None and max_pending <= 0:
+            raise ValueError("max_pending must be a positive integer")
+        self._workers = workers or os.cpu_count() or 1
+        self._tile_size = tile_size
+        self._max_pending = max_pending or 2 * self._workers
+        self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="fractal-poster")
+
+    @property
+    def tile_size(self) -> int:
+        """Get the tile side length in pixels."""
+        return self._tile_size
+
+    def render(
+        self,
+        fractal: FractalSet,
+        view: View,
+        sink: TileSink,
+        shade: Shader,
+        backend: Optional[str] = None,
+        cancel: Optional[threading.Event] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+        antialias: int = 1,
+        equalize: Optional[HistogramShader] = None
+    ) -> bool:
+        """
+        Render a view tile by tile into a sink.
+
+        Args:
+            fractal: Engine to evaluate.
+            view: Region and pixel grid to render.
+            sink: Receives every shaded tile, in row order.
+            shade: Turns smooth counts and the iteration limit into pixels
+                (unused with equalize).
+            backend: Compute backend name (see fractalzoomer.core.backends).
+            cancel: Optional event that abandons the render when set.
+            progress: Called with the number of tiles done and the total
+                after each tile (of both passes with equalize).
+            antialias: Sub-samples per axis of pixels along edges (1 for
+                none; see fractalzoomer.render.antialias).
+            equalize: If given, the view is rendered in two passes and
+                shaded with equalize(histogram), the iteration histogram of
+                the whole view (see fractalzoomer.render.histogram).
+
+        Returns:
+            True if every tile was written, False if the render was cancelled.
+        """
+        tiles = poster_tiles(view, self._tile_size)
+        cancel = cancel if cancel is not None else threading.Event()
+        if equalize is None:
+            return self._stream(
+                tiles, lambda tile: self._render_tile(fractal, view, tile, shade, backend, cancel, antialias),
+                sink, cancel, progress
+            )
+
+        apron = 1 if antialias > 1 else 0
+        report: Callable[[int, int], None] = progress if progress is not None else lambda done, total: None
+
+        # Each pass reports half of the work
+        def first(done: int, total: int) -> None:
+            report(done, 2 * total)
+
+        def second(done: int, total: int) -> None:
+            report(total + done, 2 * total)
+
+        with tempfile.TemporaryFile(prefix="fractalzoomer-poster-") as file:
+            shape = (view.height + 2 * apron, view.width + 2 * apron)
+            spill = np.memmap(file, dtype=np.float32, mode="w+", shape=shape)
+            histogram = np.zeros(fractal.max_iter, dtype=np.int64)
+            lock = threading.Lock()
+
+            def block(tile: PosterTile) -> tuple[slice, slice]:
+                # Spill file region of a tile and its apron
+                return (
+                    slice(tile.top, tile.top + tile.height + 2 * apron),
+                    slice(tile.left, tile.left + tile.width + 2 * apron)
+                )
+
+            def collect(tile: PosterTile) -> Optional[PosterTile]:
+                # First pass: compute a tile, spill its counts and add its histogram
+                smooth = self._compute_tile(fractal, view, tile, apron, backend, cancel)
+                if smooth is None:
+                    return None
+                spill[block(tile)] = smooth
+                inner = smooth[apron:apron + tile.height, apron:apron + tile.width]
+                counts = iteration_histogram(inner, fractal.max_iter)
+                with lock:
+                    histogram[:] += counts
+                return tile
+
+            if not self._stream(tiles, collect, None, cancel, first if progress is not None else None):
+                return False
+            shade = equalize(histogram)
+
+            def colour(tile: PosterTile) -> Optional[np.ndarray]:
+                # Second pass: colour a spilled tile with the histogram of the whole view
+                if cancel.is_set():
+                    return None
+                smooth = np.array(spill[block(tile)])
+                return self._shade_tile(fractal, view, tile, smooth, shade, backend, cancel, antialias)
+
+            return self._stream(tiles, colour, sink, cancel, second if progress is not None else None)
+
+    def _stream(
+        self,
+        tiles: list[PosterTile],
+        work: Callable[[PosterTile], Optional[object]],
+        sink: Optional[TileSink],
+        cancel: threading.Event,
+        progress: Optional[Callable[[int, int], None]]
+    ) -> bool:
+        # Run work on every tile on the pool, at most max_pending at a time, handing the results to the
+        # sink in tile order; False once a tile comes back as None (cancelled)
+        pending: deque[tuple[PosterTile, Future]] = deque()
+        done = 0
+
+        def write_next() -> bool:
+            nonlocal done
+            tile, future = pending.popleft()
+            result = future.result()
+            if result is None:
+                return False
+            if sink is not None:
+                sink.write_tile(tile.top, tile.left, result)
+            done += 1
+            if progress is not None:
+                progress(done, len(tiles))
+            return True
+
+        try:
+            for tile in tiles:
+                pending.append((tile, self._pool.submit(work, tile)))
+                if len(pending) >= self._max_pending and not write_next():
+                    return False
+            while pending:
+                if not write_next():
+                    return False
+        finally:
+            for _, future in pending:
+                future.cancel()
+        return not cancel.is_set()
+
+    def _compute_tile(
+        self,
+        fractal: FractalSet,
+        view: View,
+        tile: PosterTile,
+        apron: int,
+        backend: Optional[str],
+        cancel: threading.Event
+    ) -> Optional[np.ndarray]:
+        # Smooth counts of one tile and its apron (None once cancelled)
+        if cancel.is_set():
+            return None
+        dtype = view.coordinate_dtype(fractal.precision)
+        real_dtype = np.finfo(dtype).dtype
+        lattice = view.lattice
+        x = lattice.x_coords(view.first_column + tile.left - apron, tile.width + 2 * apron, real_dtype)
+        y = lattice.y_coords(view.first_row + tile.top - apron, tile.height + 2 * apron, real_dtype)
+        X, Y = np.meshgrid(x, y)
+        smooth: np.ndarray = fractal.compute_array((X + 1j * Y).astype(dtype), output="smooth", backend=backend)
+        return smooth
+
+    def _render_tile(
+        self,
+        fractal: FractalSet,
+        view: View,
+        tile: PosterTile,
+        shade: Shader,
+        backend: Optional[str],
+        cancel: threading.Event,
+        antialias: int = 1
+    ) -> Optional[np.ndarray]:
+        # Compute and shade one tile (None once cancelled)
+        smooth = self._compute_tile(fractal, view, tile, 1 if antialias > 1 else 0, backend, cancel)
+        if smooth is None:
+            return None
+        return self._shade_tile(fractal, view, tile, smooth, shade, backend, cancel, antialias)
+
+    def _shade_tile(
+        self,
+        fractal: FractalSet,
+        view: View,
+        tile: PosterTile,
+        smooth: np.ndarray,
+        shade: Shader,
+        backend: Optional[str],
+        cancel: threading.Event,
+        antialias: int = 1
+    ) -> Optional[np.ndarray]:
+        # Shade the smooth counts of one tile (with a one-pixel apron when anti-aliasing), supersampling
+        # the pixels along edges (None once cancelled)
+        pixels: np.ndarray
+        if antialias <= 1:
+            pixels = shade(smooth, fractal.max_iter)
+            return pixels
+
+        dtype = view.coordinate_dtype(fractal.precision)
+        real_dtype = np.finfo(dtype).dtype
+        x = view.lattice.x_coords(view.first_column + tile.left - 1, tile.width + 2, real_dtype)
+        y = view.lattice.y_coords(view.first_row + tile.top - 1, tile.height + 2, real_dtype)
+        inner = (slice(1, -1), slice(1, -1))
+        pixels = shade(smooth[inner], fractal.max_iter)
+        rows, cols = np.nonzero(refine_mask(smooth, fractal.max_iter, DEFAULT_AA_THRESHOLD)[inner])
+        if not len(rows):
+            return pixels
+        # Seeded by tile position, so that a poster renders the same every time
+        means = supersample(
+            fractal, x[cols + 1], y[rows + 1], (view.column_step, view.row_step), shade, antialias,
+            backend, cancel, seed=tile.top * view.width + tile.left, dtype=dtype
+        )
+        if means is None:
+            return None
+        pixels[rows, cols] = np.rint(means) if np.issubdtype(pixels.dtype, np.integer) else means
+        return pixels
+
+    def close(self) -> None:
+        """Shut down the worker threads."""
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "PosterRenderer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,200 @@
+"""
+Process-pool renderer with shared-memory output.
+
+For backends whose kernels hold the GIL, threads do not scale. This renderer
+keeps a set of worker processes warm across frames. For every frame each
+worker receives the engine (its get_parameters() values plus engine options)
+and the view exactly once. Row bands are then handed out through a shared task
+queue, and workers write their results directly into a
+multiprocessing.shared_memory block, so no pixel data is ever pickled.
+"""
+
+import multiprocessing as mp
+import os
+import traceback
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+
+from fractalzoomer.core import FractalSet
+from fractalzoomer.render.parallel import DEFAULT_BAND_HEIGHT, output_dtype, schedule_bands
+from fractalzoomer.render.view import View
+
+
+class _Frame(NamedTuple):
+    # Per-frame setup broadcast once to every worker
+    fractal: FractalSet
+    view: View
+    output: str
+    backend: Optional[str]
+    shm_name: str
+    dtype: str
+    coords_dtype: str
+
+
+def _worker_main(setup_conn: Any, tasks: Any, results: Any) -> None:
+    # Worker loop: receive a frame setup, render bands until the end-of-frame sentinel,
+    # report completion (None or a formatted traceback), repeat until shutdown.
+    shm: Optional[SharedMemory] = None
+    while True:
+        frame = setup_conn.recv()
+        if frame is None:
+            break
+        error = None
+        out = None
+        try:
+            if shm is None or shm.name != frame.shm_name:
+                if shm is not None:
+                    shm.close()
+                shm = SharedMemory(name=frame.shm_name)
+            out = np.ndarray(frame.view.shape, dtype=frame.dtype, buffer=shm.buf)
+        except Exception:
+            error = traceback.format_exc()
+
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            if error is not None or out is None:
+                continue
+            try:
+                points = frame.view.grid(rows=slice(*task), dtype=frame.coords_dtype)
+                out[task[0]:task[1]] = frame.fractal.compute_array(
+                    points, output=frame.output, backend=frame.backend
+                )
+            except Exception:
+                error = traceback.format_exc()
+        # Release the buffer view before the shared block may be closed
+        del out
+        results.put(error)
+
+    if shm is not None:
+        shm.close()
+
+
+class ProcessRenderer:
+    """Renders views on persistent worker processes writing into shared memory."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        band_height: int = DEFAULT_BAND_HEIGHT,
+        start_method: str = "spawn"
+    ):
+        """
+        Initialize the renderer and start the worker processes.
+
+        Args:
+            workers: Number of worker processes (defaults to the CPU count).
+            band_height: Rows per band.
+            start_method: multiprocessing start method for the workers.
+        """
+        if band_height <= 0:
+            raise ValueError("band_height must be a positive integer")
+        self._workers = workers or os.cpu_count() or 1
+        self._band_height = band_height
+        self._shm: Optional[SharedMemory] = None
+
+        # Any: the concrete context (and its Process class) depends on the method name
+        ctx: Any = mp.get_context(start_method)
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+        self._setup_conns = []
+        self._processes = []
+        for _ in range(self._workers):
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker_main,
+                args=(child_conn, self._tasks, self._results),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._setup_conns.append(parent_conn)
+            self._processes.append(process)
+
+    @property
+    def workers(self) -> int:
+        """Get the number of worker processes."""
+        return self._workers
+
+    def render(
+        self,
+        fractal: FractalSet,
+        view: View,
+        output: str = "counts",
+        out: Optional[np.ndarray] = None,
+        backend: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Render a view on the worker processes.
+
+        Args:
+            fractal: Engine to evaluate.
+            view: Region and pixel grid to render.
+            output: compute_array output mode ("z", "counts" or "smooth").
+            out: Optional preallocated buffer of shape view.shape.
+            backend: Compute backend name used by the workers.
+
+        Returns:
+            The filled output buffer.
+
+        Raises:
+            RuntimeError: If a worker failed while rendering.
+        """
+        if not self._processes:
+            raise RuntimeError("ProcessRenderer is closed")
+        dtype = output_dtype(fractal, output, view)
+        if out is None:
+            out = np.empty(view.shape, dtype=dtype)
+        elif out.shape != view.shape:
+            raise ValueError(f"Output buffer shape {out.shape} does not match view {view.shape}")
+
+        shm = self._shared_block(view.height * view.width * dtype.itemsize)
+        coords_dtype = view.coordinate_dtype(fractal.precision)
+        frame = _Frame(fractal, view, output, backend, shm.name, dtype.str, coords_dtype.str)
+        for conn in self._setup_conns:
+            conn.send(frame)
+        for band in schedule_bands(fractal, view, self._band_height, backend):
+            self._tasks.put((band.start, band.stop))
+        for _ in self._processes:
+            self._tasks.put(None)
+
+        errors = [self._results.get() for _ in self._processes]
+        failures = [error for error in errors if error is not None]
+        if failures:
+            raise RuntimeError(f"Render worker failed:\n{failures[0]}")
+
+        out[...] = np.ndarray(view.shape, dtype=dtype, buffer=shm.buf)
+        return out
+
+    def _shared_block(self, nbytes: int) -> SharedMemory:
+        # Reuse the block across frames, growing it only when a larger frame arrives
+        if self._shm is None or self._shm.size < nbytes:
+            self._release_block()
+            self._shm = SharedMemory(create=True, size=max(nbytes, 1))
+        return self._shm
+
+    def _release_block(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def close(self) -> None:
+        """Stop the worker processes and free the shared block."""
+        for conn in self._setup_conns:
+            conn.send(None)
+            conn.close()
+        for process in self._processes:
+            process.join()
+        self._setup_conns = []
+        self._processes = []
+        self._release_block()
+
+    def __enter__(self) -> "ProcessRenderer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,195 @@
+"""
+Progressive coarse-to-fine renderer.
+
+A frame is refined over several passes on successively finer pixel lattices:
+every 8th pixel, then every 4th, 2nd and finally every pixel. Each pass only
+evaluates the lattice points the previous passes have not computed (three
+quarters of them from the second pass on), so the whole sequence costs one
+full-resolution frame. After every pass the caller receives a full-size
+preview in which each pixel repeats the nearest computed sample above and to
+its left.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from fractalzoomer.core import FractalSet
+from fractalzoomer.render.parallel import output_dtype
+from fractalzoomer.render.view import View
+
+# Lattice strides of the refinement passes, coarsest first
+DEFAULT_STEPS = (8, 4, 2, 1)
+
+# Points per task when a pass is split across the worker threads
+CHUNK_SIZE = 8192
+
+
+class ProgressivePass(NamedTuple):
+    """One refinement of a progressive render."""
+
+    step: int  # Lattice stride of the pass (1 for the final frame)
+    frame: np.ndarray  # Full-size preview of shape view.shape
+
+
+def lattice_preview(frame: np.ndarray, step: int) -> np.ndarray:
+    """Full-size preview of a frame repeating every step-th sample right and down."""
+    height, width = frame.shape
+    preview = np.repeat(np.repeat(frame[::step, ::step], step, axis=0), step, axis=1)
+    return preview[:height, :width]
+
+
+# Strides must shrink by exact divisors so every pass reuses the previous lattice
+def _validate_steps(steps: Sequence[int]) -> tuple[int, ...]:
+    steps = tuple(int(step) for step in steps)
+    if not steps or steps[-1] != 1:
+        raise ValueError("steps must end with 1")
+    for coarse, fine in zip(steps, steps[1:]):
+        if fine <= 0 or coarse <= fine or coarse % fine:
+            raise ValueError("steps must decrease, each dividing the previous one")
+    return steps
+
+
+class ProgressiveRenderer:
+    """Renders views as a sequence of coarse-to-fine previews."""
+
+    def __init__(self, steps: Sequence[int] = DEFAULT_STEPS, workers: Optional[int] = None):
+        """
+        Initialize the renderer.
+
+        Args:
+            steps: Lattice strides of the passes, coarsest first, ending with 1.
+            workers: Number of worker threads (defaults to the CPU count).
+        """
+        self._steps = _validate_steps(steps)
+        self._workers = workers or os.cpu_count() or 1
+        self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="fractal-pass")
+
+    @property
+    def steps(self) -> tuple[int, ...]:
+        """Get the lattice strides of the passes."""
+        return self._steps
+
+    def passes(
+        self,
+        fractal: FractalSet,
+        view: View,
+        output: str = "smooth",
+        backend: Optional[str] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> Iterator[ProgressivePass]:
+        """
+        Render a view pass by pass.
+
+        The generator can be abandoned after any pass; no further work is done.
+        Setting cancel stops it mid-pass, after the chunks already running.
+
+        Args:
+            fractal: Engine to evaluate.
+            view: Region and pixel grid to render.
+            output: compute_array output mode ("z", "counts" or "smooth").
+            backend: Compute backend name (see fractalzoomer.core.backends).
+            cancel: Optional event that ends the generator early when set.
+
+        Yields:
+            A ProgressivePass per step. The last frame is the exact render.
+        """
+        dtype = view.coordinate_dtype(fractal.precision)
+        out = np.empty(view.shape, dtype=output_dtype(fractal, output, view))
+        done = np.zeros(view.shape, dtype=bool)
+        for step in self._steps:
+            todo = np.zeros(view.shape, dtype=bool)
+            todo[::step, ::step] = True
+            todo &= ~done
+            rows, cols = np.nonzero(todo)
+            values = self._evaluate(fractal, view.points(rows, cols, dtype), output, backend, cancel)
+            if values is None:
+                return
+            out[rows, cols] = values
+            done |= todo
+
+            yield ProgressivePass(step, out if step == 1 else lattice_preview(out, step))
+
+    def refine(
+        self,
+        fractal: FractalSet,
+        view: View,
+        preview: np.ndarray,
+        priority: np.ndarray,
+        output: str = "smooth",
+        backend: Optional[str] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> Iterator[np.ndarray]:
+        """
+        Turn an approximate frame of a view into the exact one.
+
+        Args:
+            fractal: Engine to evaluate.
+            view: Region and pixel grid to render.
+            preview: Approximate frame (e.g. from reproject_frame); not modified.
+            priority: Mask of the pixels to recompute before all others.
+            output: compute_array output mode ("z", "counts" or "smooth").
+            backend: Compute backend name (see fractalzoomer.core.backends).
+            cancel: Optional event that ends the generator early when set.
+
+        Yields:
+            The preview with the priority pixels recomputed, then the exact frame.
+        """
+        dtype = view.coordinate_dtype(fractal.precision)
+        out = preview.astype(output_dtype(fractal, output, view), copy=True)
+        for mask in (priority, ~priority):
+            rows, cols = np.nonzero(mask)
+            values = self._evaluate(fractal, view.points(rows, cols, dtype), output, backend, cancel)
+            if values is None:
+                return
+            out[rows, cols] = values
+            yield out.copy() if mask is priority else out
+
+    def render(
+        self,
+        fractal: FractalSet,
+        view: View,
+        output: str = "smooth",
+        backend: Optional[str] = None
+    ) -> np.ndarray:
+        """Run every pass and return the final full-resolution frame."""
+        for result in self.passes(fractal, view, output, backend):
+            pass
+        return result.frame
+
+    def _evaluate(
+        self,
+        fractal: FractalSet,
+        points: np.ndarray,
+        output: str,
+        backend: Optional[str],
+        cancel: Optional[threading.Event]
+    ) -> Optional[np.ndarray]:
+        # Evaluate a batch of points in chunks on the worker threads (None once cancelled)
+        def evaluate_chunk(chunk: np.ndarray) -> np.ndarray:
+            if cancel is not None and cancel.is_set():
+                return chunk[:0]  # Skipped: the whole batch is discarded below
+            values: np.ndarray = fractal.compute_array(chunk, output=output, backend=backend)
+            return values
+
+        chunks = np.array_split(points, max(1, -(-points.size // CHUNK_SIZE)))
+        if self._workers == 1 or len(chunks) == 1:
+            results = [evaluate_chunk(chunk) for chunk in chunks]
+        else:
+            results = list(self._pool.map(evaluate_chunk, chunks))
+        if cancel is not None and cancel.is_set():
+            return None
+        return np.concatenate(results)
+
+    def close(self) -> None:
+        """Shut down the worker threads."""
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "ProgressiveRenderer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,248 @@
+"""
+Resumable rendering across iteration limits.
+
+A view is rendered to an EscapeState (see FractalSet.compute_state) rather
+than to a finished frame. Raising the iteration limit then only continues the
+points that were still bounded, from where they stopped; lowering it derives
+the frame from the stored escape counts without iterating at all. Deepening
+keeps adding passes of iterations to the bounded points until a pass no
+longer changes the image.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Optional, Sequence
+
+import numpy as np
+
+from fractalzoomer.core import EscapeState, FractalSet
+from fractalzoomer.render.incremental import engine_key
+from fractalzoomer.render.parallel import DEFAULT_BAND_HEIGHT, row_bands
+from fractalzoomer.render.progressive import CHUNK_SIZE, DEFAULT_STEPS, _validate_steps
+from fractalzoomer.render.view import View
+
+# Iterations added by every deepening pass
+DEFAULT_DEEPEN_STEP = 128
+
+# Iteration limit deepening never goes past
+DEFAULT_DEEPEN_LIMIT = 16384
+
+# Deepening stops once a pass lets fewer than this fraction of the pixels escape
+DEFAULT_DEEPEN_TOLERANCE = 1e-4
+
+
+def resumable_key(fractal: FractalSet) -> tuple:
+    """engine_key() without max_iter: engines whose states can be resumed into each other."""
+    name, parameters, *rest = engine_key(fractal)
+    return (name, tuple(item for item in parameters if item[0] != "max_iter"), *rest)
+
+
+# Rows of every array of a state
+def _band(state: EscapeState, rows: slice) -> EscapeState:
+    return EscapeState(
+        state.z[rows], state.c[rows], state.counts[rows], state.escaped[rows], state.active[rows], state.iterations
+    )
+
+
+# Stack band states back into one (they share the same iteration count)
+def _join(states: list[EscapeState]) -> EscapeState:
+    return EscapeState(*(np.concatenate(arrays) for arrays in list(zip(*states))[:5]), states[0].iterations)
+
+
+class ResumableRenderer:
+    """Renders views to resumable escape states on a thread pool, one row band per task."""
+
+    def __init__(self, workers: Optional[int] = None, band_height: int = DEFAULT_BAND_HEIGHT):
+        """
+        Initialize the renderer.
+
+        Args:
+            workers: Number of worker threads (defaults to the CPU count).
+            band_height: Rows per task.
+        """
+        if band_height <= 0:
+            raise ValueError("band_height must be a positive integer")
+        self._workers = workers or os.cpu_count() or 1
+        self._band_height = band_height
+        self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="fractal-resume")
+
+    def render(
+        self,
+        fractal: FractalSet,
+        view: View,
+        backend: Optional[str] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> Optional[EscapeState]:
+        """
+        Render a view to an escape state at the engine's max_iter.
+
+        Args:
+            fractal: Engine to evaluate.
+            view: Region and pixel grid to render.
+            backend: Compute backend name (see fractalzoomer.core.backends).
+            cancel: Optional event that abandons the render when set.
+
+        Returns:
+            The state, of shape view.shape, or None if the render was cancelled.
+        """
+        dtype = view.coordinate_dtype(fractal.precision)
+        return self._map(
+            lambda rows: fractal.compute_state(view.grid(rows=rows, dtype=dtype), backend=backend),
+            view.height, cancel
+        )
+
+    def passes(
+        self,
+        fractal: FractalSet,
+        view: View,
+        steps: Sequence[int] = DEFAULT_STEPS,
+        backend: Optional[str] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> Iterator[tuple[int, EscapeState]]:
+        """
+        Render a view to an escape state coarse to fine, as ProgressiveRenderer does.
+
+        Every pass only computes the lattice points the previous passes have
+        not, so the whole sequence costs one render() and its last state can
+        be resumed. The generator can be abandoned after any pass.
+
+        Args:
+            fractal: Engine to evaluate.
+            view: Region and pixel grid to render.
+            steps: Lattice strides of the passes, coarsest first, ending with 1.
+            backend: Compute backend name (see fractalzoomer.core.backends).
+            cancel: Optional event that ends the generator early when set.
+
+        Yields:
+            (step, state) after every pass. The state is updated in place by
+            the next pass; pixels not sampled yet are neither escaped nor
+            active. The last state covers every pixel.
+        """
+        dtype = view.coordinate_dtype(fractal.precision)
+        state: Optional[EscapeState] = None
+        done = np.zeros(view.shape, dtype=bool)
+        for step in _validate_steps(steps):
+            todo = np.zeros(view.shape, dtype=bool)
+            todo[::step, ::step] = True
+            todo &= ~done
+            rows, cols = np.nonzero(todo)
+            if rows.size:
+                points = view.points(rows, cols, dtype)
+                sampled = self._map(
+                    lambda part: fractal.compute_state(points[part], backend=backend), points.size, cancel, CHUNK_SIZE
+                )
+                if sampled is None:
+                    return
+                if state is None:
+                    state = EscapeState(
+                        *(np.zeros(view.shape, dtype=array.dtype) for array in sampled[:5]), sampled.iterations
+                    )
+                for full, part in zip(state[:5], sampled[:5]):
+                    full[rows, cols] = part
+                done |= todo
+            if state is not None:
+                yield step, state
+
+    def resume(
+        self,
+        fractal: FractalSet,
+        state: EscapeState,
+        max_iter: Optional[int] = None,
+        backend: Optional[str] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> Optional[EscapeState]:
+        """
+        Continue the bounded points of a state up to max_iter iterations.
+
+        Args:
+            fractal: Engine that produced the state.
+            state: State to continue (not modified).
+            max_iter: Iteration limit (the engine's max_iter if None).
+            backend: Compute backend name (see fractalzoomer.core.backends).
+            cancel: Optional event that abandons the render when set.
+
+        Returns:
+            The continued state (state itself if it already ran max_iter
+            iterations), or None if the render was cancelled.
+        """
+        max_iter = fractal.max_iter if max_iter is None else max_iter
+        if max_iter <= state.iterations:
+            return state
+        return self._map(
+            lambda rows: fractal.resume(_band(state, rows), max_iter, backend=backend),
+            state.z.shape[0], cancel
+        )
+
+    def deepen(
+        self,
+        fractal: FractalSet,
+        state: EscapeState,
+        step: int = DEFAULT_DEEPEN_STEP,
+        limit: int = DEFAULT_DEEPEN_LIMIT,
+        tolerance: float = DEFAULT_DEEPEN_TOLERANCE,
+        backend: Optional[str] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> Iterator[EscapeState]:
+        """
+        Keep adding iterations to the bounded points until the image settles.
+
+        Args:
+            fractal: Engine that produced the state.
+            state: State to start from (not modified).
+            step: Iterations added by every pass.
+            limit: Iteration count the passes never go past.
+            tolerance: The passes stop once one lets at most this fraction
+                of the pixels escape.
+            backend: Compute backend name (see fractalzoomer.core.backends).
+            cancel: Optional event that ends the generator early when set.
+
+        Yields:
+            The state after every pass.
+        """
+        if step <= 0:
+            raise ValueError("step must be a positive integer")
+        if tolerance < 0:
+            raise ValueError("tolerance must be non-negative")
+        pixels = state.z.size
+        while state.iterations < limit and state.active.any():
+            escaped = int(np.count_nonzero(state.escaped))
+            state = self.resume(fractal, state, min(state.iterations + step, limit), backend, cancel)
+            if state is None:
+                return
+            yield state
+            if np.count_nonzero(state.escaped) - escaped <= tolerance * pixels:
+                return
+
+    def _map(
+        self,
+        task: Callable[[slice], EscapeState],
+        height: int,
+        cancel: Optional[threading.Event],
+        band_height: Optional[int] = None
+    ) -> Optional[EscapeState]:
+        # Run task on every row band (of band_height rows if given) on the worker threads and
+        # stack the results (None once cancelled)
+        def run(rows: slice) -> Optional[EscapeState]:
+            if cancel is not None and cancel.is_set():
+                return None
+            return task(rows)
+
+        bands = row_bands(height, band_height or self._band_height)
+        if self._workers == 1 or len(bands) == 1:
+            states = [run(rows) for rows in bands]
+        else:
+            states = list(self._pool.map(run, bands))
+        if cancel is not None and cancel.is_set():
+            return None
+        return _join(states)
+
+    def close(self) -> None:
+        """Shut down the worker threads."""
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "ResumableRenderer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,114 @@
+"""
+Background render scheduler.
+
+Interactive front ends request a new frame on every slider tick or mouse
+motion, far faster than frames can be computed. The scheduler runs renders on
+a single background thread and keeps at most one request waiting: a newer
+request replaces the waiting one and cancels the render in flight, so only the
+newest view is ever finished. Every intermediate result of the running job is
+handed to a delivery callback together with the job's generation number, which
+lets the caller drop frames that were superseded after delivery.
+"""
+
+import threading
+import traceback
+from typing import Any, Callable, Iterable, Optional
+
+# A render job: receives the cancellation event and yields its results, checking
+# the event often enough to stop soon after it is set
+RenderJob = Callable[[threading.Event], Iterable[Any]]
+
+
+class RenderScheduler:
+    """Runs the newest submitted render job on a background thread."""
+
+    def __init__(self, deliver: Callable[[int, Any], None]):
+        """
+        Initialize the scheduler and start its thread.
+
+        Args:
+            deliver: Called on the render thread with (generation, result)
+                for every result of a job that has not been superseded.
+        """
+        self._deliver = deliver
+        self._condition = threading.Condition()
+        self._pending: Optional[tuple[int, RenderJob]] = None
+        self._cancel = threading.Event()
+        self._generation = 0
+        self._busy = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="fractal-render", daemon=True)
+        self._thread.start()
+
+    @property
+    def generation(self) -> int:
+        """Get the generation number of the newest submitted job."""
+        return self._generation
+
+    def submit(self, job: RenderJob) -> int:
+        """
+        Schedule a job, superseding any waiting or running one.
+
+        Args:
+            job: Render job to run.
+
+        Returns:
+            The generation number passed to deliver with the job's results.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("RenderScheduler is closed")
+            self._generation += 1
+            self._pending = (self._generation, job)
+            self._cancel.set()
+            self._condition.notify_all()
+            return self._generation
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every submitted job has finished or been cancelled.
+
+        Returns:
+            False if the timeout expired first.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending is None and not self._busy, timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._closed)
+                pending = self._pending
+                if self._closed or pending is None:
+                    return
+                generation, job = pending
+                self._pending = None
+                self._cancel = cancel = threading.Event()
+                self._busy = True
+            try:
+                for result in job(cancel):
+                    if cancel.is_set():
+                        break
+                    self._deliver(generation, result)
+            except Exception:
+                # A failing job must not take the render thread down with it
+                traceback.print_exc()
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def close(self) -> None:
+        """Cancel outstanding work and stop the render thread."""
+        with self._condition:
+            self._closed = True
+            self._pending = None
+            self._cancel.set()
+            self._condition.notify_all()
+        self._thread.join()
+
+    def __enter__(self) -> "RenderScheduler":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
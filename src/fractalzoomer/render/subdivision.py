@@ -0,0 +1,208 @@
+"""
+Mariani–Silver rectangle subdivision renderer.
+
+Escape-time images consist of large regions sharing one iteration count, and
+those regions are simply connected. The renderer therefore evaluates only the
+border of a rectangle: when every border pixel has the same count, the inside
+is filled with it; otherwise the rectangle is split into quadrants whose new
+borders are evaluated in turn. All borders of one subdivision level are
+gathered into a single batch and evaluated with one compute_array call, so
+the vectorized and compiled backends still see large arrays.
+"""
+
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from fractalzoomer.core import FractalSet
+from fractalzoomer.render.parallel import output_dtype
+from fractalzoomer.render.view import View
+
+# Rectangles whose inside is at most this many pixels across are evaluated directly
+DEFAULT_MIN_SIZE = 6
+
+# Output modes the subdivision can reproduce (z values are never uniform)
+SUBDIVISION_OUTPUTS = ("counts", "smooth")
+
+
+class SubdivisionStats(NamedTuple):
+    """Pixel accounting of the last SubdivisionRenderer.render call."""
+
+    evaluated: int  # Pixels passed to the engine
+    filled: int  # Pixels filled from a uniform border
+    mismatched: int  # Filled pixels whose evaluated value differs (strict mode only)
+
+
+# Concatenation of range(start, start + length) for every (start, length) pair
+def _ranges(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    indices: np.ndarray = np.repeat(starts, lengths) + np.arange(offsets.size) - offsets
+    return indices
+
+
+# Pixels on the borders of the inclusive rectangles [top, bottom] x [left, right] and the
+# index of the rectangle each belongs to (a rectangle one pixel high or wide is all border)
+def _borders(rects: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    top, bottom, left, right = rects.T
+    ids = np.arange(len(rects))
+    width = right - left + 1
+    height = np.maximum(bottom - top - 1, 0)
+    rows = np.concatenate([
+        np.repeat(top, width), np.repeat(bottom, width),
+        _ranges(top + 1, height), _ranges(top + 1, height),
+    ])
+    cols = np.concatenate([
+        _ranges(left, width), _ranges(left, width),
+        np.repeat(left, height), np.repeat(right, height),
+    ])
+    owners = np.concatenate([np.repeat(ids, width)] * 2 + [np.repeat(ids, height)] * 2)
+    return rows, cols, owners
+
+
+# Number of rows and columns strictly inside the inclusive rectangles [top, bottom] x [left, right]
+def _inside_extents(rects: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    top, bottom, left, right = rects.T
+    return np.maximum(bottom - top - 1, 0), np.maximum(right - left - 1, 0)
+
+
+# Pixels strictly inside the inclusive rectangles [top, bottom] x [left, right]
+def _insides(rects: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    top, _, left, _ = rects.T
+    height, inner_width = _inside_extents(rects)
+    width = np.repeat(inner_width, height)
+    rows = _ranges(top + 1, height)
+    return np.repeat(rows, width), _ranges(np.repeat(left + 1, height), width)
+
+
+# Split inclusive rectangles into halves along every side long enough, sharing the cut lines
+def _split(rects: np.ndarray) -> np.ndarray:
+    top, bottom, left, right = rects.T
+    mid_row = (top + bottom) // 2
+    mid_col = (left + right) // 2
+    split_rows = bottom - top > 2
+    split_cols = right - left > 2
+    upper_bottom = np.where(split_rows, mid_row, bottom)
+    left_right = np.where(split_cols, mid_col, right)
+    both = split_rows & split_cols
+    return np.concatenate([
+        np.stack([top, upper_bottom, left, left_right], axis=1),
+        np.stack([top, upper_bottom, mid_col, right], axis=1)[split_cols],
+        np.stack([mid_row, bottom, left, left_right], axis=1)[split_rows],
+        np.stack([mid_row, bottom, mid_col, right], axis=1)[both],
+    ])
+
+
+class SubdivisionRenderer:
+    """Renders iteration counts by recursive rectangle subdivision."""
+
+    def __init__(self, min_size: int = DEFAULT_MIN_SIZE, strict: bool = False):
+        """
+        Initialize the renderer.
+
+        Args:
+            min_size: Rectangles with an inside at most this many pixels high
+                or wide are evaluated pixel by pixel instead of subdivided.
+            strict: Evaluate filled pixels as well and keep the exact values,
+                counting the fills that were wrong (for verification).
+        """
+        if min_size <= 0:
+            raise ValueError("min_size must be a positive integer")
+        self._min_size = min_size
+        self._strict = strict
+        self._stats = SubdivisionStats(0, 0, 0)
+
+    @property
+    def strict(self) -> bool:
+        """Get whether filled pixels are verified by full evaluation."""
+        return self._strict
+
+    @property
+    def stats(self) -> SubdivisionStats:
+        """Get the pixel accounting of the last render."""
+        return self._stats
+
+    def render(
+        self,
+        fractal: FractalSet,
+        view: View,
+        output: str = "counts",
+        out: Optional[np.ndarray] = None,
+        backend: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Render a view, evaluating only the pixels subdivision cannot infer.
+
+        With output="smooth" only rectangles bordered by interior points are
+        filled, since smooth values vary inside a band of equal counts.
+
+        Args:
+            fractal: Engine to evaluate.
+            view: Region and pixel grid to render.
+            output: "counts" or "smooth".
+            out: Optional preallocated buffer of shape view.shape.
+            backend: Compute backend name (see fractalzoomer.core.backends).
+
+        Returns:
+            The filled output buffer.
+        """
+        if output not in SUBDIVISION_OUTPUTS:
+            raise ValueError(f"Subdivision supports only {SUBDIVISION_OUTPUTS} output, got {output}")
+        if fractal.escape_radius is None:
+            raise ValueError("Iteration count output requires an escape_radius")
+        if out is None:
+            out = np.empty(view.shape, dtype=output_dtype(fractal, output, view))
+        elif out.shape != view.shape:
+            raise ValueError(f"Output buffer shape {out.shape} does not match view {view.shape}")
+
+        dtype = view.coordinate_dtype(fractal.precision)
+        known = np.zeros(view.shape, dtype=bool)
+        filled = np.zeros(view.shape, dtype=bool)
+        evaluated = 0
+
+        def evaluate(rows: np.ndarray, cols: np.ndarray) -> None:
+            # Evaluate every listed pixel not computed yet, in one engine call
+            nonlocal evaluated
+            todo = np.zeros(view.shape, dtype=bool)
+            todo[rows, cols] = True
+            todo &= ~known
+            rows, cols = np.nonzero(todo)
+            if rows.size == 0:
+                return
+            out[rows, cols] = fractal.compute_array(view.points(rows, cols, dtype), output=output, backend=backend)
+            known[rows, cols] = True
+            evaluated += rows.size
+
+        # Rectangles of the current subdivision level as (top, bottom, left, right) rows
+        pending = np.array([[0, view.height - 1, 0, view.width - 1]], dtype=np.intp)
+        while pending.size:
+            rows, cols, owners = _borders(pending)
+            evaluate(rows, cols)
+
+            # A rectangle is uniform when every border pixel matches its top-left corner
+            corner = out[pending[:, 0], pending[:, 2]]
+            uniform = np.ones(len(pending), dtype=bool)
+            uniform[owners[out[rows, cols] != corner[owners]]] = False
+            if output == "smooth":
+                uniform &= corner == fractal.max_iter
+
+            fill = pending[uniform]
+            rows, cols = _insides(fill)
+            height, width = _inside_extents(fill)
+            out[rows, cols] = np.repeat(corner[uniform], height * width)
+            filled[rows, cols] = True
+
+            top, bottom, left, right = pending.T
+            rest = pending[~uniform & (bottom - top >= 2) & (right - left >= 2)]
+            small = np.minimum(rest[:, 1] - rest[:, 0], rest[:, 3] - rest[:, 2]) - 1 <= self._min_size
+            evaluate(*_insides(rest[small]))
+            pending = _split(rest[~small])
+
+        mismatched = 0
+        if self._strict and filled.any():
+            guessed = out[filled]
+            rows, cols = np.nonzero(filled)
+            out[rows, cols] = fractal.compute_array(view.points(rows, cols, dtype), output=output, backend=backend)
+            mismatched = int(np.count_nonzero(out[filled] != guessed))
+            evaluated += rows.size
+        self._stats = SubdivisionStats(evaluated, int(np.count_nonzero(filled)), mismatched)
+        return out
@@ -0,0 +1,345 @@
+"""
+Tile cache and tiled renderer.
+
+Frames are assembled from square tiles of the global sampling lattice (see
+View.lattice). A tile is identified by the engine that computed it, the
+precision and output mode, the lattice (the "level": pixel spacing and phase)
+and its tile coordinates on that lattice, so any view that overlaps a
+previously rendered one, however it was reached, can reuse its tiles. Tiles
+are kept in an LRU cache with a memory budget; the renderer only computes the
+tiles the cache misses.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from fractalzoomer.core import FractalSet
+from fractalzoomer.render.disk_cache import DiskTileCache
+from fractalzoomer.render.incremental import engine_key
+from fractalzoomer.render.parallel import output_dtype
+from fractalzoomer.render.view import Lattice, View
+
+# Pixels along each side of a tile
+DEFAULT_TILE_SIZE = 32
+
+# Memory budget of a TileCache when none is given
+DEFAULT_CACHE_BYTES = 128 * 1024 * 1024
+
+# Tiles evaluated together in one compute_array call
+TILES_PER_TASK = 8
+
+
+class TileKey(NamedTuple):
+    """Identity of a cached tile."""
+
+    engine: tuple  # engine_key() of the fractal
+    precision: str  # Resolved coordinate dtype
+    output: str  # compute_array output mode
+    level: Lattice  # Sampling lattice (spacing and phase)
+    tile_size: int
+    row: int  # Tile row on the lattice
+    col: int  # Tile column on the lattice
+
+
+class CacheStats(NamedTuple):
+    """Counters of a tile cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    tiles: int  # Tiles currently held
+    nbytes: int  # Bytes currently held
+
+
+class TileCache:
+    """Thread-safe in-memory LRU cache of tiles with a memory budget."""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES, disk: Optional[DiskTileCache] = None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes: Total size of the tiles kept before the least recently
+                used ones are evicted.
+            disk: Optional persistent second level. Memory misses are looked
+                up there, and stored tiles are written through to it.
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer")
+        self._max_bytes = max_bytes
+        self._tiles: OrderedDict[TileKey, np.ndarray] = OrderedDict()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._disk = disk
+        self._lock = threading.Lock()
+
+    @property
+    def disk(self) -> Optional[DiskTileCache]:
+        """Get the persistent second level, if any."""
+        return self._disk
+
+    @property
+    def max_bytes(self) -> int:
+        """Get the memory budget in bytes."""
+        return self._max_bytes
+
+    @property
+    def stats(self) -> CacheStats:
+        """Get the hit, miss and eviction counters and the current size."""
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._tiles), self._nbytes)
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def __contains__(self, key: TileKey) -> bool:
+        return key in self._tiles or (self._disk is not None and key in self._disk)
+
+    def get(self, key: TileKey) -> Optional[np.ndarray]:
+        """
+        Look a tile up, marking it as recently used.
+
+        Returns:
+            The read-only tile, or None on a miss.
+        """
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                self._hits += 1
+                return tile
+        tile = self._disk.get(key) if self._disk is not None else None
+        with self._lock:
+            if tile is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        self._store(key, tile)
+        kept: np.ndarray = self._tiles.get(key, tile)  # The read-only copy unless too large to keep
+        return kept
+
+    def put(self, key: TileKey, tile: np.ndarray) -> None:
+        """
+        Store a tile, evicting least recently used tiles beyond the budget.
+
+        Tiles larger than the whole memory budget are only written to disk.
+        """
+        self.put_many([(key, tile)])
+
+    def put_many(self, items: list[tuple[TileKey, np.ndarray]]) -> None:
+        """Store several tiles (written to the disk level in one batch)."""
+        if self._disk is not None:
+            self._disk.put_many(items)
+        for key, tile in items:
+            self._store(key, tile)
+
+    def _store(self, key: TileKey, tile: np.ndarray) -> None:
+        # Keep a read-only copy in memory
+        if tile.nbytes > self._max_bytes:
+            return
+        tile = np.array(tile, copy=True)
+        tile.setflags(write=False)
+        with self._lock:
+            previous = self._tiles.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous.nbytes
+            self._tiles[key] = tile
+            self._nbytes += tile.nbytes
+            while self._nbytes > self._max_bytes:
+                _, evicted = self._tiles.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop every tile (the counters are kept)."""
+        with self._lock:
+            self._tiles.clear()
+            self._nbytes = 0
+
+
+class TiledRenderer:
+    """Renders views from cached lattice tiles, computing only the misses."""
+
+    def __init__(
+        self,
+        cache: Optional[TileCache] = None,
+        tile_size: int = DEFAULT_TILE_SIZE,
+        workers: Optional[int] = None
+    ):
+        """
+        Initialize the renderer.
+
+        Args:
+            cache: Tile cache to read and fill (a new one if None).
+            tile_size: Pixels along each side of a tile.
+            workers: Number of worker threads for missing tiles (defaults to
+                the CPU count).
+        """
+        if tile_size <= 0:
+            raise ValueError("tile_size must be a positive integer")
+        self._cache = cache if cache is not None else TileCache()
+        self._tile_size = tile_size
+        self._workers = workers or os.cpu_count() or 1
+        self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="fractal-tile")
+
+    @property
+    def cache(self) -> TileCache:
+        """Get the tile cache."""
+        return self._cache
+
+    @property
+    def tile_size(self) -> int:
+        """Get the tile side length in pixels."""
+        return self._tile_size
+
+    def tile_keys(self, fractal: FractalSet, view: View, output: str = "counts") -> list[TileKey]:
+        """List the keys of the tiles covering a view, row by row."""
+        size = self._tile_size
+        lattice = view.lattice
+        engine = engine_key(fractal)
+        precision = view.coordinate_dtype(fractal.precision).str
+        first_row, first_col = view.first_row, view.first_column
+        return [
+            TileKey(engine, precision, output, lattice, size, row, col)
+            for row in range(first_row // size, (first_row + view.height - 1) // size + 1)
+            for col in range(first_col // size, (first_col + view.width - 1) // size + 1)
+        ]
+
+    def lookup(self, fractal: FractalSet, view: View, output: str = "counts") -> Optional[np.ndarray]:
+        """
+        Assemble a view from the cache alone.
+
+        Returns:
+            The frame if every tile is cached, otherwise None.
+        """
+        keys = self.tile_keys(fractal, view, output)
+        if not all(key in self._cache for key in keys):
+            return None
+        out = np.empty(view.shape, dtype=output_dtype(fractal, output, view))
+        for key in keys:
+            tile = self._cache.get(key)
+            if tile is None:  # Evicted meanwhile
+                return None
+            self._paste(out, view, key, tile)
+        return out
+
+    def render(
+        self,
+        fractal: FractalSet,
+        view: View,
+        output: str = "counts",
+        out: Optional[np.ndarray] = None,
+        backend: Optional[str] = None,
+        cancel: Optional[threading.Event] = None,
+        known: Optional[np.ndarray] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Render a view from cached tiles, computing and caching the misses.
+
+        Args:
+            fractal: Engine to evaluate.
+            view: Region and pixel grid to render.
+            output: compute_array output mode ("z", "counts" or "smooth").
+            out: Optional preallocated buffer of shape view.shape.
+            backend: Compute backend name (see fractalzoomer.core.backends).
+            cancel: Optional event that abandons the render when set.
+            known: Optional mask of the pixels of out already holding their
+                values (e.g. the samples of a coarse progressive pass); the
+                missing tiles reuse them instead of computing them again.
+
+        Returns:
+            The filled output buffer, or None if the render was cancelled.
+        """
+        if out is None:
+            if known is not None:
+                raise ValueError("known requires the out buffer holding the known pixels")
+            out = np.empty(view.shape, dtype=output_dtype(fractal, output, view))
+        elif out.shape != view.shape:
+            raise ValueError(f"Output buffer shape {out.shape} does not match view {view.shape}")
+        if known is not None and known.shape != view.shape:
+            raise ValueError(f"Known mask shape {known.shape} does not match view {view.shape}")
+
+        missing = []
+        for key in self.tile_keys(fractal, view, output):
+            tile = self._cache.get(key)
+            if tile is None:
+                missing.append(key)
+            else:
+                self._paste(out, view, key, tile)
+
+        dtype = view.coordinate_dtype(fractal.precision)
+
+        def compute(keys: list[TileKey]) -> None:
+            if cancel is not None and cancel.is_set():
+                return
+            size = self._tile_size
+            points = np.stack([self._tile_points(view.lattice, key, dtype) for key in keys])
+            if known is None:
+                values = fractal.compute_array(
+                    points.reshape(len(keys) * size, size), output=output, backend=backend
+                ).reshape(len(keys), size, size)
+            else:
+                # Take the samples inside the view that are already known from out
+                values = np.empty(points.shape, dtype=out.dtype)
+                reuse = np.zeros(points.shape, dtype=bool)
+                for index, key in enumerate(keys):
+                    rows, cols, tile_rows, tile_cols = self._overlap(view, key)
+                    reuse[index, tile_rows, tile_cols] = known[rows, cols]
+                    values[index, tile_rows, tile_cols] = out[rows, cols]
+                todo = ~reuse
+                values[todo] = fractal.compute_array(points[todo], output=output, backend=backend)
+            self._cache.put_many(list(zip(keys, values)))
+            for key, tile in zip(keys, values):
+                self._paste(out, view, key, tile)
+
+        tasks = [missing[i:i + TILES_PER_TASK] for i in range(0, len(missing), TILES_PER_TASK)]
+        if self._workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                compute(task)
+        else:
+            for future in [self._pool.submit(compute, task) for task in tasks]:
+                future.result()
+        if cancel is not None and cancel.is_set():
+            return None
+        return out
+
+    def _tile_points(self, lattice: Lattice, key: TileKey, dtype: np.dtype) -> np.ndarray:
+        # Complex coordinates of every sample of a tile
+        real_dtype = np.finfo(dtype).dtype
+        size = self._tile_size
+        x = lattice.x_coords(key.col * size, size, real_dtype)
+        y = lattice.y_coords(key.row * size, size, real_dtype)
+        X, Y = np.meshgrid(x, y)
+        points: np.ndarray = (X + 1j * Y).astype(dtype)
+        return points
+
+    def _overlap(self, view: View, key: TileKey) -> tuple[slice, slice, slice, slice]:
+        # Rows and columns of the part of a tile inside the view, in frame then tile coordinates
+        size = self._tile_size
+        top = key.row * size - view.first_row
+        left = key.col * size - view.first_column
+        rows = slice(max(top, 0), min(top + size, view.height))
+        cols = slice(max(left, 0), min(left + size, view.width))
+        return rows, cols, slice(rows.start - top, rows.stop - top), slice(cols.start - left, cols.stop - left)
+
+    def _paste(self, out: np.ndarray, view: View, key: TileKey, tile: np.ndarray) -> None:
+        # Copy the part of a tile inside the view into the frame
+        rows, cols, tile_rows, tile_cols = self._overlap(view, key)
+        out[rows, cols] = tile[tile_rows, tile_cols]
+
+    def close(self) -> None:
+        """Shut down the worker threads."""
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "TiledRenderer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,258 @@
+"""
+View description shared by the renderers.
+
+A View fixes the region of the complex plane and the pixel grid it is sampled
+on, independent of the GUI framework.
+
+Pixels are sampled on a global lattice rather than spaced between the view
+edges: column i of a view lies at (first_column + i + phase) * column_step,
+with the phase quantized to 1/PHASE_RESOLUTION of a pixel. Views with the same
+spacing therefore share sample values bit for bit wherever they overlap, which
+lets pans and tile caches reuse computed pixels exactly.
+"""
+
+import math
+from dataclasses import dataclass, replace
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from fractalzoomer.core.precision import complex_dtype, select_precision
+from fractalzoomer.ui.coordinates import DEFAULT_WIDTH, DEFAULT_HEIGHT
+
+# Largest fraction of a pixel two views may be misaligned by and still count as a whole-pixel shift
+PIXEL_OFFSET_TOLERANCE = 1e-3
+
+# Sub-pixel lattice phases are rounded to multiples of 1/PHASE_RESOLUTION pixel
+PHASE_RESOLUTION = 2 ** 20
+
+
+class Lattice(NamedTuple):
+    """A global sampling lattice: pixel spacing and sub-pixel phase along each axis."""
+
+    column_step: float
+    row_step: float
+    column_phase: int  # In 1/PHASE_RESOLUTION pixel
+    row_phase: int  # In 1/PHASE_RESOLUTION pixel
+
+    def x_coords(self, first: int, count: int, dtype: np.dtype = np.dtype(np.float32)) -> np.ndarray:
+        """Real part of lattice columns first, first + 1, ..., left to right."""
+        index = np.arange(count) + (first + self.column_phase / PHASE_RESOLUTION)
+        return (index * self.column_step).astype(dtype)
+
+    def y_coords(self, first: int, count: int, dtype: np.dtype = np.dtype(np.float32)) -> np.ndarray:
+        """Imaginary part of lattice rows first, first + 1, ..., top to bottom."""
+        index = np.arange(count) + (first + self.row_phase / PHASE_RESOLUTION)
+        return (-index * self.row_step).astype(dtype)
+
+
+# Split a lattice position (in pixels) into a whole index and a quantized phase
+def _lattice_origin(position: float) -> tuple[int, int]:
+    first = math.floor(position)
+    phase = round((position - first) * PHASE_RESOLUTION)
+    if phase == PHASE_RESOLUTION:
+        first, phase = first + 1, 0
+    return first, phase
+
+
+@dataclass(frozen=True)
+class View:
+    """A rectangular region of the complex plane sampled on a pixel grid."""
+
+    center_x: float
+    center_y: float
+    half_width: float
+    half_height: float
+    width: int = DEFAULT_WIDTH
+    height: int = DEFAULT_HEIGHT
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Get the (height, width) shape of the pixel grid."""
+        return self.height, self.width
+
+    @property
+    def pixel_size(self) -> float:
+        """Get the width of one pixel in complex plane units."""
+        return 2 * self.half_width / self.width
+
+    @property
+    def magnitude(self) -> float:
+        """Get the largest absolute coordinate value inside the view."""
+        return max(abs(self.center_x) + self.half_width, abs(self.center_y) + self.half_height)
+
+    @property
+    def column_step(self) -> float:
+        """Get the real-axis distance between neighbouring grid columns."""
+        return 2 * self.half_width / (self.width - 1) if self.width > 1 else 0.0
+
+    @property
+    def row_step(self) -> float:
+        """Get the imaginary-axis distance between neighbouring grid rows."""
+        return 2 * self.half_height / (self.height - 1) if self.height > 1 else 0.0
+
+    def translated(self, cols: int, rows: int) -> "View":
+        """
+        Move the view by whole grid steps.
+
+        Pixel (r, c) of the result samples the point of pixel (r + rows,
+        c + cols) of this view, so cols > 0 moves right and rows > 0 down.
+
+        Args:
+            cols: Columns to move by.
+            rows: Rows to move by.
+
+        Returns:
+            The translated view.
+        """
+        return replace(
+            self,
+            center_x=self.center_x + cols * self.column_step,
+            center_y=self.center_y - rows * self.row_step,
+        )
+
+    def pixel_offset(self, other: "View") -> Optional[tuple[int, int]]:
+        """
+        Find the whole-pixel translation taking this view to another one.
+
+        Args:
+            other: View to compare with.
+
+        Returns:
+            (cols, rows) such that other == self.translated(cols, rows), or
+            None if the views differ in size or scale or are not a whole
+            number of pixels apart.
+        """
+        if (self.width, self.height, self.half_width, self.half_height) != (
+            other.width, other.height, other.half_width, other.half_height
+        ):
+            return None
+        offset = []
+        for delta, step in (
+            (other.center_x - self.center_x, self.column_step),
+            (self.center_y - other.center_y, self.row_step),
+        ):
+            if step == 0.0:
+                offset.append(0)
+                continue
+            pixels = delta / step
+            whole = round(pixels)
+            if abs(pixels - whole) > PIXEL_OFFSET_TOLERANCE:
+                return None
+            offset.append(int(whole))
+        return offset[0], offset[1]
+
+    def coordinate_dtype(self, precision: str = "auto") -> np.dtype:
+        """
+        Resolve a precision policy to the complex dtype used to sample this view.
+
+        "auto" stays in single precision while a pixel spans enough float32
+        ulps and switches to double precision before neighbours collapse.
+
+        Args:
+            precision: "float32", "float64" or "auto".
+
+        Returns:
+            complex64 or complex128.
+        """
+        dtype: np.dtype = complex_dtype(select_precision(precision, self.pixel_size, self.magnitude))
+        return dtype
+
+    @property
+    def lattice(self) -> Lattice:
+        """Get the global sampling lattice of the view."""
+        return self._origin()[0]
+
+    @property
+    def first_column(self) -> int:
+        """Get the lattice index of the leftmost pixel column."""
+        return self._origin()[1]
+
+    @property
+    def first_row(self) -> int:
+        """Get the lattice index of the top pixel row."""
+        return self._origin()[2]
+
+    def _origin(self) -> tuple[Lattice, int, int]:
+        first_column, column_phase = (0, 0)
+        first_row, row_phase = (0, 0)
+        if self.column_step:
+            first_column, column_phase = _lattice_origin((self.center_x - self.half_width) / self.column_step)
+        if self.row_step:
+            first_row, row_phase = _lattice_origin(-(self.center_y + self.half_height) / self.row_step)
+        return Lattice(self.column_step, self.row_step, column_phase, row_phase), first_column, first_row
+
+    def x_coords(self, dtype: np.dtype = np.dtype(np.float32)) -> np.ndarray:
+        """Real part of every pixel column, left to right."""
+        if not self.column_step:
+            return np.full(self.width, self.center_x, dtype=dtype)
+        return self.lattice.x_coords(self.first_column, self.width, dtype)
+
+    def y_coords(self, dtype: np.dtype = np.dtype(np.float32)) -> np.ndarray:
+        """Imaginary part of every pixel row, top to bottom."""
+        if not self.row_step:
+            return np.full(self.height, self.center_y, dtype=dtype)
+        return self.lattice.y_coords(self.first_row, self.height, dtype)
+
+    def grid(
+        self,
+        rows: Optional[slice] = None,
+        cols: Optional[slice] = None,
+        dtype: np.dtype = np.dtype(np.complex64)
+    ) -> np.ndarray:
+        """
+        Build the complex coordinates of a block of pixels.
+
+        Args:
+            rows: Row slice of the block (all rows if None).
+            cols: Column slice of the block (all columns if None).
+            dtype: complex64 or complex128.
+
+        Returns:
+            Array of shape (len(rows), len(cols)).
+        """
+        real_dtype = np.finfo(dtype).dtype
+        x = self.x_coords(real_dtype)[cols if cols is not None else slice(None)]
+        y = self.y_coords(real_dtype)[rows if rows is not None else slice(None)]
+        X, Y = np.meshgrid(x, y)
+        grid: np.ndarray = (X + 1j * Y).astype(dtype)
+        return grid
+
+    def points(
+        self,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        dtype: np.dtype = np.dtype(np.complex64)
+    ) -> np.ndarray:
+        """
+        Build the complex coordinates of an arbitrary batch of pixels.
+
+        Args:
+            rows: Row index of every pixel.
+            cols: Column index of every pixel (same shape as rows).
+            dtype: complex64 or complex128.
+
+        Returns:
+            Array of the same shape as rows, matching grid()[rows, cols].
+        """
+        real_dtype = np.finfo(dtype).dtype
+        x = self.x_coords(real_dtype)[cols]
+        y = self.y_coords(real_dtype)[rows]
+        points: np.ndarray = (x + 1j * y).astype(dtype)
+        return points
+
+    def offsets(self) -> np.ndarray:
+        """
+        Offsets of every pixel from the view center.
+
+        Unlike grid(), the result does not depend on the magnitude of the
+        center, so it stays exact at any zoom depth (see
+        MandelbrotSet.compute_deep).
+
+        Returns:
+            complex128 array of shape (height, width).
+        """
+        dx = np.linspace(-self.half_width, self.half_width, self.width)
+        dy = np.linspace(self.half_height, -self.half_height, self.height)
+        X, Y = np.meshgrid(dx, dy)
+        return X + 1j * Y
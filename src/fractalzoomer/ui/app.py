@@ -1,6 +1,10 @@
+import copy
+import os
+import queue
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-from PIL import Image, ImageTk, ImageOps
+from tkinter import ttk, messagebox, filedialog, simpledialog
+from PIL import Image, ImageTk
 import numpy as np
 
 from fractalzoomer.core import (
@@ -12,10 +16,34 @@ from fractalzoomer.core import (
 )
 from fractalzoomer.ui.coordinates import Viewport
 from fractalzoomer.utils.exporter import FractalExporter
+from fractalzoomer.utils.palettes import DEFAULT_PALETTE, PALETTES, ColorMap
+from fractalzoomer.render.antialias import DEFAULT_AA_SAMPLES
+from fractalzoomer.render import (
+    DiskTileCache,
+    PosterRenderer,
+    ProgressiveRenderer,
+    RenderScheduler,
+    ResumableRenderer,
+    TileCache,
+    TiledRenderer,
+    View,
+    antialias,
+    engine_key,
+    iteration_histogram,
+    lattice_preview,
+    render_translated,
+    reproject_frame,
+    reprojection_priority,
+    resumable_key,
+)
 
 # Constants
 W, H = 600, 400
 MAX_ITER = 128
+FRAME_POLL_MS = 15  # How often the Tk loop checks for a finished frame
+CYCLE_MS = 40  # Interval between palette cycling frames (25 frames per second)
+CYCLE_STEP = 0.005  # Palette offset advanced every cycling frame (a full cycle in 8 seconds)
+TILE_CACHE_ENV_VAR = "FRACTALZOOMER_TILE_CACHE"  # Directory of the persistent tile cache (optional)
 
 # Julia presets: name -> (c_real, c_imag)
 JULIA_PRESETS = {
@@ -60,21 +88,39 @@ class FractalZoomerUI:
         )
         self.burning_ship = BurningShipSet(max_iter=self.max_iter)
         self.viewport = Viewport(W, H)
+        self.renderer = ProgressiveRenderer()
+        # Final frames, cached across fractal types and presets (and across runs if configured)
+        cache_dir = os.environ.get(TILE_CACHE_ENV_VAR)
+        self.tiles = TiledRenderer(TileCache(disk=DiskTileCache(cache_dir) if cache_dir else None))
+        self.resumable = ResumableRenderer()
+        self.scheduler = RenderScheduler(self.frame_ready)
+        self.back_buffer = None  # Newest shaded frame from the render thread, not yet shown
+        self.back_buffer_lock = threading.Lock()
+        self.base_frame = None  # (engine key, view, smooth counts) of the last full frame, render thread only
+        # (resumable key, view, max_iter, escape state or None) of the last full frame, render thread only
+        self.iteration_state = None
         self.exporter = FractalExporter()
+        self.colormap = ColorMap(DEFAULT_PALETTE)  # Shared with the exporter's palettes
+        self.colour_version = 0  # Bumped whenever the colour map changes, so stale frames get recoloured
+        self.raw_frame = None  # (smooth counts, max_iter) of the frame on screen, for recolouring
+        self.recolour_buffer = None  # RGB buffer reused by recolour()
+        self.cycle_job = None  # Pending after() call of the palette cycling animation
+        self.photo = None
         self.current_img_array = None  # Store current fractal data for export
+        # ("progress", percent) and ("done", error or None) messages of the poster export
+        # thread, polled on the Tk thread (Tk must not be called from other threads)
+        self.poster_events = queue.Queue()
 
         # Panning state
         self.is_panning = False
         self.pan_start_x = 0
         self.pan_start_y = 0
-        self.pan_start_center_x = 0
-        self.pan_start_center_y = 0
-        self.pan_start_half_width = 0
-        self.pan_start_half_height = 0
+        self.pan_start_view = None
 
         # Setup UI
         self.setup_ui()
         self.render_fractal()
+        self.root.after(FRAME_POLL_MS, self.present_frame)
 
     def setup_ui(self):
         # Canvas for fractal display
@@ -84,6 +130,11 @@ class FractalZoomerUI:
         self.canvas.bind("<Button-2>", self.zoom_out)
         self.canvas.bind("<Option-Button-1>", self.zoom_out)
 
+        # Mouse wheel zoom (Windows/macOS send <MouseWheel>, X11 sends buttons 4 and 5)
+        self.canvas.bind("<MouseWheel>", self.wheel_zoom)
+        self.canvas.bind("<Button-4>", self.wheel_zoom)
+        self.canvas.bind("<Button-5>", self.wheel_zoom)
+
         # Canvas Panning
         # Existing middle mouse pan (keep these)
         self.canvas.bind("<Control-Button-1>", self.start_pan)
@@ -105,6 +156,54 @@ class FractalZoomerUI:
         self.iter_slider.set(self.max_iter)
         self.iter_slider.grid(row=0, column=1, padx=5)
 
+        # Keep iterating the bounded pixels until the image stops changing
+        self.deepen_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            control_frame, text="Auto-deepen", variable=self.deepen_var, command=self.render_fractal
+        ).grid(row=0, column=2, padx=5)
+        # Supersample the pixels along edges once a view is final
+        self.antialias_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            control_frame, text="Anti-alias", variable=self.antialias_var, command=self.render_fractal
+        ).grid(row=0, column=3, padx=5)
+
+        # Palette selection
+        tk.Label(control_frame, text="Palette:").grid(row=2, column=0, padx=5, sticky='e')
+        self.palette_var = tk.StringVar(value=DEFAULT_PALETTE)
+        self.palette_dropdown = ttk.Combobox(
+            control_frame,
+            textvariable=self.palette_var,
+            values=list(PALETTES),
+            state="readonly",
+            width=15
+        )
+        self.palette_dropdown.grid(row=2, column=1, padx=5, sticky='w')
+        self.palette_dropdown.bind("<<ComboboxSelected>>", self.on_palette_selected)
+        # Animate the colours by advancing the palette offset
+        self.cycle_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            control_frame, text="Cycle colours", variable=self.cycle_var, command=self.toggle_cycling
+        ).grid(row=2, column=2, padx=5)
+        # Spread the palette evenly over the pixels instead of over the iteration counts
+        self.equalize_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            control_frame, text="Equalize", variable=self.equalize_var, command=self.on_equalize_toggled
+        ).grid(row=2, column=3, padx=5)
+
+        # Palette offset and density (recolour the frame on screen, no recomputation)
+        tk.Label(control_frame, text="Colour offset:").grid(row=3, column=0, padx=5, sticky='e')
+        self.offset_var = tk.DoubleVar(value=self.colormap.offset)
+        tk.Scale(
+            control_frame, from_=0.0, to=1.0, resolution=0.001, orient=tk.HORIZONTAL,
+            length=300, variable=self.offset_var, showvalue=False, command=self.on_colour_change
+        ).grid(row=3, column=1, padx=5)
+        tk.Label(control_frame, text="Colour density:").grid(row=4, column=0, padx=5, sticky='e')
+        self.density_var = tk.DoubleVar(value=self.colormap.density)
+        tk.Scale(
+            control_frame, from_=0.25, to=8.0, resolution=0.25, orient=tk.HORIZONTAL,
+            length=300, variable=self.density_var, command=self.on_colour_change
+        ).grid(row=4, column=1, padx=5)
+
         # Fractal type selection
         tk.Label(control_frame, text="Fractal Type:").grid(row=1, column=0, padx=5, sticky='e')
         self.fractal_var = tk.StringVar(value="mandelbrot")
@@ -219,6 +318,17 @@ class FractalZoomerUI:
         )
         self.save_button.pack(side=tk.LEFT, padx=5)
 
+        # Poster export button (renders the view at any size, streamed to disk)
+        self.poster_button = tk.Button(
+            button_frame,
+            text="🖼 Export Poster",
+            command=self.export_poster,
+            font=('Arial', 10),
+            padx=15,
+            pady=5
+        )
+        self.poster_button.pack(side=tk.LEFT, padx=5)
+
         # Reset View button
         self.reset_button = tk.Button(
             button_frame,
@@ -233,7 +343,7 @@ class FractalZoomerUI:
         # Instructions
         instructions = tk.Label(
             self.root,
-            text="Left-click: zoom in • Right-click: zoom out • Middle-click or Ctrl+drag: pan",
+            text="Left-click: zoom in • Right-click: zoom out • Wheel: zoom • Middle-click or Ctrl+drag: pan",
             font=('Arial', 10, 'italic'), fg='gray'
         )
         instructions.pack(pady=5)
@@ -265,6 +375,61 @@ class FractalZoomerUI:
             if self.fractal_type == "julia":
                 self.render_fractal()
 
+    def on_palette_selected(self, event=None):
+        # Recolour the frame on screen with the selected palette.
+        self.colormap.configure(palette=self.palette_var.get())
+        self.colours_changed()
+
+    def on_equalize_toggled(self):
+        # Recolour the frame on screen, histogram-equalized or not.
+        self.colormap.configure(equalize=self.equalize_var.get())
+        self.colours_changed()
+
+    def on_colour_change(self, value=None):
+        # Recolour the frame on screen with the offset and density of the sliders.
+        self.colormap.configure(offset=self.offset_var.get(), density=self.density_var.get())
+        self.colours_changed()
+
+    def colours_changed(self):
+        # Show the new colours at once from the raw counts of the frame on screen; frames shaded by
+        # the render thread with the old colours are recoloured when they arrive.
+        self.colour_version += 1
+        self.recolour()
+        if self.antialias_var.get() and self.cycle_job is None:
+            # The raw counts are not anti-aliased: smooth the edges again (the frame comes from the cache)
+            self.render_fractal()
+
+    def toggle_cycling(self):
+        # Start or stop the palette cycling animation.
+        if self.cycle_var.get():
+            if self.cycle_job is None:
+                self.cycle_job = self.root.after(CYCLE_MS, self.cycle_colours)
+            return
+        if self.cycle_job is not None:
+            self.root.after_cancel(self.cycle_job)
+            self.cycle_job = None
+        self.colours_changed()
+
+    def cycle_colours(self):
+        # Advance the palette offset by one step and recolour (runs on the Tk thread via after()).
+        offset = (self.colormap.offset + CYCLE_STEP) % 1.0
+        self.colormap.configure(offset=offset)
+        self.offset_var.set(offset)
+        self.colour_version += 1
+        self.recolour()
+        self.cycle_job = self.root.after(CYCLE_MS, self.cycle_colours)
+
+    def recolour(self):
+        # Re-apply the colour map to the raw counts of the frame on screen: one palette lookup,
+        # without calling the engine.
+        if self.raw_frame is None:
+            return
+        smooth, max_iter = self.raw_frame
+        if self.recolour_buffer is None or self.recolour_buffer.shape[:2] != smooth.shape:
+            self.recolour_buffer = np.empty(smooth.shape + (3,), dtype=np.uint8)
+        img_array = self.colormap.apply(smooth, max_iter, out=self.recolour_buffer)
+        self.show_image(img_array, Image.fromarray(img_array, mode='RGB'))
+
     def on_julia_param_change(self, value=None):
         # Handle slider changes for Julia parameters.
         new_c_real = self.c_real_var.get()
@@ -333,62 +498,188 @@ class FractalZoomerUI:
             text=f"c = {self.julia_c_real:.4f} {sign} {abs(self.julia_c_imag):.4f}i"
         )
 
-    def render_fractal(self):
-        # Render the current fractal to the canvas.
-        # Calculate bounds
-        x_min = self.center_x - self.half_width
-        x_max = self.center_x + self.half_width
-        y_min = self.center_y - self.half_height
-        y_max = self.center_y + self.half_height
-
-        # Create coordinate arrays
-        x_coords = np.linspace(x_min, x_max, W, dtype=np.float32)
-        y_coords = np.linspace(y_max, y_min, H, dtype=np.float32)
-
-        # Create meshgrid - vectorized coordinate creation
-        X, Y = np.meshgrid(x_coords, y_coords)
-        C = X + 1j * Y
-        C = C.astype(np.complex64)
-
-        # Select fractal and compute ALL points at once
+    def current_fractal(self):
+        # Return the engine for the selected fractal type.
         if self.fractal_type == "mandelbrot":
-            Z_final = self.mandelbrot.compute_array(C)
-        elif self.fractal_type == "julia":
-            Z_final = self.julia.compute_array(C)
-        else:
-            Z_final = self.burning_ship.compute_array(C)
+            return self.mandelbrot
+        if self.fractal_type == "julia":
+            return self.julia
+        return self.burning_ship
 
-        # Convert to image - vectorized operations
-        magnitude = np.abs(Z_final)
-        img_array = np.clip(magnitude * 50, 0, 255).astype(np.uint8)
-        self.current_img_array = img_array  # Store for potential export
+    def render_fractal(self):
+        # Request a render of the current view on the background render thread.
+        view = View(self.center_x, self.center_y, self.half_width, self.half_height, W, H)
 
-        # Create and display image
-        img = Image.fromarray(img_array, mode='L')
-        img = ImageOps.colorize(img, black="black", mid = "purple", white="yellow")
-        img = ImageOps.autocontrast(img, cutoff=1)
-        self.photo = ImageTk.PhotoImage(img)
-        self.canvas.delete("all")
-        self.canvas.create_image(0, 0, anchor=tk.NW, image=self.photo)
+        # Snapshot the engine so later parameter changes cannot race the render thread.
+        # Submitting supersedes (and cancels) any render still in flight.
+        fractal = copy.deepcopy(self.current_fractal())
+        deepen = self.deepen_var.get()
+        smooth_edges = self.antialias_var.get()
+        self.scheduler.submit(lambda cancel: self.render_job(fractal, view, cancel, deepen, smooth_edges))
 
         # Update info label
         zoom_level = 3.5 / (2 * self.half_width)
+        precision = np.finfo(view.coordinate_dtype(fractal.precision)).dtype
         self.info_label.config(
             text=f"Center: ({self.center_x:.6f}, {self.center_y:.6f}) | "
-                 f"Zoom: {zoom_level:.2f}x | Iterations: {self.max_iter}"
+                 f"Zoom: {zoom_level:.2f}x | Iterations: {fractal.max_iter} | Precision: {precision}"
         )
 
+    def render_job(self, fractal, view, cancel, deepen=False, smooth_edges=False):
+        # Runs on the render thread: yields shaded frames of the view, coarse to fine, then
+        # (if deepen) with more and more iterations, then (if smooth_edges) anti-aliased.
+        final = yield from self.iterate_job(fractal, view, cancel, deepen)
+        if final is None or not smooth_edges:
+            return
+        fractal, frame = final
+        version = self.colour_version
+        shade = self.colormap
+        if shade.equalize:
+            # Sub-samples are coloured with the histogram of the whole frame, not of their batch
+            shade = shade.equalized(iteration_histogram(frame, fractal.max_iter))
+        result = antialias(fractal, view, frame, shade, cancel=cancel)
+        if result is not None:
+            yield self.frame_image(result[0], frame, fractal.max_iter, version)
+
+    def iterate_job(self, fractal, view, cancel, deepen):
+        # Yields the frames of render_job before anti-aliasing, and returns the engine and smooth
+        # counts of the last one (None if cancelled).
+        state_key = resumable_key(fractal)
+        known = self.iteration_state
+        state = None
+        if known is not None and known[:2] == (state_key, view) and (known[3] is not None or known[2] != fractal.max_iter):
+            # Only the iteration limit changed: raising it continues the bounded pixels of the
+            # stored escape state, lowering it reads the stored counts without iterating
+            state = known[3]
+            if state is None:
+                state = self.resumable.render(fractal, view, cancel=cancel)
+            else:
+                state = self.resumable.resume(fractal, state, cancel=cancel)
+            if state is None:
+                return None
+            self.iteration_state = (state_key, view, fractal.max_iter, state)
+            frame = fractal.from_state(state, output="smooth")
+            self.base_frame = (engine_key(fractal), view, frame)
+            yield self.shade_frame(frame, fractal.max_iter)
+        else:
+            rendered = yield from self.render_frames(fractal, view, cancel)
+            if rendered is None:
+                return None
+            frame, state = rendered
+            self.iteration_state = (state_key, view, fractal.max_iter, state)
+
+        if not deepen:
+            return fractal, frame
+        if state is None:
+            state = self.resumable.render(fractal, view, cancel=cancel)
+            if state is None:
+                return None
+        for state in self.resumable.deepen(fractal, state, cancel=cancel):
+            self.iteration_state = (state_key, view, fractal.max_iter, state)
+            frame = fractal.from_state(state, output="smooth", max_iter=state.iterations)
+            yield self.shade_frame(frame, state.iterations)
+        if cancel.is_set():
+            return None
+        deepened = copy.deepcopy(fractal)
+        deepened.set_parameters(max_iter=state.iterations)
+        return deepened, fractal.from_state(state, output="smooth", max_iter=state.iterations)
+
+    def render_frames(self, fractal, view, cancel):
+        # Yields shaded frames of the view, coarse to fine, and returns the final smooth counts
+        # with the escape state they were computed from, if any (None if cancelled).
+        key = engine_key(fractal)
+        if self.base_frame is not None and self.base_frame[0] == key:
+            # A whole-pixel pan of the last frame only needs the exposed strips
+            frame = render_translated(fractal, self.base_frame[1], self.base_frame[2], view, output="smooth")
+            if frame is not None:
+                self.base_frame = (key, view, frame)
+                yield self.shade_frame(frame, fractal.max_iter)
+                return frame, None
+            # A zoom of the last frame is shown resampled at once, then refined, edges first
+            base_view, base_smooth = self.base_frame[1], self.base_frame[2]
+            preview, src_rows, src_cols = reproject_frame(base_view, base_smooth, view)
+            priority = reprojection_priority(base_smooth, src_rows, src_cols)
+            if not priority.all():
+                yield self.shade_frame(preview, fractal.max_iter)
+                for smooth in self.renderer.refine(fractal, view, preview, priority, output="smooth", cancel=cancel):
+                    yield self.shade_frame(smooth, fractal.max_iter)
+                if cancel.is_set():
+                    return None
+                self.base_frame = (key, view, smooth)
+                return smooth, None
+        # Views seen before come straight from the tile cache. Others are rendered to an escape
+        # state, coarse to fine, kept so that changing the iteration limit resumes it; the tiled
+        # renderer then caches the frame, only computing the parts of edge tiles outside the view.
+        state = None
+        frame = self.tiles.lookup(fractal, view, output="smooth")
+        if frame is None:
+            for step, state in self.resumable.passes(fractal, view, self.renderer.steps, cancel=cancel):
+                if step > 1:
+                    preview = lattice_preview(fractal.from_state(state, output="smooth"), step)
+                    yield self.shade_frame(preview, fractal.max_iter)
+            if state is None or cancel.is_set():
+                return None
+            frame = fractal.from_state(state, output="smooth")
+            known = np.ones(view.shape, dtype=bool)
+            if self.tiles.render(fractal, view, output="smooth", out=frame.copy(), cancel=cancel, known=known) is None:
+                return None
+        self.base_frame = (key, view, frame)
+        yield self.shade_frame(frame, fractal.max_iter)
+        return frame, state
+
+    def frame_ready(self, generation, frame):
+        # Called on the render thread with every shaded coarse-to-fine pass.
+        if generation != self.scheduler.generation:
+            return  # Superseded while being shaded
+        with self.back_buffer_lock:
+            self.back_buffer = frame
+
+    def present_frame(self):
+        # Swap the newest finished frame onto the canvas (runs on the Tk thread via after()).
+        with self.back_buffer_lock:
+            frame, self.back_buffer = self.back_buffer, None
+        if frame is not None:
+            smooth, max_iter, version, img_array, img = frame
+            self.raw_frame = (smooth, max_iter)
+            if version != self.colour_version:
+                self.recolour()  # Shaded before the colours last changed
+            else:
+                self.show_image(img_array, img)
+        self.root.after(FRAME_POLL_MS, self.present_frame)
+
+    def show_image(self, img_array, img):
+        # Put an image on the canvas, updating the shown photo in place when the size is unchanged.
+        self.current_img_array = img_array  # Store for potential export
+        if self.photo is not None and (self.photo.width(), self.photo.height()) == img.size:
+            self.photo.paste(img)
+            return
+        self.photo = ImageTk.PhotoImage(img)
+        self.canvas.delete("all")
+        self.canvas.create_image(0, 0, anchor=tk.NW, image=self.photo)
+
+    def shade_frame(self, smooth, max_iter):
+        # Convert smooth iteration counts to a displayable frame through the palette.
+        version = self.colour_version
+        return self.frame_image(self.colormap.apply(smooth, max_iter), smooth, max_iter, version)
+
+    @staticmethod
+    def frame_image(img_array, smooth, max_iter, version):
+        # Bundle an RGB array and its image with the raw counts it was coloured from (kept for
+        # recolouring) and the colour version it was coloured with.
+        return smooth, max_iter, version, img_array, Image.fromarray(img_array, mode='RGB')
+
     def zoom_in(self, event):
         # Zoom in centered on click position.
         click_complex = self.viewport.to_complex_plane(
             event.x, event.y,
             self.center_x, self.center_y,
-            self.half_width, self.half_height
+            self.half_width, self.half_height,
+            dtype=np.complex128
         )
 
         zoom_factor = 0.9
-        self.center_x = click_complex.real
-        self.center_y = click_complex.imag
+        self.center_x = float(click_complex.real)
+        self.center_y = float(click_complex.imag)
         self.half_width *= zoom_factor
         self.half_height *= zoom_factor
 
@@ -399,12 +690,31 @@ class FractalZoomerUI:
         click_complex = self.viewport.to_complex_plane(
             event.x, event.y,
             self.center_x, self.center_y,
-            self.half_width, self.half_height
+            self.half_width, self.half_height,
+            dtype=np.complex128
         )
 
         zoom_factor = 1.0 / 0.9
-        self.center_x = click_complex.real
-        self.center_y = click_complex.imag
+        self.center_x = float(click_complex.real)
+        self.center_y = float(click_complex.imag)
+        self.half_width *= zoom_factor
+        self.half_height *= zoom_factor
+
+        self.render_fractal()
+
+    def wheel_zoom(self, event):
+        # Zoom one wheel notch, keeping the point under the cursor fixed.
+        zoom_in = getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0
+        zoom_factor = 0.9 if zoom_in else 1.0 / 0.9
+        cursor = self.viewport.to_complex_plane(
+            event.x, event.y,
+            self.center_x, self.center_y,
+            self.half_width, self.half_height,
+            dtype=np.complex128
+        )
+
+        self.center_x = float(cursor.real + (self.center_x - cursor.real) * zoom_factor)
+        self.center_y = float(cursor.imag + (self.center_y - cursor.imag) * zoom_factor)
         self.half_width *= zoom_factor
         self.half_height *= zoom_factor
 
@@ -415,31 +725,26 @@ class FractalZoomerUI:
         self.is_panning = True
         self.pan_start_x = event.x
         self.pan_start_y = event.y
-        self.pan_start_center_x = self.center_x
-        self.pan_start_center_y = self.center_y
-        self.pan_start_half_width = self.half_width
-        self.pan_start_half_height = self.half_height
+        self.pan_start_view = View(self.center_x, self.center_y, self.half_width, self.half_height, W, H)
+        self.viewport.start_drag()
 
     def pan_move(self, event):
         # Update view during panning.
         if not self.is_panning:
             return
 
-        # Calculate pixel displacement
-        dx_pixels = event.x - self.pan_start_x
-        dy_pixels = event.y - self.pan_start_y
-
-        # Convert pixel displacement to complex plane displacement
-        dx_complex = -dx_pixels * (2 * self.pan_start_half_width) / W
-        dy_complex = dy_pixels * (2 * self.pan_start_half_height) / H
-
-        # Update center
-        self.center_x = self.pan_start_center_x + dx_complex
-        self.center_y = self.pan_start_center_y + dy_complex
+        # Move by whole pixels so the previous frame can be shifted instead of recomputed;
+        # the viewport keeps the sub-pixel remainder of the drag
+        dx_pixels, dy_pixels = self.viewport.drag_to(event.x - self.pan_start_x, event.y - self.pan_start_y)
+        view = self.pan_start_view.translated(-dx_pixels, -dy_pixels)
+        if (view.center_x, view.center_y) == (self.center_x, self.center_y):
+            return
 
-        # Keep zoom level locked
-        self.half_width = self.pan_start_half_width
-        self.half_height = self.pan_start_half_height
+        # Update center, keeping the zoom level locked
+        self.center_x = view.center_x
+        self.center_y = view.center_y
+        self.half_width = self.pan_start_view.half_width
+        self.half_height = self.pan_start_view.half_height
 
         self.render_fractal()
 
@@ -448,15 +753,14 @@ class FractalZoomerUI:
         self.is_panning = False
 
     def update_iterations(self, value):
-        # Update max iterations for all fractals.
-        self.max_iter = int(value)
-        self.mandelbrot = MandelbrotSet(max_iter=self.max_iter)
-        self.julia = JuliaSet(
-            c_real=self.julia_c_real,
-            c_imag=self.julia_c_imag,
-            max_iter=self.max_iter
-        )
-        self.burning_ship = BurningShipSet(max_iter=self.max_iter)
+        # Update max iterations for all fractals, keeping their other settings (the render thread
+        # resumes the current view from its stored escape state instead of starting over).
+        max_iter = int(value)
+        if max_iter == self.max_iter:
+            return
+        self.max_iter = max_iter
+        for fractal in (self.mandelbrot, self.julia, self.burning_ship):
+            fractal.set_parameters(max_iter=self.max_iter)
         self.render_fractal()
 
     def change_fractal(self):
@@ -507,23 +811,11 @@ class FractalZoomerUI:
 
         if filepath:
             try:
-                # Prepare metadata
-                metadata = {
-                    'fractal_type': self.fractal_type,
-                    'center_x': str(self.center_x),
-                    'center_y': str(self.center_y),
-                    'zoom': str(3.5 / (2 * self.half_width)),
-                    'max_iterations': str(self.max_iter)
-                }
-                if self.fractal_type == "julia":
-                    metadata['julia_c_real'] = str(self.julia_c_real)
-                    metadata['julia_c_imag'] = str(self.julia_c_imag)
-
                 # Export using FractalExporter
                 self.exporter.export_fractal(
                     self.current_img_array,
                     filepath,
-                    metadata=metadata
+                    metadata=self.image_metadata()
                 )
 
                 messagebox.showinfo("Success", f"Image saved to:\n{filepath}")
@@ -531,6 +823,96 @@ class FractalZoomerUI:
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save image:\n{str(e)}")
 
+    def image_metadata(self):
+        # Metadata describing the current view, stored in exported images.
+        metadata = {
+            'fractal_type': self.fractal_type,
+            'center_x': str(self.center_x),
+            'center_y': str(self.center_y),
+            'zoom': str(3.5 / (2 * self.half_width)),
+            'aspect': str(self.half_height / self.half_width),
+            'max_iterations': str(self.max_iter)
+        }
+        if self.fractal_type == "julia":
+            metadata['julia_c_real'] = str(self.julia_c_real)
+            metadata['julia_c_imag'] = str(self.julia_c_imag)
+        metadata['palette'] = self.colormap.palette.name
+        if self.colormap.equalize:
+            metadata['equalize'] = 'true'
+        return metadata
+
+    def export_poster(self):
+        # Render the current view at a large size, tile by tile, straight into a TIFF or PNG file.
+        width = simpledialog.askinteger(
+            "Poster size", "Width in pixels:", parent=self.root, initialvalue=W * 10, minvalue=1
+        )
+        if width is None:
+            return
+        height = simpledialog.askinteger(
+            "Poster size", "Height in pixels:", parent=self.root,
+            initialvalue=max(1, round(width * self.half_height / self.half_width)), minvalue=1
+        )
+        if height is None:
+            return
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".tif",
+            filetypes=[("Tiled TIFF", "*.tif;*.tiff"), ("PNG Image", "*.png")],
+            initialfile=f"{self.fractal_type}_poster.tif",
+            title="Save Fractal Poster"
+        )
+        if not filepath:
+            return
+
+        # Same region as the screen, sampled at the poster's resolution
+        view = View(self.center_x, self.center_y, self.half_width, self.half_height, width, height)
+        fractal = copy.deepcopy(self.current_fractal())
+        metadata = self.image_metadata()
+        samples = DEFAULT_AA_SAMPLES if self.antialias_var.get() else 1
+        colormap = self.colormap
+        shade = self.exporter.shader(
+            colormap.palette.name, colormap.offset, colormap.density, colormap.interior, colormap.equalize
+        )
+        equalize = shade.equalized if colormap.equalize else None
+        channels = shade.channels
+        self.poster_button.config(state=tk.DISABLED)
+
+        def report(done, total):
+            self.poster_events.put(("progress", 100 * done // total))
+
+        def run():
+            error = None
+            try:
+                with PosterRenderer() as renderer, self.exporter.open_poster(
+                    filepath, width, height, channels, renderer.tile_size, metadata=metadata
+                ) as writer:
+                    renderer.render(
+                        fractal, view, writer, shade, progress=report, antialias=samples, equalize=equalize
+                    )
+            except Exception as e:
+                error = str(e)
+            self.poster_events.put(("done", error))
+
+        threading.Thread(target=run, name="fractal-poster-export", daemon=True).start()
+        self.root.after(FRAME_POLL_MS, lambda: self.poll_poster(filepath))
+
+    def poll_poster(self, filepath):
+        # Show the progress and outcome of the poster export (runs on the Tk thread via after()).
+        while True:
+            try:
+                kind, value = self.poster_events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                self.poster_button.config(text=f"🖼 Poster {value}%")
+                continue
+            self.poster_button.config(text="🖼 Export Poster", state=tk.NORMAL)
+            if value is None:
+                messagebox.showinfo("Success", f"Poster saved to:\n{filepath}")
+            else:
+                messagebox.showerror("Error", f"Failed to save poster:\n{value}")
+            return
+        self.root.after(FRAME_POLL_MS, lambda: self.poll_poster(filepath))
+
     def reset_view(self):
         # Reset view to default parameters.
         self.change_fractal()
@@ -539,8 +921,12 @@ class FractalZoomerUI:
 def main():
     # Main entry point for the application.
     root = tk.Tk()
-    app = FractalZoomerUI(root)  # noqa: F841
+    app = FractalZoomerUI(root)
     root.mainloop()
+    app.scheduler.close()
+    app.renderer.close()
+    app.resumable.close()
+    app.tiles.close()
 
 
 if __name__ == "__main__":
@@ -100,6 +100,7 @@ class Viewport:
         self._height = height
         self._size = np.array([width, height], dtype=float)
         self.viewport_center = self._size / 2
+        self._drag_drift = np.zeros(2)
 
     @property
     def width(self) -> int:
@@ -111,6 +112,35 @@ class Viewport:
         """Get viewport height."""
         return self._height
 
+    @property
+    def drag_drift(self) -> np.ndarray:
+        """Get the sub-pixel part [dx, dy] of the current drag not applied to the image."""
+        return self._drag_drift.copy()
+
+    def start_drag(self) -> None:
+        """Start tracking a drag at zero displacement."""
+        self._drag_drift = np.zeros(2)
+
+    def drag_to(self, dx: float, dy: float) -> tuple[int, int]:
+        """
+        Split the total displacement of the current drag into whole pixels and drift.
+
+        The image is only ever moved by whole pixels, so previously computed
+        samples stay aligned with the grid; the fractional remainder is kept
+        as drift and taken up by later motion instead of being lost.
+
+        Args:
+            dx: Horizontal displacement since start_drag (screen pixels).
+            dy: Vertical displacement since start_drag (screen pixels).
+
+        Returns:
+            Tuple of (columns, rows) the image has moved by.
+        """
+        total = np.array([dx, dy], dtype=float)
+        shift = np.round(total)
+        self._drag_drift = total - shift
+        return int(shift[0]), int(shift[1])
+
     def to_complex_plane(
         self,
         x: float,
@@ -118,8 +148,9 @@ class Viewport:
         center_x: float,
         center_y: float,
         half_width: float,
-        half_height: float
-    ) -> np.complex64:
+        half_height: float,
+        dtype: type[np.complexfloating] = np.complex64
+    ) -> np.complexfloating:
         """
         Convert screen coordinates to a complex number.
         
@@ -130,6 +161,7 @@ class Viewport:
             center_y: Viewport center imaginary part.
             half_width: Half-width in complex units.
             half_height: Half-height in complex units.
+            dtype: np.complex64, or np.complex128 to keep zoomed-in centers exact.
             
         Returns:
             Complex number representing the point in the complex plane.
@@ -138,7 +170,7 @@ class Viewport:
             x, y, center_x, center_y, half_width, half_height,
             self._width, self._height
         )
-        return np.complex64(real + 1j * imag)
+        return dtype(real + 1j * imag)
 
     def to_viewport_plane(
         self,
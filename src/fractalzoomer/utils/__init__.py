@@ -1,3 +1,26 @@
 # Utility model for fractalzoomer. Implement exporting application
 from fractalzoomer.utils.exporter import FractalExporter
-__all__ = ["FractalExporter"]
+from fractalzoomer.utils.palettes import PALETTES, ColorMap, Palette, get_palette
+from fractalzoomer.utils.writers import (
+    AnimationWriter,
+    ApngWriter,
+    GifWriter,
+    NumberedFrameWriter,
+    PosterWriter,
+    StripPngWriter,
+    TiledTiffWriter,
+)
+__all__ = [
+    "FractalExporter",
+    "PALETTES",
+    "ColorMap",
+    "Palette",
+    "get_palette",
+    "AnimationWriter",
+    "ApngWriter",
+    "GifWriter",
+    "NumberedFrameWriter",
+    "PosterWriter",
+    "StripPngWriter",
+    "TiledTiffWriter",
+]
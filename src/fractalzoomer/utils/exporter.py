@@ -3,6 +3,26 @@ from pathlib import Path
 import numpy as np
 from PIL import Image, PngImagePlugin
 
+from fractalzoomer.core import FractalSet
+from fractalzoomer.render import ParallelRenderer, View, antialias
+from fractalzoomer.render.antialias import DEFAULT_AA_SAMPLES
+from fractalzoomer.render.histogram import iteration_histogram
+from fractalzoomer.utils.palettes import DEFAULT_INTERIOR, PALETTES, Color, ColorMap, get_palette, is_gray
+from fractalzoomer.utils.writers import (
+    DEFAULT_FRAME_DURATION,
+    AnimationWriter,
+    ApngWriter,
+    DEFAULT_TIFF_TILE_SIZE,
+    GifWriter,
+    NumberedFrameWriter,
+    PosterWriter,
+    StripPngWriter,
+    TiledTiffWriter,
+)
+
+# Gray-level map of the default grayscale output, shared so that it matches the explorer's grayscale palette
+GRAYSCALE = ColorMap('grayscale', channels=1)
+
 
 class FractalExporter:
     # Exporter class for fractal images. It handles conversion from numpy arrays to images
@@ -18,13 +38,45 @@ class FractalExporter:
         # Return the list of supported image formats, which aims to be extensible in the future.
         return self.SUPPORTED_FORMATS.copy()
 
+    @staticmethod
+    def shade(smooth: np.ndarray, max_iter: int) -> np.ndarray:
+        # Convert smooth iteration counts to grayscale levels through the grayscale palette's lookup table:
+        # log-scaled smooth iteration count, interior points black.
+        levels: np.ndarray = GRAYSCALE.apply(smooth, max_iter)
+        return levels
+
+    def get_colormaps(self) -> List[str]:
+        # Return the names of the colormaps (palettes) array_to_image and shader accept.
+        return list(PALETTES)
+
+    @staticmethod
+    def shader(
+        colormap: str = 'grayscale',
+        offset: float = 0.0,
+        density: float = 1.0,
+        interior: Color = DEFAULT_INTERIOR,
+        equalize: bool = False
+    ) -> ColorMap:
+        # Return the ColorMap turning smooth counts into pixels for a colormap through the palette's lookup
+        # table (histogram-equalized if equalize): single-channel gray levels for gray palettes with a gray
+        # interior, as shade produces, RGB otherwise. Its channels tell writers which of the two it is.
+        channels = 1 if is_gray(get_palette(colormap).colors) and is_gray(interior) else 3
+        return ColorMap(colormap, offset, density, interior, equalize, channels=channels)
+
     def array_to_image(self, data: np.ndarray, colormap: str = "grayscale") -> Image.Image:
         # Convert a 2D numpy array to a PIL Image using the specified colormap.
+        # Arrays with a trailing RGB axis are already coloured and converted as they are.
+        if data.dtype != np.uint8:
+            data = np.clip(data, 0, 255).astype(np.uint8)
+        if data.ndim == 3:
+            return Image.fromarray(data, mode='RGB')
         if colormap == "grayscale":
-            # Ensure data is uint8 for grayscale
-            if data.dtype != np.uint8:
-                data = np.clip(data, 0, 255).astype(np.uint8)
             img = Image.fromarray(data, mode='L')
+        elif colormap in PALETTES:
+            # Grayscale levels 0-255 looked up in the palette
+            colors = get_palette(colormap).colors
+            levels = np.linspace(0, len(colors) - 1, 256).round().astype(np.intp)
+            img = Image.fromarray(np.take(colors[levels], data, axis=0), mode='RGB')
         else:
             raise ValueError(f"Unsupported colormap: {colormap}")
         return img
@@ -74,4 +126,67 @@ class FractalExporter:
     ) -> None:
         # Main method to export a fractal image from a numpy array to a file.
         image = self.array_to_image(data, colormap)
-        self.save(image, filepath, format, metadata)
\ No newline at end of file
+        self.save(image, filepath, format, metadata)
+
+    def export_view(
+        self,
+        fractal: FractalSet,
+        view: View,
+        filepath: str,
+        antialias_samples: int = DEFAULT_AA_SAMPLES,
+        format: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        backend: Optional[str] = None,
+        workers: Optional[int] = None,
+        colormap: str = 'grayscale',
+        equalize: bool = False
+    ) -> None:
+        # Render a view and export it, anti-aliased: the view is rendered once, then only the pixels
+        # along edges are supersampled with antialias_samples x antialias_samples jittered sub-samples
+        # (1 turns anti-aliasing off). Pixels are coloured with the colormap (see shader).
+        with ParallelRenderer(workers=workers) as renderer:
+            smooth = renderer.render(fractal, view, output="smooth", backend=backend)
+        colors = self.shader(colormap, equalize=equalize)
+        # Sub-samples are coloured with the histogram of the whole view, not of their batch
+        shade = colors.equalized(iteration_histogram(smooth, fractal.max_iter)) if equalize else colors
+        pixels, _ = antialias(fractal, view, smooth, shade, samples=antialias_samples, backend=backend)
+        self.export_fractal(pixels, filepath, format=format, metadata=metadata)
+
+    def open_animation(
+        self,
+        filepath: str,
+        duration: int = DEFAULT_FRAME_DURATION,
+        loop: int = 0,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> AnimationWriter:
+        # Open a streaming animation writer chosen by the file name: a pattern with a "{}" field writes
+        # numbered images (e.g. "frames/{:05d}.png"), .gif an animated GIF, .png/.apng an animated PNG.
+        # Frames are encoded as they are added, so nothing but the current frame is held in memory.
+        if '{' in Path(filepath).name:
+            return NumberedFrameWriter(
+                filepath, lambda pixels, path: self.save(Image.fromarray(pixels), path, metadata=metadata)
+            )
+        ext = Path(filepath).suffix.lower()
+        if ext == '.gif':
+            return GifWriter(filepath, duration, loop)
+        if ext in ('.png', '.apng'):
+            return ApngWriter(filepath, duration, loop)
+        raise ValueError(f"Unsupported animation format: {ext or filepath}")
+
+    def open_poster(
+        self,
+        filepath: str,
+        width: int,
+        height: int,
+        channels: int = 1,
+        tile_size: int = DEFAULT_TIFF_TILE_SIZE,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> PosterWriter:
+        # Open a streaming writer for an image too large to hold in memory: a tiled TIFF (BigTIFF when
+        # needed) for .tif/.tiff, taking tiles of tile_size in any order, or a PNG written band by band.
+        ext = Path(filepath).suffix.lower()
+        if ext in ('.tif', '.tiff'):
+            return TiledTiffWriter(filepath, width, height, channels, tile_size, metadata=metadata)
+        if ext == '.png':
+            return StripPngWriter(filepath, width, height, channels, metadata=metadata)
+        raise ValueError(f"Unsupported poster format: {ext or filepath} (expected .png, .tif or .tiff)")
@@ -0,0 +1,339 @@
+"""
+Palettes and colour mapping.
+
+A palette is a lookup table of PALETTE_SIZE RGB colours interpolated from a
+few colour stops. A ColorMap maps iteration counts (integer buffers) or
+smooth iteration counts (float buffers) to RGB through such a table:
+
+    position = log1p(count) / log1p(max_iter) * density + offset
+
+selects the palette entry (wrapping around for cyclic palettes, clamped at
+the ends for the others), and points that never escaped get the interior
+colour. The arithmetic runs in place on reusable scratch buffers, and the
+colours are looked up with a single np.take into the caller's output
+buffer, so colouring a frame costs one pass over it instead of the several
+full-image passes of PIL's colorize and autocontrast.
+
+Integer count buffers are faster still: every possible count is coloured
+once per iteration limit, and the frame is one table lookup.
+
+A ColorMap of a gray palette can also produce single-channel gray levels
+instead of RGB; the exporter's grayscale output is one, so it shades the
+same counts exactly as the explorer does.
+
+With histogram equalization, the log-scaled count is replaced by the
+fraction of the escaping points that escape before the count (see
+fractalzoomer.render.histogram), taken from the frame's own histogram or
+from one given for a whole tiled image.
+"""
+
+import functools
+import threading
+from typing import Callable, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from fractalzoomer.render.histogram import cumulative_distribution, iteration_histogram
+
+# Entries of every palette lookup table
+PALETTE_SIZE = 1024
+
+# Colour of points inside the set when none is given
+DEFAULT_INTERIOR = (0, 0, 0)
+
+# Palette used by the explorer when none is chosen
+DEFAULT_PALETTE = "classic"
+
+Color = tuple[int, int, int]
+
+
+class Palette(NamedTuple):
+    """A named RGB lookup table."""
+
+    name: str
+    colors: np.ndarray  # uint8 array of shape (PALETTE_SIZE, 3)
+    cyclic: bool  # Whether the last colour blends back into the first
+
+
+def make_palette(name: str, stops: Sequence[Color], cyclic: bool = False, size: int = PALETTE_SIZE) -> Palette:
+    """
+    Interpolate a palette linearly between evenly spaced colour stops.
+
+    Args:
+        name: Palette name.
+        stops: At least two RGB colours, first to last.
+        cyclic: Whether the palette wraps around (the last stop blends into
+            the first one again).
+        size: Number of lookup table entries.
+    """
+    if len(stops) < 2:
+        raise ValueError("A palette needs at least two colour stops")
+    colors = np.asarray(stops, dtype=np.float64)
+    if cyclic:
+        colors = np.vstack([colors, colors[:1]])
+        samples = np.arange(size) / size
+    else:
+        samples = np.linspace(0.0, 1.0, size)
+    positions = np.linspace(0.0, 1.0, len(colors))
+    table = np.stack([np.interp(samples, positions, colors[:, channel]) for channel in range(3)], axis=1)
+    return Palette(name, np.rint(table).astype(np.uint8), cyclic)
+
+
+PALETTES = {
+    palette.name: palette
+    for palette in (
+        make_palette("grayscale", [(0, 0, 0), (255, 255, 255)]),
+        make_palette("classic", [(0, 0, 0), (128, 0, 128), (255, 255, 0)]),
+        make_palette("fire", [(0, 0, 0), (128, 0, 0), (255, 96, 0), (255, 224, 64), (255, 255, 255)]),
+        make_palette("ice", [(0, 0, 16), (0, 48, 128), (64, 160, 224), (224, 248, 255)]),
+        make_palette(
+            "ultra", [(0, 7, 100), (32, 107, 203), (237, 255, 255), (255, 170, 0), (0, 2, 0)], cyclic=True
+        ),
+        make_palette(
+            "twilight", [(30, 20, 60), (120, 80, 200), (240, 220, 240), (200, 90, 60)], cyclic=True
+        ),
+        make_palette(
+            "rainbow",
+            [(255, 0, 0), (255, 255, 0), (0, 255, 0), (0, 255, 255), (0, 0, 255), (255, 0, 255)],
+            cyclic=True
+        ),
+    )
+}
+
+
+def is_gray(colors: Union[np.ndarray, Sequence[int]]) -> bool:
+    """Whether an RGB colour, or every colour of an array of them, is a gray level."""
+    colors = np.asarray(colors).reshape(-1, 3)
+    return bool(np.all(colors == colors[:, :1]))
+
+
+def get_palette(name: str) -> Palette:
+    """
+    Look up a palette by name.
+
+    Raises:
+        ValueError: If no palette has that name.
+    """
+    try:
+        return PALETTES[name]
+    except KeyError:
+        raise ValueError(f"Unknown palette {name!r} (expected one of {', '.join(PALETTES)})") from None
+
+
+class ColorMap:
+    """Maps iteration buffers to RGB (or gray levels) through a palette lookup table."""
+
+    def __init__(
+        self,
+        palette: str = DEFAULT_PALETTE,
+        offset: float = 0.0,
+        density: float = 1.0,
+        interior: Color = DEFAULT_INTERIOR,
+        equalize: bool = False,
+        channels: int = 3
+    ):
+        """
+        Initialize the colour map.
+
+        Args:
+            palette: Name of the palette (see PALETTES).
+            offset: Shift along the palette, in palette lengths (cycles the
+                colours of cyclic palettes).
+            density: Palette lengths spanned from count 0 to max_iter (from
+                the first to the last escaping point when equalizing).
+            interior: RGB colour of points inside the set.
+            equalize: Colour by histogram equalization instead of by the
+                log-scaled count.
+            channels: 3 for RGB output, 1 for gray levels (gray palettes
+                and interior colours only).
+
+        Raises:
+            ValueError: If channels is not 1 or 3, or is 1 with a palette or
+                interior colour that is not gray.
+        """
+        if channels not in (1, 3):
+            raise ValueError("channels must be 1 (gray levels) or 3 (RGB)")
+        self._channels = channels
+        self._lock = threading.Lock()
+        self._buffers: dict[str, np.ndarray] = {}
+        self._count_tables: dict[int, np.ndarray] = {}
+        self._palette = get_palette(DEFAULT_PALETTE if channels == 3 else "grayscale")
+        self._offset = 0.0
+        self._density = 1.0
+        self._interior = np.zeros(3, dtype=np.uint8)
+        self._equalize = False
+        self._table = self._palette.colors
+        self.configure(palette=palette, offset=offset, density=density, interior=interior, equalize=equalize)
+
+    @property
+    def palette(self) -> Palette:
+        """Get the palette."""
+        return self._palette
+
+    @property
+    def offset(self) -> float:
+        """Get the shift along the palette, in palette lengths."""
+        return self._offset
+
+    @property
+    def density(self) -> float:
+        """Get the palette lengths spanned from count 0 to max_iter."""
+        return self._density
+
+    @property
+    def interior(self) -> Color:
+        """Get the colour of points inside the set."""
+        red, green, blue = (int(channel) for channel in self._interior)
+        return red, green, blue
+
+    @property
+    def channels(self) -> int:
+        """Get the channels of the output: 3 for RGB, 1 for gray levels."""
+        return self._channels
+
+    @property
+    def equalize(self) -> bool:
+        """Get whether colours are histogram-equalized."""
+        return self._equalize
+
+    def configure(
+        self,
+        palette: Optional[str] = None,
+        offset: Optional[float] = None,
+        density: Optional[float] = None,
+        interior: Optional[Color] = None,
+        equalize: Optional[bool] = None
+    ) -> None:
+        """
+        Change some of the mapping parameters (None keeps the current value).
+
+        Raises:
+            ValueError: If the palette is unknown, the density not positive,
+                the interior colour not an RGB triple, or either not gray for
+                a gray-level map.
+        """
+        if density is not None and not density > 0:
+            raise ValueError("density must be positive")
+        if interior is not None and (len(interior) != 3 or not all(0 <= channel <= 255 for channel in interior)):
+            raise ValueError("interior must be an RGB triple of values in 0-255")
+        if self._channels == 1:
+            if palette is not None and not is_gray(get_palette(palette).colors):
+                raise ValueError(f"Palette {palette!r} is not gray and cannot be mapped to gray levels")
+            if interior is not None and not is_gray(interior):
+                raise ValueError("interior must be a gray level for a gray-level map")
+        with self._lock:
+            if palette is not None:
+                self._palette = get_palette(palette)
+            if offset is not None:
+                self._offset = float(offset)
+            if density is not None:
+                self._density = float(density)
+            if interior is not None:
+                self._interior = np.asarray(interior, dtype=np.uint8)
+            if equalize is not None:
+                self._equalize = bool(equalize)
+            # Palette with the interior colour appended as its last entry
+            self._table = np.vstack([self._palette.colors, self._interior[None]])
+            if self._channels == 1:
+                self._table = np.ascontiguousarray(self._table[:, 0])
+            self._count_tables.clear()
+
+    def apply(
+        self,
+        values: np.ndarray,
+        max_iter: int,
+        out: Optional[np.ndarray] = None,
+        histogram: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Colour an iteration buffer.
+
+        Args:
+            values: Iteration counts (integer dtype) or smooth iteration
+                counts (float dtype); values at or above max_iter are interior.
+            max_iter: Iteration limit the buffer was computed with.
+            out: Optional uint8 buffer of shape values.shape + (3,) to fill
+                (values.shape for gray levels).
+            histogram: Iteration histogram to equalize the colours over (see
+                iteration_histogram), e.g. that of a whole tiled image; if
+                None and the map equalizes, that of values.
+
+        Returns:
+            The RGB image or gray levels (out if given).
+        """
+        if max_iter <= 0:
+            raise ValueError("max_iter must be a positive integer")
+        shape = values.shape + (3,) if self._channels == 3 else values.shape
+        if out is None:
+            out = np.empty(shape, dtype=np.uint8)
+        elif out.shape != shape or out.dtype != np.uint8:
+            raise ValueError(f"Output buffer must be uint8 of shape {shape}, got {out.dtype} {out.shape}")
+        if histogram is not None and len(histogram) != max_iter:
+            raise ValueError(f"Histogram has {len(histogram)} bins, expected max_iter ({max_iter})")
+        with self._lock:
+            if histogram is None and self._equalize:
+                histogram = iteration_histogram(values, max_iter)
+            if np.issubdtype(values.dtype, np.integer):
+                # Every count coloured once, then one lookup over the frame
+                table = self._count_tables.get(max_iter) if histogram is None else None
+                if table is None:
+                    counts = np.arange(max_iter + 1, dtype=np.float32)
+                    table = self._table[self._indices(counts, max_iter, counts.shape, "table", histogram)].copy()
+                    if histogram is None:
+                        self._count_tables[max_iter] = table
+                return np.take(table, values, axis=0, out=out, mode="clip")
+            indices = self._indices(values, max_iter, values.shape, "frame", histogram)
+            return np.take(self._table, indices, axis=0, out=out)
+
+    def equalized(self, histogram: np.ndarray) -> Callable[[np.ndarray, int], np.ndarray]:
+        """Shader colouring with this map, equalized over a fixed histogram (e.g. of a whole poster)."""
+        return functools.partial(self.apply, histogram=histogram)
+
+    def __call__(self, values: np.ndarray, max_iter: int) -> np.ndarray:
+        # A ColorMap is a shader: it can be passed wherever smooth counts are turned into pixels
+        return self.apply(values, max_iter)
+
+    def _indices(
+        self,
+        values: np.ndarray,
+        max_iter: int,
+        shape: tuple[int, ...],
+        role: str,
+        histogram: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        # Palette table index of every value, computed in place in reusable buffers
+        size = len(self._palette.colors)
+        position = self._buffer(f"{role}-position", shape, np.dtype(np.float32))
+        interior = self._buffer(f"{role}-interior", shape, np.dtype(np.bool_))
+        index = self._buffer(f"{role}-index", shape, np.dtype(np.intp))
+        np.greater_equal(values, max_iter, out=interior)
+        np.clip(values, 0, max_iter, out=position, casting="unsafe")
+        if histogram is None:
+            np.log1p(position, out=position)
+            position *= np.float32(self._density * size / np.log1p(max_iter))
+        else:
+            # Fraction of the escaping points below the count, interpolated within its bin
+            below, share = cumulative_distribution(histogram)
+            level = self._buffer(f"{role}-level", shape, np.dtype(np.float32))
+            index[...] = position
+            np.minimum(index, max_iter - 1, out=index)
+            position -= index
+            np.take(share, index, out=level)
+            position *= level
+            np.take(below, index, out=level)
+            position += level
+            position *= np.float32(self._density * size)
+        position += np.float32(self._offset * size)
+        if self._palette.cyclic:
+            np.mod(position, size, out=position)
+        np.clip(position, 0, size - 1, out=position)
+        index[...] = position
+        index[interior] = size
+        return index
+
+    def _buffer(self, name: str, shape: tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        # Scratch buffer reused while frames keep the same shape
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = self._buffers[name] = np.empty(shape, dtype=dtype)
+        return buffer
@@ -0,0 +1,607 @@
+"""
+Streaming image writers.
+
+Pillow's multi-frame GIF and APNG writers collect every frame before writing
+the file, so an animation costs memory in proportion to its length. The
+writers here encode each frame as soon as it is added and keep nothing but
+the file position, so an animation of any length is written in the memory of
+a single frame.
+
+Likewise, Pillow saves an image from one array of the whole image. The
+poster writers take the image a tile at a time instead: TiledTiffWriter
+writes each tile as it arrives, in any order (as BigTIFF past 4 GiB), and
+StripPngWriter compresses full-width bands of rows as they complete.
+"""
+
+import io
+import struct
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Mapping, Optional, Union
+
+import numpy as np
+from PIL import Image
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# PNG colour types by number of channels (grayscale, RGB)
+PNG_COLOR_TYPES = {1: 0, 3: 2}
+
+# zlib level of PNG image data (zlib's default speed/size trade-off)
+PNG_COMPRESSION = 6
+
+# Frame delay of animations when none is given, in milliseconds (25 frames per second)
+DEFAULT_FRAME_DURATION = 40
+
+# Compressed bytes collected before a poster PNG emits an IDAT chunk
+PNG_CHUNK_BYTES = 1 << 20
+
+# Side length of TIFF tiles when none is given (TIFF requires a multiple of 16)
+DEFAULT_TIFF_TILE_SIZE = 512
+
+# TIFF field types: name -> (type code, struct format)
+TIFF_TYPES = {"ASCII": (2, "s"), "SHORT": (3, "H"), "LONG": (4, "I"), "LONG8": (16, "Q")}
+
+# Largest classic TIFF file; larger images are written as BigTIFF
+TIFF_CLASSIC_LIMIT = 1 << 32
+
+Frame = Union[np.ndarray, Image.Image]
+
+
+def frame_pixels(frame: Frame) -> np.ndarray:
+    """
+    Convert a frame to a uint8 array of shape (height, width) or (height, width, 3).
+
+    Raises:
+        ValueError: If the frame is neither grayscale nor RGB.
+    """
+    if isinstance(frame, Image.Image):
+        frame = frame if frame.mode in ("L", "RGB") else frame.convert("RGB")
+    pixels = np.asarray(frame)
+    if pixels.dtype != np.uint8:
+        pixels = np.clip(pixels, 0, 255).astype(np.uint8)
+    if pixels.ndim not in (2, 3) or (pixels.ndim == 3 and pixels.shape[2] != 3):
+        raise ValueError(f"Frames must be grayscale or RGB, got an array of shape {pixels.shape}")
+    return pixels
+
+
+def write_png_chunk(stream: BinaryIO, kind: bytes, data: bytes) -> None:
+    """Write one length-prefixed, CRC-terminated PNG chunk."""
+    stream.write(struct.pack(">I", len(data)))
+    stream.write(kind)
+    stream.write(data)
+    stream.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
+
+
+def png_header(width: int, height: int, channels: int) -> bytes:
+    """IHDR payload of an 8-bit, non-interlaced grayscale or RGB image."""
+    if channels not in PNG_COLOR_TYPES:
+        raise ValueError(f"Unsupported number of channels: {channels}")
+    return struct.pack(">IIBBBBB", width, height, 8, PNG_COLOR_TYPES[channels], 0, 0, 0)
+
+
+def png_scanlines(pixels: np.ndarray) -> bytes:
+    """
+    Filter rows of pixels into PNG scanlines.
+
+    Every row uses the Sub filter (each byte minus the same channel of the
+    pixel to its left), which turns the smooth gradients of fractal images
+    into near-constant runs that compress well.
+
+    Args:
+        pixels: uint8 array of shape (rows, width) or (rows, width, 3).
+
+    Returns:
+        The scanlines, each prefixed with its filter type byte.
+    """
+    channels = pixels.shape[2] if pixels.ndim == 3 else 1
+    rows = pixels.reshape(pixels.shape[0], -1)
+    scanlines = np.empty((rows.shape[0], rows.shape[1] + 1), dtype=np.uint8)
+    scanlines[:, 0] = 1
+    scanlines[:, 1:channels + 1] = rows[:, :channels]
+    np.subtract(rows[:, channels:], rows[:, :-channels], out=scanlines[:, channels + 1:])
+    return scanlines.tobytes()
+
+
+def png_image_data(pixels: np.ndarray) -> bytes:
+    """zlib stream of a whole image, as stored in IDAT/fdAT chunks."""
+    return zlib.compress(png_scanlines(pixels), PNG_COMPRESSION)
+
+
+class AnimationWriter(ABC):
+    """Writes the frames of an animation one at a time."""
+
+    def __init__(self) -> None:
+        self._frames = 0
+        self._shape: Optional[tuple[int, ...]] = None
+
+    @property
+    def frames(self) -> int:
+        """Get the number of frames written so far."""
+        return self._frames
+
+    def add_frame(self, frame: Frame) -> None:
+        """
+        Append a frame.
+
+        Raises:
+            ValueError: If the frame differs in size or channels from the first one.
+        """
+        pixels = frame_pixels(frame)
+        if self._shape is None:
+            self._shape = pixels.shape
+        elif pixels.shape != self._shape:
+            raise ValueError(f"Frame of shape {pixels.shape} does not match the animation's {self._shape}")
+        self._write(pixels)
+        self._frames += 1
+
+    @abstractmethod
+    def _write(self, pixels: np.ndarray) -> None:
+        pass
+
+    def close(self) -> None:
+        """Finish the file."""
+
+    def __enter__(self) -> "AnimationWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class NumberedFrameWriter(AnimationWriter):
+    """Writes every frame to its own file, named by formatting a pattern with the frame number."""
+
+    def __init__(self, pattern: str, save: Callable[[np.ndarray, str], None], start: int = 0):
+        """
+        Initialize the writer.
+
+        Args:
+            pattern: str.format pattern of the file names, e.g. "frames/{:05d}.png".
+            save: Writes one frame to a path (e.g. FractalExporter.export_fractal).
+            start: Number of the first frame.
+        """
+        super().__init__()
+        try:
+            pattern.format(start)
+        except (IndexError, KeyError, ValueError) as exc:
+            raise ValueError(f"Invalid frame name pattern {pattern!r}: {exc}") from None
+        self._pattern = pattern
+        self._save = save
+        self._start = start
+
+    def _write(self, pixels: np.ndarray) -> None:
+        path = Path(self._pattern.format(self._start + self._frames))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._save(pixels, str(path))
+
+
+class GifWriter(AnimationWriter):
+    """Streams frames into an animated GIF."""
+
+    def __init__(self, filepath: Union[str, Path], duration: int = DEFAULT_FRAME_DURATION, loop: int = 0):
+        """
+        Open the file.
+
+        Args:
+            filepath: GIF file to write.
+            duration: Delay of every frame in milliseconds (GIF stores 1/100 s).
+            loop: Number of times to play the animation, 0 for forever.
+        """
+        super().__init__()
+        if duration <= 0:
+            raise ValueError("duration must be positive")
+        self._delay = max(1, round(duration / 10))
+        self._loop = loop
+        self._stream = open(filepath, "wb")
+
+    def _write(self, pixels: np.ndarray) -> None:
+        image = Image.fromarray(pixels)
+        if image.mode == "RGB":
+            image = image.quantize(256)
+        buffer = io.BytesIO()
+        image.save(buffer, format="GIF", optimize=False)
+        data = buffer.getvalue()
+
+        if self._frames == 0:
+            # Logical screen without a global colour table (every frame carries its own),
+            # followed by the NETSCAPE2.0 looping extension
+            self._stream.write(b"GIF89a" + data[6:10] + b"\x00\x00\x00")
+            self._stream.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", self._loop) + b"\x00")
+
+        # Pillow's single-frame GIF: header, screen descriptor, global colour table, optional
+        # extensions, then the image. Move the global table into the image as its local table.
+        flags = data[10]
+        table_size = 3 << ((flags & 0x07) + 1) if flags & 0x80 else 0
+        table = data[13:13 + table_size]
+        position = 13 + table_size
+        while data[position] == 0x21:  # Skip extension blocks
+            position += 2
+            while data[position]:
+                position += data[position] + 1
+            position += 1
+        descriptor = bytearray(data[position:position + 10])
+        image_data = data[position + 10:-1]  # Up to the trailer
+        if table and not descriptor[9] & 0x80:
+            descriptor[9] = (descriptor[9] & 0x40) | 0x80 | (flags & 0x07)
+            image_data = table + image_data
+
+        # Graphic control extension: keep the previous frame (each frame is opaque), delay
+        self._stream.write(b"\x21\xf9\x04\x04" + struct.pack("<H", self._delay) + b"\x00\x00")
+        self._stream.write(bytes(descriptor) + image_data)
+
+    def close(self) -> None:
+        """Write the trailer and close the file."""
+        if self._stream.closed:
+            return
+        if self._frames:
+            self._stream.write(b"\x3b")
+        self._stream.close()
+
+
+class ApngWriter(AnimationWriter):
+    """Streams frames into an animated PNG."""
+
+    def __init__(self, filepath: Union[str, Path], duration: int = DEFAULT_FRAME_DURATION, loop: int = 0):
+        """
+        Open the file.
+
+        Args:
+            filepath: PNG file to write.
+            duration: Delay of every frame in milliseconds.
+            loop: Number of times to play the animation, 0 for forever.
+        """
+        super().__init__()
+        if not 0 < duration <= 0xFFFF:
+            raise ValueError("duration must be between 1 and 65535 milliseconds")
+        self._duration = duration
+        self._loop = loop
+        self._sequence = 0  # Sequence number shared by fcTL and fdAT chunks
+        self._control_offset = 0
+        self._stream = open(filepath, "w+b")
+
+    def _write(self, pixels: np.ndarray) -> None:
+        height, width = pixels.shape[:2]
+        if self._frames == 0:
+            self._stream.write(PNG_SIGNATURE)
+            write_png_chunk(self._stream, b"IHDR", png_header(width, height, pixels.shape[2] if pixels.ndim == 3 else 1))
+            # The frame count is not known yet: acTL is rewritten by close()
+            self._control_offset = self._stream.tell()
+            write_png_chunk(self._stream, b"acTL", struct.pack(">II", 1, self._loop))
+
+        # Every frame covers the whole canvas and replaces the previous one
+        write_png_chunk(self._stream, b"fcTL", struct.pack(
+            ">IIIIIHHBB", self._sequence, width, height, 0, 0, self._duration, 1000, 0, 0
+        ))
+        self._sequence += 1
+        data = png_image_data(pixels)
+        if self._frames == 0:
+            write_png_chunk(self._stream, b"IDAT", data)
+        else:
+            write_png_chunk(self._stream, b"fdAT", struct.pack(">I", self._sequence) + data)
+            self._sequence += 1
+
+    def close(self) -> None:
+        """Record the frame count, write the end chunk and close the file."""
+        if self._stream.closed:
+            return
+        if self._frames:
+            write_png_chunk(self._stream, b"IEND", b"")
+            self._stream.seek(self._control_offset)
+            write_png_chunk(self._stream, b"acTL", struct.pack(">II", self._frames, self._loop))
+        self._stream.close()
+
+
+class PosterWriter(ABC):
+    """Writes an image a tile at a time."""
+
+    def __init__(self, width: int, height: int, channels: int = 1):
+        if width <= 0 or height <= 0:
+            raise ValueError("width and height must be positive integers")
+        if channels not in PNG_COLOR_TYPES:
+            raise ValueError(f"Unsupported number of channels: {channels}")
+        self._width = width
+        self._height = height
+        self._channels = channels
+
+    @property
+    def width(self) -> int:
+        """Get the image width in pixels."""
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """Get the image height in pixels."""
+        return self._height
+
+    @property
+    def channels(self) -> int:
+        """Get the number of channels (1 for grayscale, 3 for RGB)."""
+        return self._channels
+
+    def write_tile(self, top: int, left: int, tile: Frame) -> None:
+        """
+        Write the pixels of a rectangle whose top-left corner is (top, left).
+
+        Raises:
+            ValueError: If the tile has the wrong number of channels or lies
+                outside the image.
+        """
+        pixels = frame_pixels(tile)
+        channels = pixels.shape[2] if pixels.ndim == 3 else 1
+        if channels != self._channels:
+            raise ValueError(f"Tile has {channels} channels, the image {self._channels}")
+        height, width = pixels.shape[:2]
+        if top < 0 or left < 0 or top + height > self._height or left + width > self._width:
+            raise ValueError(f"Tile of shape {pixels.shape} at ({top}, {left}) lies outside the image")
+        self._write_tile(top, left, pixels)
+
+    @abstractmethod
+    def _write_tile(self, top: int, left: int, pixels: np.ndarray) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Finish the file."""
+
+    def __enter__(self) -> "PosterWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        try:
+            self.close()
+        except ValueError:
+            if exc_type is None:  # Do not mask the error that left the image incomplete
+                raise
+
+
+class StripPngWriter(PosterWriter):
+    """
+    Streams an image into a PNG, one band of rows at a time.
+
+    PNG rows are compressed in order, so tiles must arrive band by band,
+    left to right; only the band being filled is held in memory.
+    """
+
+    def __init__(
+        self,
+        filepath: Union[str, Path],
+        width: int,
+        height: int,
+        channels: int = 1,
+        metadata: Optional[Mapping[str, Any]] = None
+    ):
+        """
+        Open the file.
+
+        Args:
+            filepath: PNG file to write.
+            width, height: Image size in pixels.
+            channels: 1 for grayscale, 3 for RGB.
+            metadata: Text entries stored in tEXt chunks.
+        """
+        super().__init__(width, height, channels)
+        self._compressor = zlib.compressobj(PNG_COMPRESSION)
+        self._pending: list[bytes] = []  # Compressed data not yet written
+        self._pending_bytes = 0
+        self._rows = 0  # Rows compressed so far
+        self._band: Optional[np.ndarray] = None
+        self._filled = 0  # Columns of the current band received so far
+        self._stream = open(filepath, "wb")
+        self._stream.write(PNG_SIGNATURE)
+        write_png_chunk(self._stream, b"IHDR", png_header(width, height, channels))
+        for key, value in (metadata or {}).items():
+            write_png_chunk(self._stream, b"tEXt", str(key).encode("latin-1") + b"\0" + str(value).encode("latin-1"))
+
+    def _write_tile(self, top: int, left: int, pixels: np.ndarray) -> None:
+        height, width = pixels.shape[:2]
+        if self._band is None:
+            if top != self._rows or left != 0:
+                raise ValueError(f"PNG tiles must arrive in row order: expected row {self._rows}, column 0")
+            self._band = np.empty((height, self._width) + pixels.shape[2:], dtype=np.uint8)
+        elif top != self._rows or left != self._filled or height != self._band.shape[0]:
+            raise ValueError(f"PNG tiles must arrive in row order: expected row {self._rows}, column {self._filled}")
+        self._band[:, left:left + width] = pixels
+        self._filled += width
+        if self._filled == self._width:
+            self.write_rows(self._band)
+            self._band = None
+            self._filled = 0
+
+    def write_rows(self, pixels: Frame) -> None:
+        """Append full-width rows below the rows written so far."""
+        pixels = frame_pixels(pixels)
+        if pixels.shape[1] != self._width or self._rows + pixels.shape[0] > self._height:
+            raise ValueError(f"Rows of shape {pixels.shape} do not fit the image")
+        self._rows += pixels.shape[0]
+        data = self._compressor.compress(png_scanlines(pixels))
+        if data:
+            self._pending.append(data)
+            self._pending_bytes += len(data)
+        if self._pending_bytes >= PNG_CHUNK_BYTES:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            write_png_chunk(self._stream, b"IDAT", b"".join(self._pending))
+            self._pending.clear()
+            self._pending_bytes = 0
+
+    def close(self) -> None:
+        """
+        Finish the image data, write the end chunk and close the file.
+
+        Raises:
+            ValueError: If rows are missing (the file is closed regardless).
+        """
+        if self._stream.closed:
+            return
+        try:
+            if self._rows != self._height:
+                raise ValueError(f"Only {self._rows} of {self._height} rows were written")
+            self._pending.append(self._compressor.flush())
+            self._flush()
+            write_png_chunk(self._stream, b"IEND", b"")
+        finally:
+            self._stream.close()
+
+
+def tiff_directory(entries: list[tuple[int, str, Any]], offset: int, bigtiff: bool) -> bytes:
+    """
+    Encode a TIFF image file directory placed at a file offset.
+
+    Args:
+        entries: (tag, type name, values) of every field; ASCII values are
+            bytes, the others sequences of integers.
+        offset: File offset the directory is written at.
+        bigtiff: Use the BigTIFF layout (64-bit counts and offsets).
+
+    Returns:
+        The directory followed by the values that do not fit in their entries.
+    """
+    count_format, offset_format, inline = ("<Q", "<Q", 8) if bigtiff else ("<H", "<I", 4)
+    entry_format = "<HHQ" if bigtiff else "<HHI"
+    data_offset = (
+        offset + struct.calcsize(count_format)
+        + len(entries) * (struct.calcsize(entry_format) + inline) + struct.calcsize(offset_format)
+    )
+    table = [struct.pack(count_format, len(entries))]
+    extra = []
+    for tag, kind, values in sorted(entries, key=lambda entry: entry[0]):
+        code, item_format = TIFF_TYPES[kind]
+        payload = values if kind == "ASCII" else struct.pack(f"<{len(values)}{item_format}", *values)
+        if len(payload) <= inline:
+            value = payload.ljust(inline, b"\0")
+        else:
+            value = struct.pack(offset_format, data_offset)
+            extra.append(payload + b"\0" * (len(payload) % 2))  # Values start on word boundaries
+            data_offset += len(extra[-1])
+        table.append(struct.pack(entry_format, tag, code, len(values)) + value)
+    table.append(struct.pack(offset_format, 0))  # No further directory
+    return b"".join(table + extra)
+
+
+class TiledTiffWriter(PosterWriter):
+    """
+    Streams an image into a tiled TIFF.
+
+    Tiles are compressed (Deflate with horizontal differencing) and appended
+    as they arrive, in any order; their offsets are written in the image
+    directory at the end of the file.
+    """
+
+    def __init__(
+        self,
+        filepath: Union[str, Path],
+        width: int,
+        height: int,
+        channels: int = 1,
+        tile_size: int = DEFAULT_TIFF_TILE_SIZE,
+        bigtiff: Optional[bool] = None,
+        metadata: Optional[Mapping[str, Any]] = None
+    ):
+        """
+        Open the file.
+
+        Args:
+            filepath: TIFF file to write.
+            width, height: Image size in pixels.
+            channels: 1 for grayscale, 3 for RGB.
+            tile_size: Side length of the tiles, a multiple of 16; every
+                tile written must start on this grid.
+            bigtiff: Write a BigTIFF; by default only when the image could
+                exceed the 4 GiB limit of classic TIFF.
+            metadata: Entries stored as "key=value" lines in the image
+                description.
+        """
+        super().__init__(width, height, channels)
+        if tile_size <= 0 or tile_size % 16:
+            raise ValueError("tile_size must be a positive multiple of 16")
+        self._tile_size = tile_size
+        self._columns = -(-width // tile_size)
+        tiles = self._columns * -(-height // tile_size)
+        if bigtiff is None:
+            # Deflate adds at most a few bytes per 16 KiB block on incompressible data
+            worst_case = tiles * (tile_size * tile_size * channels * 1.01 + 64) + tiles * 16
+            bigtiff = worst_case >= TIFF_CLASSIC_LIMIT
+        self._bigtiff = bigtiff
+        self._offsets = [0] * tiles
+        self._counts = [0] * tiles
+        self._description = "\n".join(f"{key}={value}" for key, value in (metadata or {}).items())
+        self._stream = open(filepath, "wb")
+        # Header; the directory offset is filled in by close()
+        self._stream.write(b"II+\0" + struct.pack("<HHQ", 8, 0, 0) if bigtiff else b"II*\0" + struct.pack("<I", 0))
+
+    @property
+    def tile_size(self) -> int:
+        """Get the side length of the tiles."""
+        return self._tile_size
+
+    @property
+    def bigtiff(self) -> bool:
+        """Get whether the file is a BigTIFF."""
+        return self._bigtiff
+
+    def _write_tile(self, top: int, left: int, pixels: np.ndarray) -> None:
+        size = self._tile_size
+        if top % size or left % size:
+            raise ValueError(f"Tile at ({top}, {left}) is not on the {size}-pixel tile grid")
+        height, width = pixels.shape[:2]
+        if (height < size and top + height != self._height) or (width < size and left + width != self._width):
+            raise ValueError(f"Tile of shape {pixels.shape} at ({top}, {left}) does not fill its grid cell")
+        if height > size or width > size:
+            raise ValueError(f"Tile of shape {pixels.shape} exceeds the tile size {size}")
+        # Edge tiles are padded to the full tile size, differenced horizontally and deflated
+        tile = np.zeros((size, size) + pixels.shape[2:], dtype=np.uint8)
+        tile[:height, :width] = pixels
+        tile[:, 1:] -= tile[:, :-1].copy()
+        data = zlib.compress(tile.tobytes(), PNG_COMPRESSION)
+
+        offset = self._stream.tell()
+        if not self._bigtiff and offset + len(data) >= TIFF_CLASSIC_LIMIT:
+            raise ValueError("Image exceeds 4 GiB; write it with bigtiff=True")
+        index = (top // size) * self._columns + left // size
+        self._stream.write(data)
+        self._offsets[index] = offset
+        self._counts[index] = len(data)
+
+    def close(self) -> None:
+        """
+        Write the image directory and close the file.
+
+        Raises:
+            ValueError: If tiles are missing (the file is closed regardless).
+        """
+        if self._stream.closed:
+            return
+        try:
+            missing = self._counts.count(0)
+            if missing:
+                raise ValueError(f"{missing} of {len(self._counts)} tiles were not written")
+            offset = self._stream.tell()
+            offset += offset % 2  # Directories start on word boundaries
+            size_type = "LONG8" if self._bigtiff else "LONG"
+            entries: list[tuple[int, str, Any]] = [
+                (256, "LONG", [self._width]),
+                (257, "LONG", [self._height]),
+                (258, "SHORT", [8] * self._channels),  # Bits per sample
+                (259, "SHORT", [8]),  # Deflate compression
+                (262, "SHORT", [2 if self._channels == 3 else 1]),  # RGB or black-is-zero grayscale
+                (277, "SHORT", [self._channels]),
+                (284, "SHORT", [1]),  # Interleaved channels
+                (317, "SHORT", [2]),  # Horizontal differencing predictor
+                (322, "LONG", [self._tile_size]),
+                (323, "LONG", [self._tile_size]),
+                (324, size_type, self._offsets),
+                (325, size_type, self._counts),
+            ]
+            if self._description:
+                entries.append((270, "ASCII", self._description.encode("latin-1") + b"\0"))
+            if self._stream.tell() != offset:
+                self._stream.write(b"\0")
+            self._stream.write(tiff_directory(entries, offset, self._bigtiff))
+            self._stream.seek(8 if self._bigtiff else 4)
+            self._stream.write(struct.pack("<Q" if self._bigtiff else "<I", offset))
+        finally:
+            self._stream.close()
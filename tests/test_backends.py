@@ -0,0 +1,161 @@
+import tracemalloc
+import pytest
+import numpy as np
+from fractalzoomer.core import MandelbrotSet, JuliaSet, BurningShipSet
+from fractalzoomer.core.backends.buffers import BufferPool
+from fractalzoomer.core.backends import (
+    ComputeBackend,
+    NumpyBackend,
+    BACKEND_ENV_VAR,
+    available_backends,
+    get_backend,
+    register_backend,
+)
+
+
+@pytest.fixture
+def grid():
+    x = np.linspace(-2.0, 1.0, 48, dtype=np.float32)
+    y = np.linspace(-1.2, 1.2, 32, dtype=np.float32)
+    X, Y = np.meshgrid(x, y)
+    return (X + 1j * Y).astype(np.complex64)
+
+
+class TestBackendRegistry:
+    # Tests for backend lookup and selection
+
+    def test_numpy_is_default(self, monkeypatch):
+        monkeypatch.delenv(BACKEND_ENV_VAR, raising=False)
+        assert isinstance(get_backend(), NumpyBackend)
+
+    def test_numpy_always_available(self):
+        assert "numpy" in available_backends()
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(ValueError, match="Unknown compute backend"):
+            get_backend("does-not-exist")
+
+    def test_environment_variable_selects_backend(self, monkeypatch):
+        monkeypatch.setenv(BACKEND_ENV_VAR, "numpy")
+        assert get_backend().name == "numpy"
+
+    def test_missing_dependency_falls_back_to_numpy(self):
+        def broken_factory() -> ComputeBackend:
+            raise ImportError("no such module")
+
+        register_backend("broken", broken_factory)
+        with pytest.warns(RuntimeWarning, match="falling back"):
+            backend = get_backend("broken")
+        assert backend.name == "numpy"
+
+    def test_per_call_backend_selection(self, grid):
+        m = MandelbrotSet(max_iter=30)
+        result = m.compute_array(grid, output="counts", backend="numpy")
+        assert np.array_equal(result, m.compute_array(grid, output="counts"))
+
+
+class TestNumpyBackend:
+    # Tests for the in-place split-plane kernels
+
+    @pytest.mark.parametrize("formula", ["quadratic", "burning_ship"])
+    def test_matches_complex_arithmetic(self, formula, grid):
+        c = grid.ravel().astype(np.complex128) * 0.5
+        z = np.zeros_like(c)
+        expected = z.copy()
+        for _ in range(4):
+            w = expected if formula == "quadratic" else np.abs(expected.real) + 1j * np.abs(expected.imag)
+            expected = w * w + c
+        result, counts = NumpyBackend().escape_time(formula, z, c, 4, None, np.dtype(np.uint16))
+        np.testing.assert_allclose(result, expected, rtol=1e-12, atol=1e-15)
+        assert np.all(counts == 4)
+
+    @pytest.mark.parametrize("formula", ["quadratic", "burning_ship"])
+    def test_iterations_do_not_allocate(self, formula):
+        # Peak allocation must not grow with the iteration count (the scratch planes are pooled)
+        x, y = np.meshgrid(np.linspace(-0.75, -0.73, 200), np.linspace(0.1, 0.12, 100))
+        c = (x + 1j * y).ravel()
+        z = np.zeros_like(c)
+        backend = NumpyBackend(BufferPool())
+        peaks = []
+        for max_iter in (10, 10, 400):
+            tracemalloc.start()
+            backend.escape_time(formula, z, c, max_iter, 2.0, np.dtype(np.uint16), 1e-6)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        # Outputs, active indices and retiring positions only: well under the 10 float64 scratch planes
+        assert peaks[2] < 3 * c.nbytes
+        assert peaks[2] < 1.5 * peaks[1] < peaks[0]
+        assert backend.pool.stats.misses == 13
+
+    def test_buffers_are_reused_across_calls(self, grid):
+        m = MandelbrotSet(max_iter=40)
+        backend = get_backend("numpy")
+        first = m.compute_array(grid, output="smooth")
+        before = backend.pool.stats
+        assert np.array_equal(m.compute_array(grid, output="smooth"), first)
+        after = backend.pool.stats
+        assert after.misses == before.misses and after.hits > before.hits
+
+    def test_empty_input(self):
+        z = np.zeros(0, dtype=np.complex64)
+        result, counts = NumpyBackend().escape_time("quadratic", z, z, 10, 2.0, np.dtype(np.uint16))
+        assert result.size == 0 and counts.size == 0
+
+
+class TestBufferPool:
+    # Tests for the scratch buffer pool
+
+    def test_returned_buffers_are_reused(self):
+        pool = BufferPool()
+        with pool.borrow(100, np.float32, 2) as (a, b):
+            assert a.shape == (100,) and a.dtype == np.float32 and a is not b
+        with pool.borrow(100, np.float32, 3) as buffers:
+            assert any(buffer is a for buffer in buffers)
+        assert pool.stats.hits == 2 and pool.stats.misses == 3
+        assert pool.stats.idle_bytes == 3 * 400
+        # Other sizes and dtypes get their own buffers
+        assert pool.take(100, np.float64).dtype == np.float64
+        assert pool.take(50, np.float32).shape == (50,)
+        assert pool.stats.misses == 5
+
+    def test_budget_drops_least_recently_used_sizes(self):
+        pool = BufferPool(max_bytes=1000)
+        pool.give(pool.take(100, np.float32))
+        pool.give(pool.take(150, np.float32))
+        assert pool.stats.idle_bytes == 1000
+        pool.give(pool.take(10, np.float32))
+        assert pool.stats.idle_bytes == 640  # The 100-element buffer was dropped
+        pool.give(np.empty(1000, dtype=np.float32))  # Larger than the budget: not kept
+        assert pool.stats.idle_bytes == 640
+        pool.clear()
+        assert pool.stats.idle_bytes == 0
+        with pytest.raises(ValueError):
+            BufferPool(max_bytes=-1)
+
+
+class TestNumbaBackend:
+    # The JIT backend must agree with the NumPy reference
+
+    @pytest.fixture(autouse=True)
+    def require_numba(self):
+        pytest.importorskip("numba")
+
+    @pytest.mark.parametrize("fractal", [
+        MandelbrotSet(max_iter=80),
+        JuliaSet(c_real=-0.8, c_imag=0.156, max_iter=80),
+        BurningShipSet(max_iter=80),
+    ])
+    def test_matches_numpy(self, fractal, grid):
+        reference = fractal.compute_escape(grid, backend="numpy")
+        result = fractal.compute_escape(grid, backend="numba")
+        assert result.counts.dtype == reference.counts.dtype
+        # Rounding may move a handful of boundary pixels by one band
+        assert np.mean(result.counts == reference.counts) > 0.99
+        escaped = result.counts < 80
+        assert np.all(np.abs(result.z[escaped]) > 2.0)
+
+    def test_periodicity_matches_numpy(self, grid):
+        j = JuliaSet(c_real=-0.123, c_imag=0.745, max_iter=300, periodicity_tol=1e-5)
+        reference = j.compute_array(grid, output="counts", backend="numpy")
+        result = j.compute_array(grid, output="counts", backend="numba")
+        assert np.mean(result == reference) > 0.99
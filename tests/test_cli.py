@@ -0,0 +1,263 @@
+import json
+import pytest
+import numpy as np
+from PIL import Image, PngImagePlugin
+
+from fractalzoomer.cli import AnimationSpec, JobSpec, load_animation, load_jobs, main, render_job, run_batch
+from fractalzoomer.core import JuliaSet
+
+
+class TestJobSpec:
+    # Tests for building render jobs from spec values
+
+    def test_defaults_and_view(self):
+        spec = JobSpec.from_mapping({"fractal": "mandelbrot", "output": "m.png", "zoom": 2})
+        view = spec.view
+        assert (view.width, view.height) == (600, 400)
+        assert (view.half_width, view.half_height) == (0.875, 0.5)
+        assert (view.center_x, view.center_y) == (-0.5, 0.0)
+
+    @pytest.mark.parametrize("size", [(1000, 1000), (300, 900), (1750, 1000)])
+    def test_view_keeps_the_ui_extent_at_any_size(self, size):
+        view = JobSpec("mandelbrot", "m.png", width=size[0], height=size[1]).view
+        assert (view.half_width, view.half_height) == (1.75, 1.0)
+
+    def test_aspect_sets_the_visible_height(self):
+        spec = JobSpec.from_mapping({"fractal": "mandelbrot", "output": "m.png", "zoom": "2", "aspect": "1.0"})
+        view = spec.view
+        assert (view.half_width, view.half_height) == (0.875, 0.875)
+        again = JobSpec.from_mapping({**spec.metadata(), "output": "m.png"})
+        assert again.aspect == 1.0
+
+    def test_png_metadata_strings_and_aliases(self):
+        spec = JobSpec.from_mapping({
+            "fractal_type": "julia", "output": "j.png", "center_x": "0.1", "max_iterations": "300",
+            "julia_c_real": "-0.8", "c_imag": "0.156", "size": (64, 48),
+        })
+        assert (spec.max_iter, spec.width, spec.height) == (300, 64, 48)
+        engine = spec.engine()
+        assert isinstance(engine, JuliaSet)
+        assert (engine.c_real, engine.c_imag, engine.max_iter) == (-0.8, 0.156, 300)
+
+    def test_metadata_round_trips(self):
+        spec = JobSpec("julia", "j.png", center_x=0.25, zoom=8.0, max_iter=90, julia_c_real=0.285)
+        again = JobSpec.from_mapping({**spec.metadata(), "output": "j.png", "size": (600, 400)})
+        assert again == spec
+
+    @pytest.mark.parametrize("data", [
+        {"fractal": "newton", "output": "x.png"},
+        {"fractal": "mandelbrot"},
+        {"fractal": "mandelbrot", "output": "x.png", "zoom": 0},
+        {"fractal": "mandelbrot", "output": "x.png", "aspect": -1},
+        {"fractal": "mandelbrot", "output": "x.png", "width": 10.5},
+        {"fractal": "mandelbrot", "output": "x.png", "max_iter": "many"},
+        {"fractal": "mandelbrot", "output": "x.png", "colour": "red"},
+        {"fractal": "mandelbrot", "output": "x.png", "antialias": 0},
+        {"fractal": "mandelbrot", "output": "x.png", "palette": "plaid"},
+        {"fractal": "mandelbrot", "output": "x.png", "equalize": "maybe"},
+    ])
+    def test_invalid_specs(self, data):
+        with pytest.raises(ValueError):
+            JobSpec.from_mapping(data)
+
+    def test_unknown_keys_are_ignored_when_not_strict(self):
+        spec = JobSpec.from_mapping({"fractal": "mandelbrot", "output": "x.png", "Software": "x"}, strict=False)
+        assert spec.fractal == "mandelbrot"
+
+
+class TestLoadJobs:
+    # Tests for reading job files
+
+    def test_toml_jobs_with_defaults(self, tmp_path):
+        path = tmp_path / "batch.toml"
+        path.write_text(
+            'width = 32\nheight = 24\n\n'
+            '[[jobs]]\nfractal = "mandelbrot"\n\n'
+            '[[jobs]]\nfractal = "burning_ship"\nwidth = 16\noutput = "ship.png"\n'
+        )
+        jobs = load_jobs(path, output_dir=tmp_path / "out")
+        assert [(job.fractal, job.width, job.height) for job in jobs] == [("mandelbrot", 32, 24), ("burning_ship", 16, 24)]
+        assert [job.output for job in jobs] == [str(tmp_path / "out" / "batch-1.png"), str(tmp_path / "out" / "ship.png")]
+
+    def test_json_single_job(self, tmp_path):
+        path = tmp_path / "one.json"
+        path.write_text(json.dumps({"fractal": "julia", "center": [0.0, 0.0], "size": [20, 10]}))
+        (job,) = load_jobs(path)
+        assert (job.output, job.width, job.height, job.center_x) == ("one.png", 20, 10, 0.0)
+
+    def test_png_export_is_rendered_again(self, tmp_path):
+        spec = JobSpec("julia", str(tmp_path / "first.png"), center_x=0.0, width=40, height=30, max_iter=60)
+        render_job(spec)
+        (again,) = load_jobs(tmp_path / "first.png", output_dir=tmp_path)
+        assert again.output == str(tmp_path / "first-render.png")
+        assert (again.width, again.height, again.max_iter, again.fractal) == (40, 30, 60, "julia")
+        render_job(again)
+        assert np.array_equal(np.asarray(Image.open(again.output)), np.asarray(Image.open(spec.output)))
+
+    @pytest.mark.parametrize("metadata, half_height", [({}, 0.5), ({"aspect": "0.8"}, 0.7)])
+    def test_png_keeps_the_visible_region(self, tmp_path, metadata, half_height):
+        image = Image.new("L", (30, 40))
+        info = PngImagePlugin.PngInfo()
+        for key, value in {"fractal_type": "mandelbrot", "zoom": "2", **metadata}.items():
+            info.add_text(key, value)
+        image.save(tmp_path / "saved.png", pnginfo=info)
+        (job,) = load_jobs(tmp_path / "saved.png")
+        assert (job.view.half_width, job.view.half_height) == (0.875, pytest.approx(half_height))
+
+    def test_png_without_metadata(self, tmp_path):
+        Image.new("L", (4, 4)).save(tmp_path / "plain.png")
+        with pytest.raises(ValueError, match="no fractal metadata"):
+            load_jobs(tmp_path / "plain.png")
+
+    def test_unsupported_file_type(self, tmp_path):
+        (tmp_path / "jobs.yaml").write_text("fractal: mandelbrot")
+        with pytest.raises(ValueError, match="unsupported"):
+            load_jobs(tmp_path / "jobs.yaml")
+
+
+class TestRunBatch:
+    # Tests for running jobs on the worker pool
+
+    def jobs(self, tmp_path, count):
+        return [
+            JobSpec("mandelbrot", str(tmp_path / f"m{i}.png"), width=24 + i, height=16, max_iter=50)
+            for i in range(count)
+        ]
+
+    @pytest.mark.parametrize("concurrency", [1, 2])
+    def test_renders_every_job(self, tmp_path, concurrency):
+        jobs = self.jobs(tmp_path, 3)
+        seen = []
+        results, summary = run_batch(jobs, concurrency=concurrency, progress=lambda done, result: seen.append(done))
+        assert [result.spec for result in results] == jobs
+        assert all(result.error is None for result in results)
+        assert sorted(seen) == [1, 2, 3]
+        assert (summary.jobs, summary.failed, summary.pixels) == (3, 0, 16 * (24 + 25 + 26))
+        for job in jobs:
+            assert Image.open(job.output).size == (job.width, job.height)
+
+    def test_tiff_jobs_are_rendered_as_posters(self, tmp_path):
+        tiff = JobSpec("julia", str(tmp_path / "j.tif"), center_x=0.0, width=40, height=30, max_iter=60)
+        png = JobSpec("julia", str(tmp_path / "j.png"), center_x=0.0, width=40, height=30, max_iter=60)
+        render_job(tiff)
+        render_job(png)
+        with Image.open(tiff.output) as poster, Image.open(png.output) as image:
+            assert np.array_equal(np.asarray(poster), np.asarray(image))
+            assert "fractal_type=julia" in poster.tag_v2[270]
+
+    def test_antialiased_jobs(self, tmp_path):
+        plain = JobSpec("mandelbrot", str(tmp_path / "plain.png"), width=48, height=32, max_iter=60)
+        smooth = JobSpec("mandelbrot", str(tmp_path / "aa.tif"), width=48, height=32, max_iter=60, antialias=4)
+        render_job(plain)
+        render_job(smooth)
+        with Image.open(plain.output) as first, Image.open(smooth.output) as second:
+            changed = np.asarray(first) != np.asarray(second)
+        assert 0 < changed.mean() < 0.5
+
+    def test_palette_jobs_are_rgb_and_round_trip(self, tmp_path):
+        spec = JobSpec("mandelbrot", str(tmp_path / "m.png"), width=32, height=24, max_iter=60, palette="ultra")
+        render_job(spec)
+        with Image.open(spec.output) as image:
+            assert image.mode == "RGB"
+            assert image.text["palette"] == "ultra"
+        (again,) = load_jobs(spec.output)
+        assert again.palette == "ultra"
+        poster = JobSpec.from_mapping({"fractal": "mandelbrot", "output": str(tmp_path / "m.tif"),
+                                       "size": [32, 24], "max_iter": 60, "colormap": "ultra"})
+        render_job(poster)
+        with Image.open(poster.output) as tiled, Image.open(spec.output) as image:
+            assert np.array_equal(np.asarray(tiled), np.asarray(image))
+
+    def test_equalized_jobs_match_as_posters(self, tmp_path):
+        data = {"fractal": "mandelbrot", "size": [40, 30], "max_iter": 80, "palette": "fire", "equalize": True}
+        spec = JobSpec.from_mapping({**data, "output": str(tmp_path / "e.png")})
+        render_job(spec)
+        with Image.open(spec.output) as image:
+            assert image.text["equalize"] == "true"
+        (again,) = load_jobs(spec.output)
+        assert again.equalize
+        poster = JobSpec.from_mapping({**data, "output": str(tmp_path / "e.tif")})
+        render_job(poster)
+        with Image.open(poster.output) as tiled, Image.open(spec.output) as image:
+            assert np.array_equal(np.asarray(tiled), np.asarray(image))
+
+    def test_failures_are_reported(self, tmp_path):
+        (tmp_path / "taken").write_text("")
+        jobs = [JobSpec("mandelbrot", str(tmp_path / "taken" / "m.png"), width=8, height=8)]
+        results, summary = run_batch(jobs, concurrency=1)
+        assert results[0].error is not None
+        assert (summary.failed, summary.pixels) == (1, 0)
+
+    def test_invalid_concurrency(self, tmp_path):
+        with pytest.raises(ValueError):
+            run_batch(self.jobs(tmp_path, 1), concurrency=0)
+
+
+class TestRenderCommand:
+    # Tests for the fractalzoomer render command
+
+    def test_renders_and_prints_summary(self, tmp_path, capsys):
+        spec = tmp_path / "jobs.json"
+        spec.write_text(json.dumps([{"fractal": "mandelbrot", "size": [16, 12], "max_iter": 40}]))
+        assert main(["render", str(spec), "-o", str(tmp_path), "-j", "1"]) == 0
+        out = capsys.readouterr().out
+        assert "[1/1] mandelbrot 16x12" in out
+        assert "Rendered 1/1 jobs" in out and "Mpixel/s" in out
+        assert (tmp_path / "jobs.png").exists()
+
+    def test_invalid_spec_exits_with_error(self, tmp_path, capsys):
+        spec = tmp_path / "bad.json"
+        spec.write_text(json.dumps({"fractal": "newton"}))
+        assert main(["render", str(spec)]) == 2
+        assert "Unknown fractal type" in capsys.readouterr().err
+
+
+class TestAnimateCommand:
+    # Tests for animation files and the fractalzoomer animate command
+
+    def test_keyframes_inherit_previous_values(self, tmp_path):
+        path = tmp_path / "zoom.toml"
+        path.write_text(
+            'fractal = "julia"\nsize = [20, 10]\nfps = 10\n\n'
+            '[[keyframes]]\nframe = 0\ncenter = [0.0, 0.1]\nmax_iter = 40\nc_real = -0.8\n\n'
+            '[[keyframes]]\nframe = 12\nzoom = 8\n'
+        )
+        spec = load_animation(path, output_dir=tmp_path)
+        assert spec.job.output == str(tmp_path / "zoom.gif")
+        assert (spec.fps, spec.frames) == (10.0, 13)
+        last = spec.keyframes[-1]
+        assert (last.center_y, last.zoom, last.max_iter, last.c_real) == (0.1, 8.0, 40, -0.8)
+
+    @pytest.mark.parametrize("data", [
+        {"fractal": "mandelbrot"},
+        {"fractal": "mandelbrot", "keyframes": [{"frame": 0}, {"zoom": 2}]},
+        {"fractal": "mandelbrot", "keyframes": [{"frame": 0, "speed": 2}]},
+        {"fractal": "mandelbrot", "fps": 0, "keyframes": [{"frame": 0}]},
+    ])
+    def test_invalid_animations(self, data):
+        with pytest.raises(ValueError):
+            AnimationSpec.from_mapping({"output": "a.gif", **data})
+
+    def test_base_view_follows_the_job_aspect(self):
+        spec = AnimationSpec.from_mapping({
+            "fractal": "mandelbrot", "output": "a.gif", "size": [30, 30], "aspect": 0.5, "keyframes": [{"frame": 0}],
+        })
+        view = spec.base_view
+        assert (view.half_width, view.half_height, view.width, view.height) == (1.75, 0.875, 30, 30)
+
+    def test_renders_an_apng(self, tmp_path, capsys):
+        spec = tmp_path / "zoom.json"
+        spec.write_text(json.dumps({
+            "fractal": "mandelbrot", "output": "zoom.png", "size": [24, 16],
+            "keyframes": [{"frame": 0, "max_iter": 30}, {"frame": 5, "zoom": 4, "max_iter": 60}],
+        }))
+        assert main(["animate", str(spec), "-o", str(tmp_path), "-j", "2", "-q"]) == 0
+        assert "Rendered 6 frames of 24x16" in capsys.readouterr().out
+        with Image.open(tmp_path / "zoom.png") as image:
+            assert (image.n_frames, image.size) == (6, (24, 16))
+
+    def test_invalid_file_exits_with_error(self, tmp_path, capsys):
+        spec = tmp_path / "zoom.json"
+        spec.write_text(json.dumps({"fractal": "mandelbrot"}))
+        assert main(["animate", str(spec)]) == 2
+        assert "no keyframes" in capsys.readouterr().err
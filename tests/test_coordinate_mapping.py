@@ -269,4 +269,33 @@ class TestViewport:
     def test_height_property(self):
         # Test height property returns correct value.
         viewport = Viewport(width=640, height=480)
-        assert viewport.height == 480
\ No newline at end of file
+        assert viewport.height == 480
+
+
+class TestViewportDrag:
+    # Test suite for whole-pixel drag tracking.
+
+    def test_whole_pixel_drag_has_no_drift(self):
+        viewport = Viewport(width=W, height=H)
+        viewport.start_drag()
+        assert viewport.drag_to(12, -7) == (12, -7)
+        assert np.all(viewport.drag_drift == 0)
+
+    def test_fractional_drag_keeps_remainder(self):
+        viewport = Viewport(width=W, height=H)
+        viewport.start_drag()
+        assert viewport.drag_to(2.3, -0.4) == (2, 0)
+        assert np.allclose(viewport.drag_drift, [0.3, -0.4])
+
+    def test_drift_is_taken_up_by_later_motion(self):
+        viewport = Viewport(width=W, height=H)
+        viewport.start_drag()
+        viewport.drag_to(0.4, 0.4)
+        assert viewport.drag_to(0.8, 1.2) == (1, 1)
+        assert np.allclose(viewport.drag_drift, [-0.2, 0.2])
+
+    def test_start_drag_resets_drift(self):
+        viewport = Viewport(width=W, height=H)
+        viewport.drag_to(0.3, 0.3)
+        viewport.start_drag()
+        assert np.all(viewport.drag_drift == 0)
@@ -5,6 +5,8 @@ from fractalzoomer.core import (
     MandelbrotSet,
     JuliaSet,
     BurningShipSet,
+    EscapeState,
+    DEFAULT_ESCAPE_RADIUS,
     DEFAULT_JULIA_C_REAL,
     DEFAULT_JULIA_C_IMAG,
 )
@@ -267,4 +269,317 @@ class TestFractalComputationConsistency:
         # Compare results (with tolerance for floating point)
         for single, array_val in zip(single_results, array_results):
             if np.isfinite(single) and np.isfinite(array_val):
-                assert np.isclose(single, array_val, rtol=1e-5)
\ No newline at end of file
+                assert np.isclose(single, array_val, rtol=1e-5)
+
+
+class TestEscapeTimeEarlyExit:
+    # Tests for the bailout-aware active-set iteration in compute_array
+
+    @pytest.fixture
+    def grid(self):
+        x = np.linspace(-2.0, 1.0, 60, dtype=np.float32)
+        y = np.linspace(-1.2, 1.2, 40, dtype=np.float32)
+        X, Y = np.meshgrid(x, y)
+        return (X + 1j * Y).astype(np.complex64)
+
+    @pytest.mark.parametrize("fractal_cls,args", [
+        (MandelbrotSet, {}),
+        (JuliaSet, {"c_real": -0.4, "c_imag": 0.6}),
+        (BurningShipSet, {}),
+    ])
+    def test_no_overflow_warnings(self, fractal_cls, args, grid):
+        # Escaped points stop iterating, so nothing overflows to inf/NaN
+        fractal = fractal_cls(max_iter=200, **args)
+        with np.errstate(all="raise"):
+            result = fractal.compute_array(grid)
+        assert np.all(np.isfinite(result))
+        assert result.dtype == np.complex64
+
+    @pytest.mark.parametrize("fractal_cls,args", [
+        (MandelbrotSet, {}),
+        (JuliaSet, {"c_real": -0.4, "c_imag": 0.6}),
+        (BurningShipSet, {}),
+    ])
+    def test_bounded_points_match_full_iteration(self, fractal_cls, args, grid):
+        # Points that never escape see exactly the same iterations as without bailout
+        fast = fractal_cls(max_iter=50, **args).compute_array(grid)
+        with np.errstate(all="ignore"):
+            full = fractal_cls(max_iter=50, escape_radius=None, **args).compute_array(grid)
+        bounded = np.abs(fast) <= 2.0
+        assert bounded.any()
+        assert np.allclose(fast[bounded], full[bounded])
+
+    def test_escaped_points_exceed_radius(self, grid):
+        m = MandelbrotSet(max_iter=50)
+        result = m.compute_array(grid)
+        # Points that certainly escape (|c| > 2) are frozen just outside the bailout radius
+        outside = np.abs(grid) > 2.0
+        assert np.all(np.abs(result[outside]) > 2.0)
+
+    @pytest.mark.parametrize("fractal_cls", [MandelbrotSet, JuliaSet, BurningShipSet])
+    def test_bailout_is_on_by_default(self, fractal_cls):
+        # The default engines stop a point at its first iterate outside the radius
+        fractal = fractal_cls(max_iter=50)
+        assert fractal.escape_radius == DEFAULT_ESCAPE_RADIUS
+        start = np.array([3.0 + 0.0j], dtype=np.complex64)
+        with np.errstate(all="ignore"):
+            full = fractal_cls(max_iter=50, escape_radius=None).compute_array(start)
+        frozen = fractal.compute_array(start)
+        assert np.all(np.isfinite(frozen)) and 2.0 < abs(frozen[0]) < 100.0
+        assert not np.isfinite(full[0]) or abs(full[0]) > 1e6
+
+    def test_invalid_escape_radius(self):
+        with pytest.raises(ValueError):
+            MandelbrotSet(escape_radius=0.0)
+
+
+class TestIterationCountOutput:
+    # Tests for the counts / smooth output modes of compute_array
+
+    @pytest.mark.parametrize("fractal_cls,args", [
+        (MandelbrotSet, {}),
+        (JuliaSet, {"c_real": -0.4, "c_imag": 0.6}),
+        (BurningShipSet, {}),
+    ])
+    def test_counts_shape_and_dtype(self, fractal_cls, args):
+        fractal = fractal_cls(max_iter=50, **args)
+        points = np.array([[0.0j, 0.5 + 0.5j], [3.0 + 0.0j, -0.1 + 0.1j]], dtype=np.complex64)
+        counts = fractal.compute_array(points, output="counts")
+        assert counts.shape == points.shape
+        assert counts.dtype == np.uint16
+        smooth = fractal.compute_array(points, output="smooth")
+        assert smooth.dtype == np.float32
+
+    def test_counts_dtype_widens_for_large_max_iter(self):
+        m = MandelbrotSet(max_iter=70000)
+        # Points far outside the set escape at the first iteration
+        counts = m.compute_array(np.array([3.0 + 3.0j], dtype=np.complex64), output="counts")
+        assert counts.dtype == np.uint32
+        assert counts[0] == 1
+
+    def test_known_escape_counts(self):
+        m = MandelbrotSet(max_iter=100)
+        # c = 1: z = 1, 2, 5 -> escapes at iteration 3; c = 0 never escapes
+        points = np.array([1.0 + 0.0j, 0.0j, 3.0 + 0.0j], dtype=np.complex64)
+        counts = m.compute_array(points, output="counts")
+        assert list(counts) == [3, 100, 1]
+
+    def test_smooth_counts_are_continuous_within_band(self):
+        m = MandelbrotSet(max_iter=100)
+        points = np.linspace(0.3, 2.0, 200).astype(np.complex64)
+        result = m.compute_escape(points)
+        escaped = result.counts < 100
+        counts = result.counts[escaped].astype(np.float32)
+        smooth = result.smooth[escaped]
+        # The normalized count stays within one iteration of the integer count
+        assert np.all(smooth <= counts + 1.0)
+        assert np.all(smooth > counts - 1.0)
+
+    def test_compute_escape_matches_compute_array(self):
+        j = JuliaSet(c_real=-0.8, c_imag=0.156, max_iter=80)
+        points = np.array([0.1 + 0.2j, 0.9 - 0.4j, 1.5 + 1.5j], dtype=np.complex64)
+        result = j.compute_escape(points)
+        assert np.array_equal(result.z, j.compute_array(points))
+        assert np.array_equal(result.counts, j.compute_array(points, output="counts"))
+
+    def test_invalid_output_mode(self):
+        with pytest.raises(ValueError, match="Unsupported output mode"):
+            MandelbrotSet().compute_array(np.zeros(2, dtype=np.complex64), output="rgb")
+
+    def test_counts_require_escape_radius(self):
+        m = MandelbrotSet(max_iter=10, escape_radius=None)
+        with pytest.raises(ValueError):
+            m.compute_array(np.zeros(2, dtype=np.complex64), output="counts")
+
+
+class TestPrecisionPolicy:
+    # Tests for the float32 / float64 / auto precision policy
+
+    def test_default_precision_is_auto(self):
+        assert MandelbrotSet().precision == "auto"
+
+    def test_invalid_precision(self):
+        with pytest.raises(ValueError, match="Unsupported precision"):
+            JuliaSet(precision="float16")
+
+    @pytest.mark.parametrize("precision,input_dtype,expected", [
+        ("float32", np.complex128, np.complex64),
+        ("float64", np.complex64, np.complex128),
+        ("auto", np.complex64, np.complex64),
+        ("auto", np.complex128, np.complex128),
+    ])
+    def test_working_dtype(self, precision, input_dtype, expected):
+        for fractal in (MandelbrotSet(max_iter=20, precision=precision),
+                        JuliaSet(max_iter=20, precision=precision),
+                        BurningShipSet(max_iter=20, precision=precision)):
+            points = np.array([0.1 + 0.1j, 1.5 - 1.5j], dtype=input_dtype)
+            assert fractal.compute_array(points).dtype == expected
+
+    def test_double_precision_resolves_neighbouring_pixels(self):
+        # Two pixels 1e-9 apart collapse to the same float32 value but not in float64
+        points = np.array([-0.75 + 0.1j, -0.75 + 1e-9 + 0.1j], dtype=np.complex128)
+        single = MandelbrotSet(max_iter=100, precision="float32").compute_array(points, output="z")
+        double = MandelbrotSet(max_iter=100, precision="float64").compute_array(points, output="z")
+        assert single[0] == single[1]
+        assert double[0] != double[1]
+
+
+class TestPrecisionSelection:
+    # Tests for the automatic precision escalation rule
+
+    def test_explicit_policies(self):
+        from fractalzoomer.core.precision import select_precision
+        assert select_precision("float32", 1e-12, 1.0) == np.float32
+        assert select_precision("float64", 1.0, 1.0) == np.float64
+
+    def test_auto_escalates_before_pixels_collapse(self):
+        from fractalzoomer.core.precision import select_precision
+        eps = np.finfo(np.float32).eps
+        assert select_precision("auto", 1e-2, 2.0) == np.float32
+        # Still a few ulps apart, but too close to iterate safely in float32
+        assert select_precision("auto", 4 * eps * 2.0, 2.0) == np.float64
+
+
+class TestMandelbrotInteriorCheck:
+    # Tests for the cardioid / period-2 bulb shortcut
+
+    @pytest.fixture
+    def home_grid(self):
+        x = np.linspace(-2.25, 1.25, 120, dtype=np.float32)
+        y = np.linspace(1.0, -1.0, 80, dtype=np.float32)
+        X, Y = np.meshgrid(x, y)
+        return (X + 1j * Y).astype(np.complex64)
+
+    def test_enabled_by_default(self):
+        assert MandelbrotSet().interior_check is True
+
+    def test_known_points(self):
+        m = MandelbrotSet(max_iter=100)
+        points = np.array([0.0j, -0.1 + 0.2j, -1.0 + 0.0j, -1.1 + 0.1j, 0.3 + 0.0j, -1.3 + 0.0j])
+        mask = m._known_interior(points)
+        # Cardioid, cardioid, bulb center, bulb, outside (0.3 > 1/4), outside bulb
+        assert list(mask) == [True, True, True, True, False, False]
+
+    def test_counts_unchanged(self, home_grid):
+        fast = MandelbrotSet(max_iter=150).compute_array(home_grid, output="smooth")
+        slow = MandelbrotSet(max_iter=150, interior_check=False).compute_array(home_grid, output="smooth")
+        assert np.array_equal(fast, slow)
+
+    def test_z_output_still_iterates_interior(self, home_grid):
+        fast = MandelbrotSet(max_iter=60).compute_array(home_grid, output="z")
+        slow = MandelbrotSet(max_iter=60, interior_check=False).compute_array(home_grid, output="z")
+        assert np.array_equal(fast, slow)
+
+    def test_can_be_disabled(self, home_grid):
+        m = MandelbrotSet(max_iter=10)
+        m.interior_check = False
+        assert m._known_interior(home_grid) is None
+
+
+class TestPeriodicityDetection:
+    # Tests for the optional Brent cycle detection
+
+    @pytest.fixture
+    def rabbit_grid(self):
+        x = np.linspace(-1.6, 1.6, 90, dtype=np.float32)
+        y = np.linspace(1.1, -1.1, 60, dtype=np.float32)
+        X, Y = np.meshgrid(x, y)
+        return (X + 1j * Y).astype(np.complex64)
+
+    def test_disabled_by_default(self):
+        assert MandelbrotSet().periodicity_tol is None
+
+    def test_invalid_tolerance(self):
+        with pytest.raises(ValueError):
+            BurningShipSet(periodicity_tol=0.0)
+
+    @pytest.mark.parametrize("fractal_cls,args", [
+        (MandelbrotSet, {"interior_check": False}),
+        (JuliaSet, {"c_real": -0.123, "c_imag": 0.745}),
+        (BurningShipSet, {}),
+    ])
+    def test_counts_match_full_iteration(self, fractal_cls, args, rabbit_grid):
+        plain = fractal_cls(max_iter=400, **args).compute_array(rabbit_grid, output="counts")
+        cycles = fractal_cls(max_iter=400, periodicity_tol=1e-5, **args).compute_array(rabbit_grid, output="counts")
+        assert np.mean(plain == cycles) > 0.999
+
+    def test_cycle_points_stop_iterating(self):
+        # c = -1 lands on the 2-cycle 0, -1 right away: the orbit is retired at iteration 3
+        from fractalzoomer.core.backends import get_backend
+        z = np.zeros(1, dtype=np.complex64)
+        c = np.full(1, -1.0, dtype=np.complex64)
+        z_out, counts = get_backend("numpy").escape_time("quadratic", z, c, 1000, 2.0, np.dtype(np.uint16), 1e-6)
+        assert counts[0] == 1000
+        assert z_out[0] in (0, -1)
+
+    def test_z_output_is_not_affected(self, rabbit_grid):
+        j = JuliaSet(c_real=-0.123, c_imag=0.745, max_iter=100)
+        expected = j.compute_array(rabbit_grid)
+        j.periodicity_tol = 1e-5
+        assert np.array_equal(j.compute_array(rabbit_grid), expected)
+
+
+class TestResumableState:
+    # Tests for continuing and truncating escape states across iteration limits
+
+    @pytest.fixture
+    def grid(self):
+        x = np.linspace(-2.2, 1.2, 90, dtype=np.float32)
+        y = np.linspace(1.2, -1.2, 60, dtype=np.float32)
+        X, Y = np.meshgrid(x, y)
+        return (X + 1j * Y).astype(np.complex64)
+
+    @pytest.mark.parametrize("fractal_cls,args", [
+        (MandelbrotSet, {}),
+        (JuliaSet, {"c_real": -0.8, "c_imag": 0.156}),
+        (BurningShipSet, {}),
+        (MandelbrotSet, {"periodicity_tol": 1e-5}),
+    ])
+    def test_resumed_state_matches_fresh_computation(self, fractal_cls, args, grid):
+        state = fractal_cls(max_iter=40, **args).compute_state(grid)
+        fractal = fractal_cls(max_iter=300, **args)
+        resumed = fractal.resume(state)
+        assert resumed.iterations == 300
+        for output in ("counts", "smooth"):
+            assert np.array_equal(fractal.from_state(resumed, output), fractal.compute_array(grid, output=output))
+
+    @pytest.mark.parametrize("max_iter", [5, 60, 199, 200])
+    def test_lower_limits_are_derived_from_counts(self, max_iter, grid):
+        state = MandelbrotSet(max_iter=200).compute_state(grid)
+        fractal = MandelbrotSet(max_iter=max_iter)
+        for output in ("counts", "smooth"):
+            expected = fractal.compute_array(grid, output=output)
+            result = fractal.from_state(state, output)
+            assert result.dtype == expected.dtype
+            assert np.array_equal(result, expected)
+
+    def test_only_bounded_points_are_resumed(self, grid):
+        state = MandelbrotSet(max_iter=50).compute_state(grid)
+        assert isinstance(state, EscapeState)
+        assert not np.any(state.escaped & state.active)
+        resumed = MandelbrotSet(max_iter=100).resume(state)
+        # Final points are carried over untouched, and the input state is not modified
+        final = ~state.active
+        assert np.array_equal(resumed.counts[final], state.counts[final])
+        assert np.array_equal(resumed.z[final], state.z[final])
+        assert state.iterations == 50 and np.count_nonzero(resumed.active) <= np.count_nonzero(state.active)
+
+    def test_known_interior_points_are_not_active(self, grid):
+        state = MandelbrotSet(max_iter=20).compute_state(grid)
+        interior = MandelbrotSet()._known_interior(grid)
+        assert not np.any(state.active[interior] | state.escaped[interior])
+
+    def test_resuming_to_fewer_iterations_returns_the_state(self, grid):
+        state = JuliaSet(max_iter=80).compute_state(grid)
+        assert JuliaSet(max_iter=30).resume(state) is state
+
+    def test_higher_limit_than_state_is_rejected(self, grid):
+        state = MandelbrotSet(max_iter=30).compute_state(grid)
+        with pytest.raises(ValueError):
+            MandelbrotSet(max_iter=31).from_state(state)
+        with pytest.raises(ValueError):
+            MandelbrotSet(max_iter=30).from_state(state, output="z")
+
+    def test_requires_escape_radius(self, grid):
+        with pytest.raises(ValueError):
+            MandelbrotSet(escape_radius=None).compute_state(grid)
@@ -4,7 +4,11 @@ import tempfile
 from pathlib import Path
 from PIL import Image
 
+from fractalzoomer.core import MandelbrotSet
+from fractalzoomer.render import ParallelRenderer, View, refine_mask
 from fractalzoomer.utils.exporter import FractalExporter
+from fractalzoomer.utils.palettes import PALETTE_SIZE, PALETTES, ColorMap, get_palette, make_palette
+from fractalzoomer.utils.writers import StripPngWriter, TiledTiffWriter
 
 
 class TestFractalExporter:
@@ -204,4 +208,260 @@ class TestExportMetadata:
             img = exporter.array_to_image(sample_data)
             # Should not raise an error
             exporter.save(img, str(filepath), metadata=metadata)
-            assert filepath.exists()
\ No newline at end of file
+            assert filepath.exists()
+
+    def test_shade_log_scales_counts_and_blacks_out_interior(self, exporter):
+        # Test that smooth counts are log-scaled to 0-255 with bounded points black.
+        smooth = np.array([[0.0, 15.0, 255.0, 255.0]], dtype=np.float32)
+        shaded = exporter.shade(smooth, 255)
+        assert shaded.dtype == np.uint8
+        assert shaded[0, 0] == 0 and shaded[0, 2] == 0
+        assert abs(int(shaded[0, 1]) - np.log1p(15.0) / np.log1p(255) * 255) <= 1
+
+
+class TestColorMap:
+    # Tests for palette lookup tables and colour mapping
+
+    @pytest.fixture
+    def smooth(self):
+        values = np.random.default_rng(7).random((30, 40)).astype(np.float32) * 120
+        values[:5] = 100.0  # Interior rows
+        return values
+
+    def test_palettes_interpolate_their_stops(self):
+        ramp = make_palette("ramp", [(0, 0, 0), (255, 0, 255)])
+        assert ramp.colors.shape == (PALETTE_SIZE, 3)
+        assert tuple(ramp.colors[0]) == (0, 0, 0) and tuple(ramp.colors[-1]) == (255, 0, 255)
+        cycle = make_palette("cycle", [(0, 0, 0), (255, 255, 255)], cyclic=True)
+        # Cyclic palettes blend back into their first colour
+        assert cycle.colors[PALETTE_SIZE // 2, 0] == 255 and cycle.colors[-1, 0] < 4
+        with pytest.raises(ValueError):
+            make_palette("one", [(0, 0, 0)])
+        with pytest.raises(ValueError, match="Unknown palette"):
+            get_palette("plaid")
+
+    def test_grayscale_matches_shade_and_interior_colour(self, smooth):
+        rgb = ColorMap("grayscale", interior=(10, 20, 30)).apply(smooth, 100)
+        assert rgb.shape == (30, 40, 3) and rgb.dtype == np.uint8
+        interior = smooth >= 100
+        assert np.all(rgb[interior] == (10, 20, 30))
+        levels = FractalExporter.shade(smooth, 100)[~interior]
+        assert np.array_equal(rgb[~interior][:, 0], levels)
+
+    def test_gray_levels(self, smooth):
+        gray = ColorMap("grayscale", interior=(40, 40, 40), equalize=True, channels=1)
+        rgb = ColorMap("grayscale", interior=(40, 40, 40), equalize=True)
+        assert gray.apply(smooth, 100).shape == (30, 40)
+        assert np.array_equal(gray.apply(smooth, 100), rgb.apply(smooth, 100)[..., 0])
+        counts = np.floor(smooth).astype(np.uint32)
+        assert np.array_equal(gray.apply(counts, 100), rgb.apply(counts, 100)[..., 0])
+        with pytest.raises(ValueError, match="not gray"):
+            ColorMap("fire", channels=1)
+        with pytest.raises(ValueError, match="gray level"):
+            gray.configure(interior=(255, 0, 0))
+        with pytest.raises(ValueError):
+            ColorMap("grayscale", channels=2)
+
+    def test_output_buffer_is_reused(self, smooth):
+        colormap = ColorMap("fire")
+        out = np.empty((30, 40, 3), dtype=np.uint8)
+        assert colormap.apply(smooth, 100, out=out) is out
+        assert np.array_equal(out, colormap.apply(smooth, 100))
+        with pytest.raises(ValueError):
+            colormap.apply(smooth, 100, out=np.empty((30, 40), dtype=np.uint8))
+
+    def test_integer_counts_match_smooth_counts(self):
+        counts = np.random.default_rng(1).integers(0, 101, (20, 20)).astype(np.uint32)
+        colormap = ColorMap("ultra", offset=0.3, density=4.0)
+        assert np.array_equal(colormap.apply(counts, 100), colormap.apply(counts.astype(np.float32), 100))
+
+    def test_cyclic_offset_and_density(self, smooth):
+        colormap = ColorMap("rainbow")
+        base = colormap.apply(smooth, 100).copy()
+        colormap.configure(offset=1.0)
+        assert np.array_equal(colormap.apply(smooth, 100), base)
+        colormap.configure(offset=0.5)
+        assert not np.array_equal(colormap.apply(smooth, 100), base)
+        # Non-cyclic palettes clamp positions past their end
+        dense = ColorMap("fire", density=10.0).apply(smooth, 100)
+        assert np.all(dense[(smooth > 10) & (smooth < 100)] == PALETTES["fire"].colors[-1])
+        with pytest.raises(ValueError):
+            colormap.configure(density=0.0)
+
+    def test_equalization_spreads_the_palette_over_the_pixels(self):
+        # Counts crowded at the low end: log scaling leaves most of the palette unused
+        smooth = np.random.default_rng(3).exponential(4.0, (64, 64)).astype(np.float32)
+        smooth[:4] = 500.0
+        exterior = smooth < 500
+        colormap = ColorMap("grayscale", equalize=True)
+        levels = colormap.apply(smooth, 500)[..., 0][exterior]
+        assert np.all(colormap.apply(smooth, 500)[~exterior] == 0)
+        quarters = np.histogram(levels, 4, (0, 256))[0] / levels.size
+        assert quarters == pytest.approx([0.25] * 4, abs=0.02)
+        assert np.mean(ColorMap("grayscale").apply(smooth, 500)[..., 0][exterior] >= 128) < 0.01
+        # Integer counts agree with the smooth path at whole counts, with a fixed histogram too
+        counts = np.floor(smooth).astype(np.uint32)
+        assert np.array_equal(colormap.apply(counts, 500), colormap.apply(counts.astype(np.float32), 500))
+        histogram = np.ones(500, dtype=np.int64)
+        fire = ColorMap("fire").equalized(histogram)
+        assert np.array_equal(fire(counts, 500), ColorMap("fire", equalize=True).apply(counts, 500, histogram=histogram))
+        with pytest.raises(ValueError, match="bins"):
+            colormap.apply(counts, 500, histogram=np.ones(10, dtype=np.int64))
+
+    def test_exporter_shares_the_palettes(self, smooth):
+        exporter = FractalExporter()
+        # Grayscale is the explorer's grayscale palette, as single-channel levels
+        gray = exporter.shader("grayscale")
+        assert gray.channels == 1
+        assert np.array_equal(gray(smooth, 100), ColorMap("grayscale").apply(smooth, 100)[..., 0])
+        assert np.array_equal(FractalExporter.shade(smooth, 100), gray(smooth, 100))
+        assert exporter.shader("grayscale", interior=(10, 20, 30)).channels == 3
+        assert exporter.shader("ice").channels == 3
+        assert np.array_equal(exporter.shader("ice")(smooth, 100), ColorMap("ice").apply(smooth, 100))
+        assert set(exporter.get_colormaps()) == set(PALETTES)
+        levels = np.arange(256, dtype=np.uint8).reshape(16, 16)
+        image = exporter.array_to_image(levels, colormap="fire")
+        assert image.mode == "RGB"
+        assert np.asarray(image)[-1, -1].tolist() == PALETTES["fire"].colors[-1].tolist()
+        rgb = ColorMap("classic").apply(smooth, 100)
+        assert np.array_equal(np.asarray(exporter.array_to_image(rgb)), rgb)
+
+
+class TestExportView:
+    # Tests for rendering and exporting a view with anti-aliasing
+
+    def test_antialiasing_only_changes_edge_pixels(self, tmp_path):
+        exporter = FractalExporter()
+        fractal = MandelbrotSet(max_iter=80)
+        view = View(-0.5, 0.0, 1.75, 1.0, 60, 40)
+        exporter.export_view(fractal, view, str(tmp_path / "plain.png"), antialias_samples=1)
+        exporter.export_view(fractal, view, str(tmp_path / "aa.png"), metadata={"zoom": 1})
+        with Image.open(tmp_path / "plain.png") as plain, Image.open(tmp_path / "aa.png") as smoothed:
+            changed = np.asarray(plain) != np.asarray(smoothed)
+            assert smoothed.info["zoom"] == "1"
+        with ParallelRenderer() as renderer:
+            smooth = renderer.render(fractal, view, output="smooth")
+        assert changed.any()
+        assert not (changed & ~refine_mask(smooth, 80)).any()
+
+
+class TestAnimationWriters:
+    # Tests for the streaming animation writers
+
+    @pytest.fixture
+    def exporter(self):
+        return FractalExporter()
+
+    def frames(self, channels=None):
+        rng = np.random.default_rng(3)
+        shape = (12, 16) if channels is None else (12, 16, channels)
+        return [rng.integers(0, 256, shape, dtype=np.uint8) for _ in range(4)]
+
+    @pytest.mark.parametrize("channels", [None, 3])
+    def test_apng_round_trips_every_frame(self, exporter, tmp_path, channels):
+        frames = self.frames(channels)
+        with exporter.open_animation(str(tmp_path / "anim.png"), duration=50) as writer:
+            for frame in frames:
+                writer.add_frame(frame)
+        with Image.open(tmp_path / "anim.png") as image:
+            assert image.n_frames == len(frames)
+            for index, frame in enumerate(frames):
+                image.seek(index)
+                assert np.array_equal(np.asarray(image.convert(image.mode)), frame)
+                assert image.info["duration"] == 50
+
+    def test_gif_keeps_every_frame(self, exporter, tmp_path):
+        frames = self.frames()
+        with exporter.open_animation(str(tmp_path / "anim.gif"), duration=100, loop=2) as writer:
+            for frame in frames:
+                writer.add_frame(frame)
+        with Image.open(tmp_path / "anim.gif") as image:
+            assert image.n_frames == len(frames)
+            assert image.info["loop"] == 2
+            for index, frame in enumerate(frames):
+                image.seek(index)
+                assert image.info["duration"] == 100
+                assert np.array_equal(np.asarray(image.convert("L")), frame)
+
+    def test_numbered_images(self, exporter, tmp_path):
+        frames = self.frames()
+        with exporter.open_animation(str(tmp_path / "frames" / "{:03d}.png"), metadata={"zoom": 2}) as writer:
+            for frame in frames:
+                writer.add_frame(frame)
+        assert sorted(path.name for path in (tmp_path / "frames").iterdir()) == ["000.png", "001.png", "002.png", "003.png"]
+        with Image.open(tmp_path / "frames" / "002.png") as image:
+            assert np.array_equal(np.asarray(image), frames[2])
+            assert image.info["zoom"] == "2"
+
+    def test_frame_size_must_not_change(self, exporter, tmp_path):
+        with exporter.open_animation(str(tmp_path / "anim.png")) as writer:
+            writer.add_frame(np.zeros((4, 4), dtype=np.uint8))
+            with pytest.raises(ValueError):
+                writer.add_frame(np.zeros((4, 5), dtype=np.uint8))
+
+    def test_unsupported_format(self, exporter, tmp_path):
+        with pytest.raises(ValueError):
+            exporter.open_animation(str(tmp_path / "anim.mp4"))
+
+
+class TestPosterWriters:
+    # Tests for the tile-by-tile TIFF and PNG writers
+
+    @pytest.fixture
+    def exporter(self):
+        return FractalExporter()
+
+    def image(self, channels=None):
+        shape = (70, 100) if channels is None else (70, 100, 3)
+        return np.random.default_rng(5).integers(0, 256, shape, dtype=np.uint8)
+
+    def tiles(self, size):
+        return [(top, left) for top in range(0, 70, size) for left in range(0, 100, size)]
+
+    @pytest.mark.parametrize("channels", [None, 3])
+    @pytest.mark.parametrize("bigtiff", [False, True])
+    def test_tiff_tiles_in_any_order(self, tmp_path, channels, bigtiff):
+        image = self.image(channels)
+        path = tmp_path / "poster.tif"
+        with TiledTiffWriter(path, 100, 70, 3 if channels else 1, tile_size=32, bigtiff=bigtiff) as writer:
+            for top, left in reversed(self.tiles(32)):
+                writer.write_tile(top, left, image[top:top + 32, left:left + 32])
+        with Image.open(path) as loaded:
+            assert np.array_equal(np.asarray(loaded), image)
+        assert path.read_bytes()[:4] == (b"II+\0" if bigtiff else b"II*\0")
+
+    def test_tiff_metadata_and_tile_grid(self, exporter, tmp_path):
+        with exporter.open_poster(str(tmp_path / "poster.tiff"), 40, 20, tile_size=16, metadata={"zoom": 2}) as writer:
+            with pytest.raises(ValueError):
+                writer.write_tile(8, 0, np.zeros((16, 16), dtype=np.uint8))
+            for top, left in [(0, 0), (0, 16), (0, 32), (16, 0), (16, 16), (16, 32)]:
+                writer.write_tile(top, left, np.full((min(16, 20 - top), min(16, 40 - left)), 9, dtype=np.uint8))
+        with Image.open(tmp_path / "poster.tiff") as loaded:
+            assert loaded.size == (40, 20)
+            assert loaded.tag_v2[270] == "zoom=2"
+            assert np.all(np.asarray(loaded) == 9)
+
+    @pytest.mark.parametrize("channels", [None, 3])
+    def test_png_bands(self, exporter, tmp_path, channels):
+        image = self.image(channels)
+        with exporter.open_poster(str(tmp_path / "poster.png"), 100, 70, 3 if channels else 1, metadata={"zoom": 4}) as writer:
+            for top, left in self.tiles(32):
+                writer.write_tile(top, left, image[top:top + 32, left:left + 32])
+        with Image.open(tmp_path / "poster.png") as loaded:
+            assert np.array_equal(np.asarray(loaded), image)
+            assert loaded.text == {"zoom": "4"}
+
+    def test_png_tiles_must_arrive_in_row_order(self, tmp_path):
+        with pytest.raises(ValueError):
+            with StripPngWriter(tmp_path / "poster.png", 100, 70) as writer:
+                writer.write_tile(0, 32, np.zeros((32, 32), dtype=np.uint8))
+
+    def test_incomplete_images_are_reported(self, tmp_path):
+        writer = TiledTiffWriter(tmp_path / "poster.tif", 100, 70, tile_size=32)
+        writer.write_tile(0, 0, np.zeros((32, 32), dtype=np.uint8))
+        with pytest.raises(ValueError, match="not written"):
+            writer.close()
+
+    def test_unsupported_format(self, exporter, tmp_path):
+        with pytest.raises(ValueError):
+            exporter.open_poster(str(tmp_path / "poster.jpg"), 10, 10)
@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+from decimal import Decimal, localcontext
+from fractalzoomer.core import MandelbrotSet
+from fractalzoomer.core.perturbation import digits_for_scale, reference_orbit
+from fractalzoomer.render import View
+
+
+def decimal_escape_count(cx: str, cy: str, offset: complex, max_iter: int) -> int:
+    # Direct arbitrary precision iteration of a single pixel, used as ground truth
+    with localcontext() as ctx:
+        ctx.prec = 90
+        cr = Decimal(cx) + Decimal(offset.real)
+        ci = Decimal(cy) + Decimal(offset.imag)
+        zr = zi = Decimal(0)
+        for n in range(1, max_iter + 1):
+            zr, zi = zr * zr - zi * zi + cr, 2 * zr * zi + ci
+            if zr * zr + zi * zi > 4:
+                return n
+    return max_iter
+
+
+class TestReferenceOrbit:
+    # Tests for the arbitrary precision reference orbit
+
+    def test_bounded_reference_has_full_length(self):
+        orbit = reference_orbit("0", "0", 50, 2.0, 30)
+        assert orbit.shape == (51,)
+        assert np.all(orbit == 0)
+
+    def test_escaping_reference_stops_early(self):
+        orbit = reference_orbit("1", "0", 50, 2.0, 30)
+        # c = 1: 0, 1, 2, 5
+        assert np.allclose(orbit, [0, 1, 2, 5])
+
+    def test_digits_grow_with_zoom(self):
+        assert digits_for_scale(1e-50) > digits_for_scale(1e-10) >= 30
+
+
+class TestDeepZoom:
+    # Tests for MandelbrotSet.compute_deep
+
+    def test_matches_array_engine_on_shallow_view(self):
+        m = MandelbrotSet(max_iter=200)
+        # The reference point escapes after a few iterations, so pixels must rebase
+        view = View(0.5, 0.5, 0.6, 0.4, width=60, height=40)
+        deep = m.compute_deep("0.5", "0.5", view.offsets())
+        direct = m.compute_array(view.grid(), output="counts")
+        assert deep.dtype == direct.dtype
+        assert np.mean(deep == direct) > 0.99
+
+    @pytest.mark.parametrize("half_width", [1e-20, 1e-50])
+    def test_deep_view_matches_arbitrary_precision(self, half_width):
+        # Around the Misiurewicz point c = i the boundary has structure at every scale
+        m = MandelbrotSet(max_iter=1000)
+        view = View(0.0, 1.0, half_width, half_width, width=24, height=24)
+        offsets = view.offsets()
+        counts = m.compute_deep("0", "1", offsets)
+        assert np.unique(counts).size > 5
+        for i, j in [(0, 0), (5, 17), (12, 12), (23, 3), (20, 20)]:
+            assert counts[i, j] == decimal_escape_count("0", "1", complex(offsets[i, j]), 1000)
+
+    def test_output_modes(self):
+        m = MandelbrotSet(max_iter=100)
+        offsets = View(0.0, 0.0, 1e-3, 1e-3, width=8, height=8).offsets()
+        result = m.compute_deep_escape("-0.75", "0.1", offsets)
+        assert np.array_equal(m.compute_deep("-0.75", "0.1", offsets, output="smooth"), result.smooth)
+        assert result.z.dtype == np.complex64
+        with pytest.raises(ValueError):
+            m.compute_deep("-0.75", "0.1", offsets, output="rgb")
@@ -0,0 +1,876 @@
+import os
+import threading
+import pytest
+import numpy as np
+from fractalzoomer.core import MandelbrotSet, JuliaSet, BurningShipSet
+from fractalzoomer.render.antialias import local_variance, supersample
+from fractalzoomer.render.disk_cache import tile_filename
+from fractalzoomer.render import (
+    ParallelRenderer, ProcessRenderer, ProgressiveRenderer, RenderScheduler, SubdivisionRenderer, View,
+    count_edges, exposed_blocks, render_translated, reproject_frame, reprojection_priority, row_bands,
+    translate_frame, DiskTileCache, ResumableRenderer, TileCache, TiledRenderer, resumable_key,
+    AnimationRenderer, Keyframe, interpolate_keyframes, resample_frame, PosterRenderer, poster_tiles,
+    antialias, refine_mask, cumulative_distribution, iteration_histogram,
+)
+from fractalzoomer.utils.exporter import FractalExporter
+from fractalzoomer.utils.palettes import ColorMap
+
+
+@pytest.fixture
+def view():
+    return View(-0.5, 0.0, 1.75, 1.0, width=90, height=53)
+
+
+@pytest.fixture
+def renderer():
+    with ParallelRenderer(workers=3, band_height=8) as r:
+        yield r
+
+
+class TestView:
+    # Tests for the View grid helper
+
+    def test_grid_shape_and_corners(self, view):
+        grid = view.grid()
+        assert grid.shape == (53, 90)
+        assert grid.dtype == np.complex64
+        assert np.isclose(grid[0, 0], complex(-2.25, 1.0))
+        assert np.isclose(grid[-1, -1], complex(1.25, -1.0))
+
+    def test_grid_block_matches_full_grid(self, view):
+        full = view.grid()
+        block = view.grid(rows=slice(10, 20), cols=slice(5, 40))
+        assert np.array_equal(block, full[10:20, 5:40])
+
+    def test_points_match_grid(self, view):
+        rows = np.array([0, 7, 52, 30])
+        cols = np.array([89, 0, 3, 45])
+        assert np.array_equal(view.points(rows, cols), view.grid()[rows, cols])
+
+
+class TestParallelRenderer:
+    # Tests for the threaded row-band renderer
+
+    def test_row_bands_cover_all_rows(self):
+        bands = row_bands(53, 8)
+        assert bands[0] == slice(0, 8)
+        assert bands[-1] == slice(48, 53)
+        assert sum(b.stop - b.start for b in bands) == 53
+
+    @pytest.mark.parametrize("fractal", [
+        MandelbrotSet(max_iter=60),
+        JuliaSet(c_real=-0.8, c_imag=0.156, max_iter=60),
+        BurningShipSet(max_iter=60),
+    ])
+    @pytest.mark.parametrize("output", ["counts", "smooth", "z"])
+    def test_matches_single_pass(self, renderer, view, fractal, output):
+        expected = fractal.compute_array(view.grid(), output=output)
+        result = renderer.render(fractal, view, output=output)
+        assert result.dtype == expected.dtype
+        assert np.array_equal(result, expected)
+
+    def test_writes_into_preallocated_buffer(self, renderer, view):
+        m = MandelbrotSet(max_iter=40)
+        out = np.zeros(view.shape, dtype=np.uint16)
+        result = renderer.render(m, view, out=out)
+        assert result is out
+        assert out.max() == 40
+
+    def test_rejects_mismatched_buffer(self, renderer, view):
+        with pytest.raises(ValueError):
+            renderer.render(MandelbrotSet(), view, out=np.zeros((2, 2), dtype=np.uint16))
+
+    def test_invalid_band_height(self):
+        with pytest.raises(ValueError):
+            ParallelRenderer(band_height=0)
+
+
+@pytest.fixture(scope="module")
+def process_renderer():
+    # Worker processes are expensive to start, share them across the tests
+    with ProcessRenderer(workers=2, band_height=8) as r:
+        yield r
+
+
+class TestProcessRenderer:
+    # Tests for the shared-memory process-pool renderer
+
+    @pytest.mark.parametrize("output", ["counts", "smooth"])
+    def test_matches_single_pass(self, process_renderer, view, output):
+        j = JuliaSet(c_real=-0.8, c_imag=0.156, max_iter=60)
+        expected = j.compute_array(view.grid(), output=output)
+        assert np.array_equal(process_renderer.render(j, view, output=output), expected)
+
+    def test_workers_stay_warm_across_frames(self, process_renderer, view):
+        m = MandelbrotSet(max_iter=30)
+        first = process_renderer.render(m, view)
+        # Parameters changed between frames reach the workers
+        m.set_parameters(max_iter=60)
+        second = process_renderer.render(m, view)
+        assert first.max() == 30
+        assert second.max() == 60
+        # A larger frame grows the shared block
+        big = View(-0.5, 0.0, 1.75, 1.0, width=120, height=80)
+        assert np.array_equal(process_renderer.render(m, big), m.compute_array(big.grid(), output="counts"))
+
+    def test_worker_errors_are_reported(self, process_renderer, view):
+        with pytest.raises(RuntimeError, match="Render worker failed"):
+            process_renderer.render(MandelbrotSet(max_iter=10, escape_radius=None), view, output="counts")
+        # The pool remains usable afterwards
+        assert process_renderer.render(MandelbrotSet(max_iter=10), view).max() == 10
+
+
+class TestRenderPrecision:
+    # The renderers pick the grid precision from the pixel spacing
+
+    def test_shallow_view_stays_single_precision(self, view):
+        assert view.coordinate_dtype("auto") == np.complex64
+
+    def test_medium_zoom_switches_to_double_precision(self, renderer):
+        deep = View(-0.7436438870, 0.1318259042, 1e-6, 6e-7, width=40, height=30)
+        assert deep.coordinate_dtype("auto") == np.complex128
+        z = renderer.render(MandelbrotSet(max_iter=500), deep, output="z")
+        assert z.dtype == np.complex128
+        # In single precision neighbouring pixels collapse onto identical orbits
+        blocky = renderer.render(MandelbrotSet(max_iter=500, precision="float32"), deep, output="z")
+        assert np.unique(z).size == z.size
+        assert np.unique(blocky).size < blocky.size
+
+    def test_explicit_single_precision_is_respected(self, renderer):
+        deep = View(-0.7436438870, 0.1318259042, 1e-6, 6e-7, width=40, height=30)
+        m = MandelbrotSet(max_iter=50, precision="float32")
+        assert renderer.render(m, deep, output="z").dtype == np.complex64
+
+
+class TestSubdivisionRenderer:
+    # Tests for the Mariani-Silver subdivision renderer
+
+    @pytest.mark.parametrize("fractal", [MandelbrotSet(max_iter=200), JuliaSet(max_iter=200), BurningShipSet(max_iter=200)])
+    def test_strict_mode_matches_full_evaluation(self, view, fractal):
+        renderer = SubdivisionRenderer(strict=True)
+        expected = fractal.compute_array(view.grid(), output="counts")
+        assert np.array_equal(renderer.render(fractal, view), expected)
+        assert renderer.stats.evaluated == view.width * view.height
+
+    @pytest.mark.parametrize("output", ["counts", "smooth"])
+    def test_evaluates_fewer_pixels(self, output):
+        view = View(-0.5, 0.0, 1.75, 1.0, width=300, height=200)
+        fractal = MandelbrotSet(max_iter=200)
+        renderer = SubdivisionRenderer()
+        result = renderer.render(fractal, view, output=output)
+        expected = fractal.compute_array(view.grid(), output=output)
+        assert np.mean(result == expected) > 0.999
+        assert renderer.stats.evaluated + renderer.stats.filled == view.width * view.height
+        assert renderer.stats.evaluated < view.width * view.height * 0.9
+
+    def test_smooth_output_only_fills_interior(self, view):
+        fractal = MandelbrotSet(max_iter=200)
+        renderer = SubdivisionRenderer(strict=True)
+        renderer.render(fractal, view, output="smooth")
+        assert renderer.stats.filled > 0
+        assert renderer.stats.mismatched == 0
+
+    @pytest.mark.parametrize("width, height", [(1, 1), (5, 1), (1, 5), (2, 2), (7, 2)])
+    def test_thin_views(self, width, height):
+        view = View(-0.5, 0.0, 1.75, 1.0, width=width, height=height)
+        fractal = MandelbrotSet(max_iter=100)
+        expected = fractal.compute_array(view.grid(), output="counts")
+        assert np.array_equal(SubdivisionRenderer().render(fractal, view), expected)
+
+    def test_rejects_z_output(self, view):
+        with pytest.raises(ValueError):
+            SubdivisionRenderer().render(MandelbrotSet(), view, output="z")
+
+    def test_invalid_min_size(self):
+        with pytest.raises(ValueError):
+            SubdivisionRenderer(min_size=0)
+
+
+class TestProgressiveRenderer:
+    # Tests for the coarse-to-fine progressive renderer
+
+    @pytest.fixture
+    def progressive(self):
+        with ProgressiveRenderer(workers=2) as r:
+            yield r
+
+    def test_final_pass_matches_single_pass(self, progressive, view):
+        fractal = JuliaSet(max_iter=100)
+        passes = list(progressive.passes(fractal, view))
+        assert [result.step for result in passes] == [8, 4, 2, 1]
+        expected = fractal.compute_array(view.grid(), output="smooth")
+        assert np.array_equal(passes[-1].frame, expected)
+
+    def test_previews_repeat_lattice_samples(self, progressive, view):
+        fractal = MandelbrotSet(max_iter=100)
+        expected = fractal.compute_array(view.grid(), output="counts")
+        for result in progressive.passes(fractal, view, output="counts"):
+            assert result.frame.shape == view.shape
+            step = result.step
+            samples = np.repeat(np.repeat(expected[::step, ::step], step, axis=0), step, axis=1)
+            assert np.array_equal(result.frame, samples[:view.height, :view.width])
+
+    def test_samples_are_computed_once(self, progressive, view):
+        fractal = MandelbrotSet(max_iter=50)
+        evaluated = []
+        compute_array = fractal.compute_array
+        fractal.compute_array = lambda points, **kwargs: evaluated.append(points.size) or compute_array(points, **kwargs)
+        progressive.render(fractal, view, output="counts")
+        assert sum(evaluated) == view.width * view.height
+
+    def test_cancelled_render_stops(self, progressive, view):
+        cancel = threading.Event()
+        cancel.set()
+        assert list(progressive.passes(MandelbrotSet(), view, cancel=cancel)) == []
+
+    @pytest.mark.parametrize("steps", [(), (8, 4), (4, 3, 1), (2, 4, 1)])
+    def test_invalid_steps(self, steps):
+        with pytest.raises(ValueError):
+            ProgressiveRenderer(steps=steps)
+
+
+class TestRenderScheduler:
+    # Tests for the background render scheduler
+
+    @pytest.fixture
+    def delivered(self):
+        return []
+
+    @pytest.fixture
+    def scheduler(self, delivered):
+        with RenderScheduler(lambda generation, result: delivered.append((generation, result))) as s:
+            yield s
+
+    def test_delivers_every_result(self, scheduler, delivered):
+        generation = scheduler.submit(lambda cancel: iter([1, 2, 3]))
+        assert scheduler.wait(timeout=5)
+        assert delivered == [(generation, 1), (generation, 2), (generation, 3)]
+
+    def test_newer_request_cancels_running_job(self, scheduler, delivered):
+        started = threading.Event()
+
+        def slow_job(cancel):
+            yield "first"
+            started.set()
+            cancel.wait(timeout=5)
+            yield "stale"
+
+        first = scheduler.submit(slow_job)
+        assert started.wait(timeout=5)
+        second = scheduler.submit(lambda cancel: iter(["newest"]))
+        assert scheduler.wait(timeout=5)
+        assert delivered == [(first, "first"), (second, "newest")]
+
+    def test_pending_requests_are_coalesced(self, scheduler, delivered):
+        release = threading.Event()
+        started = threading.Event()
+        runs = []
+
+        def job(name):
+            def run(cancel):
+                runs.append(name)
+                started.set()
+                release.wait(timeout=5)
+                yield name
+            return run
+
+        scheduler.submit(job("a"))
+        assert started.wait(timeout=5)
+        for name in "bcd":
+            scheduler.submit(job(name))
+        release.set()
+        assert scheduler.wait(timeout=5)
+        assert runs == ["a", "d"]
+        assert [result for _, result in delivered] == ["d"]
+
+    def test_failing_job_keeps_thread_alive(self, scheduler, delivered, capsys):
+        def broken(cancel):
+            raise RuntimeError("boom")
+            yield
+
+        scheduler.submit(broken)
+        assert scheduler.wait(timeout=5)
+        generation = scheduler.submit(lambda cancel: iter(["ok"]))
+        assert scheduler.wait(timeout=5)
+        assert delivered == [(generation, "ok")]
+        assert "boom" in capsys.readouterr().err
+
+    def test_submit_after_close(self, delivered):
+        scheduler = RenderScheduler(lambda generation, result: None)
+        scheduler.close()
+        with pytest.raises(RuntimeError):
+            scheduler.submit(lambda cancel: iter([]))
+
+
+class TestIncrementalPan:
+    # Tests for whole-pixel pan rendering
+
+    def test_translated_view_round_trips_pixel_offset(self, view):
+        assert view.pixel_offset(view.translated(5, -3)) == (5, -3)
+        assert view.pixel_offset(view.translated(0, 0)) == (0, 0)
+
+    def test_pixel_offset_rejects_other_views(self, view):
+        half_pixel = View(view.center_x + view.column_step / 2, view.center_y, view.half_width, view.half_height,
+                          view.width, view.height)
+        zoomed = View(view.center_x, view.center_y, view.half_width * 0.9, view.half_height * 0.9,
+                      view.width, view.height)
+        assert view.pixel_offset(half_pixel) is None
+        assert view.pixel_offset(zoomed) is None
+
+    def test_translated_grid_matches_shifted_grid(self, view):
+        moved = view.translated(4, 2)
+        assert np.array_equal(moved.grid()[:-2, :-4], view.grid()[2:, 4:])
+
+    @pytest.mark.parametrize("cols,rows", [(7, 0), (0, -5), (-12, 9), (3, 3)])
+    def test_exposed_blocks_cover_missing_pixels(self, cols, rows):
+        covered = translate_frame(np.ones((20, 30), dtype=np.int32), cols, rows, out=np.zeros((20, 30), dtype=np.int32))
+        for block_rows, block_cols in exposed_blocks((20, 30), cols, rows):
+            covered[block_rows, block_cols] += 1
+        assert np.all(covered == 1)
+
+    @pytest.mark.parametrize("cols,rows", [(6, 0), (-9, 4), (0, -7), (200, 1)])
+    def test_matches_full_render(self, view, cols, rows):
+        fractal = MandelbrotSet(max_iter=100)
+        dtype = view.coordinate_dtype()
+        base = fractal.compute_array(view.grid(dtype=dtype), output="counts")
+        moved = view.translated(cols, rows)
+        result = render_translated(fractal, view, base, moved, output="counts")
+        expected = fractal.compute_array(moved.grid(dtype=dtype), output="counts")
+        assert np.array_equal(result, expected)
+
+    def test_only_exposed_pixels_are_computed(self, view):
+        fractal = MandelbrotSet(max_iter=50)
+        base = fractal.compute_array(view.grid(), output="counts")
+        evaluated = []
+        compute_array = fractal.compute_array
+        fractal.compute_array = lambda points, **kwargs: evaluated.append(points.size) or compute_array(points, **kwargs)
+        render_translated(fractal, view, base, view.translated(3, -2), output="counts")
+        assert sum(evaluated) == 3 * view.height + 2 * (view.width - 3)
+
+    def test_non_translation_returns_none(self, view):
+        fractal = MandelbrotSet(max_iter=50)
+        base = np.zeros(view.shape, dtype=np.uint16)
+        zoomed = View(view.center_x, view.center_y, view.half_width / 2, view.half_height / 2, view.width, view.height)
+        assert render_translated(fractal, view, base, zoomed) is None
+
+
+class TestZoomReprojection:
+    # Tests for reprojecting a previous frame into a zoomed view
+
+    def test_same_view_reprojects_exactly(self, view):
+        frame = np.arange(view.width * view.height, dtype=np.float32).reshape(view.shape)
+        preview, src_rows, src_cols = reproject_frame(view, frame, view)
+        assert np.array_equal(preview, frame)
+        assert np.all(src_rows >= 0) and np.all(src_cols >= 0)
+
+    def test_zoom_out_leaves_border_without_source(self, view):
+        frame = np.zeros(view.shape, dtype=np.uint16)
+        wider = View(view.center_x, view.center_y, view.half_width * 2, view.half_height * 2, view.width, view.height)
+        _, src_rows, src_cols = reproject_frame(view, frame, wider)
+        priority = reprojection_priority(frame, src_rows, src_cols)
+        assert priority[0].all() and priority[:, -1].all()
+        assert not priority[view.height // 2, view.width // 2]
+
+    def test_count_edges(self):
+        frame = np.array([[1.2, 1.7, 2.1], [1.5, 1.1, 1.9]], dtype=np.float32)
+        assert np.array_equal(count_edges(frame), [[False, True, True], [False, False, True]])
+
+    def test_refine_priority_pass_then_exact_frame(self, view):
+        fractal = MandelbrotSet(max_iter=100)
+        base = fractal.compute_array(view.grid(), output="smooth")
+        zoomed = View(view.center_x + 0.1, view.center_y, view.half_width * 0.9, view.half_height * 0.9,
+                      view.width, view.height)
+        preview, src_rows, src_cols = reproject_frame(view, base, zoomed)
+        priority = reprojection_priority(base, src_rows, src_cols)
+        expected = fractal.compute_array(zoomed.grid(), output="smooth")
+        with ProgressiveRenderer(workers=2) as renderer:
+            first, final = renderer.refine(fractal, zoomed, preview, priority)
+        assert np.array_equal(first[priority], expected[priority])
+        assert np.array_equal(first[~priority], preview[~priority])
+        assert np.array_equal(final, expected)
+
+
+class TestTileCache:
+    # Tests for the in-memory LRU tile cache
+
+    def key(self, col):
+        return (("MandelbrotSet",), "<c8", "counts", None, 4, 0, col)
+
+    def test_hit_and_miss_statistics(self):
+        cache = TileCache()
+        assert cache.get(self.key(0)) is None
+        cache.put(self.key(0), np.ones((4, 4), dtype=np.uint16))
+        assert np.array_equal(cache.get(self.key(0)), np.ones((4, 4)))
+        stats = cache.stats
+        assert (stats.hits, stats.misses, stats.tiles, stats.nbytes) == (1, 1, 1, 32)
+
+    def test_tiles_are_read_only_copies(self):
+        cache = TileCache()
+        tile = np.zeros((4, 4), dtype=np.uint16)
+        cache.put(self.key(0), tile)
+        tile[0, 0] = 7
+        cached = cache.get(self.key(0))
+        assert cached[0, 0] == 0
+        with pytest.raises(ValueError):
+            cached[0, 0] = 1
+
+    def test_evicts_least_recently_used_beyond_budget(self):
+        cache = TileCache(max_bytes=96)
+        for col in range(3):
+            cache.put(self.key(col), np.zeros((4, 4), dtype=np.uint16))
+        cache.get(self.key(0))
+        cache.put(self.key(3), np.zeros((4, 4), dtype=np.uint16))
+        assert self.key(0) in cache and self.key(1) not in cache
+        assert cache.stats.evictions == 1
+        assert cache.stats.nbytes <= 96
+
+    def test_invalid_budget(self):
+        with pytest.raises(ValueError):
+            TileCache(max_bytes=0)
+
+
+class TestDiskTileCache:
+    # Tests for the persistent on-disk tile cache
+
+    def key(self, col):
+        return (("MandelbrotSet",), "<c8", "counts", None, 4, 0, col)
+
+    def tile(self, value=0):
+        return np.full((4, 4), value, dtype=np.uint16)
+
+    def test_round_trip_is_memory_mapped(self, tmp_path):
+        cache = DiskTileCache(tmp_path)
+        assert cache.get(self.key(0)) is None
+        cache.put(self.key(0), self.tile(3))
+        tile = cache.get(self.key(0))
+        assert isinstance(tile, np.memmap)
+        assert np.array_equal(tile, self.tile(3))
+        with pytest.raises(ValueError):
+            tile[0, 0] = 1
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.tiles) == (1, 1, 1)
+
+    def test_tiles_persist_across_instances(self, tmp_path):
+        DiskTileCache(tmp_path).put(self.key(0), self.tile(5))
+        reopened = DiskTileCache(tmp_path)
+        assert self.key(0) in reopened
+        assert np.array_equal(reopened.get(self.key(0)), self.tile(5))
+
+    def test_evicts_least_recently_used_beyond_budget(self, tmp_path):
+        probe = DiskTileCache(tmp_path / "probe")
+        probe.put(self.key(0), self.tile())
+        tile_bytes = probe.stats.nbytes
+        cache = DiskTileCache(tmp_path / "cache", max_bytes=3 * tile_bytes)
+        for col in range(3):
+            cache.put(self.key(col), self.tile())
+        for col, age in zip(range(3), (30, 20, 10)):
+            # Make the last-use times distinct regardless of the filesystem's resolution
+            path = cache.directory / tile_filename(self.key(col))
+            stamp = path.stat().st_mtime - age
+            os.utime(path, (stamp, stamp))
+        cache.get(self.key(0))
+        cache.put(self.key(3), self.tile())
+        assert self.key(0) in cache and self.key(1) not in cache
+        stats = cache.stats
+        assert (stats.evictions, stats.tiles) == (1, 3)
+        assert stats.nbytes <= 3 * tile_bytes
+        assert len(list(cache.directory.glob("*.npy"))) == 3
+
+    def test_concurrent_writers_keep_index_consistent(self, tmp_path):
+        caches = [DiskTileCache(tmp_path) for _ in range(4)]
+        threads = [
+            threading.Thread(target=lambda c=cache, i=i: [c.put(self.key(i * 10 + col), self.tile(col)) for col in range(10)])
+            for i, cache in enumerate(caches)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert DiskTileCache(tmp_path).stats.tiles == 40
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_backs_a_memory_cache(self, tmp_path):
+        TileCache(disk=DiskTileCache(tmp_path)).put(self.key(0), self.tile(2))
+        cache = TileCache(disk=DiskTileCache(tmp_path))
+        assert np.array_equal(cache.get(self.key(0)), self.tile(2))
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.tiles) == (1, 0, 1)
+
+    def test_restarted_renderer_computes_nothing(self, tmp_path, view):
+        fractal = JuliaSet(max_iter=100)
+        with TiledRenderer(TileCache(disk=DiskTileCache(tmp_path)), tile_size=16) as tiled:
+            first = tiled.render(fractal, view)
+        with TiledRenderer(TileCache(disk=DiskTileCache(tmp_path)), tile_size=16) as tiled:
+            assert np.array_equal(tiled.lookup(fractal, view), first)
+            assert tiled.cache.stats.misses == 0
+
+    def test_invalid_budget(self, tmp_path):
+        with pytest.raises(ValueError):
+            DiskTileCache(tmp_path, max_bytes=0)
+
+
+class TestTiledRenderer:
+    # Tests for rendering views from cached tiles
+
+    @pytest.fixture
+    def tiled(self):
+        with TiledRenderer(tile_size=16, workers=2) as r:
+            yield r
+
+    @pytest.mark.parametrize("output", ["counts", "smooth"])
+    def test_matches_single_pass(self, tiled, view, output):
+        fractal = JuliaSet(max_iter=100)
+        assert np.array_equal(tiled.render(fractal, view, output=output), fractal.compute_array(view.grid(), output=output))
+
+    def test_second_render_is_served_from_cache(self, tiled, view):
+        fractal = MandelbrotSet(max_iter=100)
+        first = tiled.render(fractal, view)
+        misses = tiled.cache.stats.misses
+        assert np.array_equal(tiled.lookup(fractal, view), first)
+        assert np.array_equal(tiled.render(fractal, view), first)
+        assert tiled.cache.stats.misses == misses
+
+    def test_overlapping_view_reuses_tiles(self, tiled, view):
+        fractal = MandelbrotSet(max_iter=100)
+        tiled.render(fractal, view)
+        moved = view.translated(20, -10)
+        misses = tiled.cache.stats.misses
+        result = tiled.render(fractal, moved)
+        assert np.array_equal(result, fractal.compute_array(moved.grid(), output="counts"))
+        assert tiled.cache.stats.misses - misses < len(tiled.tile_keys(fractal, moved)) / 2
+
+    def test_parameters_are_part_of_the_key(self, tiled, view):
+        tiled.render(JuliaSet(c_real=-0.4, c_imag=0.6, max_iter=100), view)
+        other = JuliaSet(c_real=0.285, c_imag=0.01, max_iter=100)
+        assert tiled.lookup(other, view) is None
+        assert np.array_equal(tiled.render(other, view), other.compute_array(view.grid(), output="counts"))
+
+    def test_cancelled_render(self, tiled, view):
+        cancel = threading.Event()
+        cancel.set()
+        assert tiled.render(MandelbrotSet(), view, cancel=cancel) is None
+
+    def test_known_pixels_are_not_recomputed(self, tiled, view):
+        fractal = MandelbrotSet(max_iter=100)
+        expected = fractal.compute_array(view.grid(), output="smooth")
+        preview = next(p for p in ProgressiveRenderer(workers=1).passes(fractal, view) if p.step == 2)
+        known = np.zeros(view.shape, dtype=bool)
+        known[::2, ::2] = True
+        assert np.array_equal(tiled.render(fractal, view, output="smooth", out=preview.frame.copy(), known=known), expected)
+        # Known samples are taken from out as they are, not evaluated
+        tiled.cache.clear()
+        out = expected.copy()
+        out[known] = -1.0
+        result = tiled.render(fractal, view, output="smooth", out=out, known=known)
+        assert np.all(result[known] == -1.0)
+        assert np.array_equal(result[~known], expected[~known])
+
+    def test_known_requires_out(self, tiled, view):
+        with pytest.raises(ValueError):
+            tiled.render(MandelbrotSet(), view, known=np.zeros(view.shape, dtype=bool))
+
+
+class TestResumableRenderer:
+    # Tests for rendering views to resumable escape states
+
+    @pytest.fixture
+    def resumable(self):
+        with ResumableRenderer(workers=3, band_height=8) as r:
+            yield r
+
+    def test_render_matches_single_pass(self, resumable, view):
+        fractal = JuliaSet(max_iter=100)
+        state = resumable.render(fractal, view)
+        assert state.z.shape == view.shape
+        assert np.array_equal(fractal.from_state(state, "smooth"), fractal.compute_array(view.grid(), output="smooth"))
+
+    def test_resume_matches_single_pass(self, resumable, view):
+        state = resumable.render(MandelbrotSet(max_iter=50), view)
+        fractal = MandelbrotSet(max_iter=250)
+        resumed = resumable.resume(fractal, state)
+        assert np.array_equal(fractal.from_state(resumed, "counts"), fractal.compute_array(view.grid(), output="counts"))
+
+    def test_deepen_stops_once_the_image_settles(self, resumable, view):
+        fractal = MandelbrotSet(max_iter=20)
+        state = resumable.render(fractal, view)
+        passes = list(resumable.deepen(fractal, state, step=50, limit=5000, tolerance=0.0))
+        iterations = [result.iterations for result in passes]
+        assert iterations == list(range(70, 50 * len(passes) + 21, 50))
+        assert iterations[-1] < 5000
+        # The last pass let no pixel escape
+        assert np.array_equal(passes[-1].escaped, passes[-2].escaped)
+
+    def test_deepen_respects_the_limit(self, resumable, view):
+        fractal = MandelbrotSet(max_iter=20)
+        state = resumable.render(fractal, view)
+        passes = list(resumable.deepen(fractal, state, step=30, limit=100, tolerance=0.0))
+        assert passes[-1].iterations == 100
+
+    def test_passes_refine_to_a_resumable_state(self, resumable, view):
+        fractal = MandelbrotSet(max_iter=50)
+        expected = fractal.compute_array(view.grid(), output="smooth")
+        steps = []
+        for step, state in resumable.passes(fractal, view):
+            steps.append(step)
+            smooth = fractal.from_state(state, "smooth")
+            assert np.array_equal(smooth[::step, ::step], expected[::step, ::step])
+        assert steps == [8, 4, 2, 1]
+        assert np.array_equal(smooth, expected)
+        deeper = MandelbrotSet(max_iter=200)
+        resumed = resumable.resume(deeper, state)
+        assert np.array_equal(deeper.from_state(resumed, "smooth"), deeper.compute_array(view.grid(), output="smooth"))
+
+    def test_cancelled_render(self, resumable, view):
+        cancel = threading.Event()
+        cancel.set()
+        assert resumable.render(MandelbrotSet(), view, cancel=cancel) is None
+        assert list(resumable.passes(MandelbrotSet(), view, cancel=cancel)) == []
+
+    def test_key_ignores_only_max_iter(self):
+        assert resumable_key(MandelbrotSet(max_iter=50)) == resumable_key(MandelbrotSet(max_iter=500))
+        assert resumable_key(JuliaSet(c_real=0.1)) != resumable_key(JuliaSet(c_real=0.2))
+
+
+class TestAnimation:
+    # Tests for keyframe interpolation and the zoom animation renderer
+
+    @pytest.fixture
+    def base(self):
+        return View(0.0, 0.0, 1.75, 1.0, width=48, height=32)
+
+    def test_interpolation_hits_keyframes_and_zooms_geometrically(self, base):
+        keyframes = [Keyframe(0, -0.5, 0.0, 1.0, 100), Keyframe(10, -0.75, 0.1, 100.0, 300)]
+        frames = interpolate_keyframes(MandelbrotSet(max_iter=50), keyframes, base)
+        assert [frame.number for frame in frames] == list(range(11))
+        assert (frames[0].view.center_x, frames[0].view.half_width) == (-0.5, 1.75)
+        assert frames[-1].view.center_x == pytest.approx(-0.75)
+        assert frames[-1].view.half_width == pytest.approx(0.0175)
+        assert frames[5].view.half_width == pytest.approx(0.175)
+        assert [frames[i].fractal.max_iter for i in (0, 5, 10)] == [100, 200, 300]
+        # The center crosses the screen at a constant speed: the same fraction of the view width each frame
+        travel = [
+            (frames[i + 1].view.center_x - frames[i].view.center_x) / frames[i].view.half_width
+            for i in range(10)
+        ]
+        assert np.allclose(travel, travel[0])
+
+    def test_interpolates_julia_constant(self, base):
+        keyframes = [Keyframe(0, 0.0, 0.0, 1.0, 50, -0.8, 0.1), Keyframe(4, 0.0, 0.0, 1.0, 50, -0.7, 0.3)]
+        frames = interpolate_keyframes(JuliaSet(max_iter=50), keyframes, base)
+        assert frames[2].fractal.c_real == pytest.approx(-0.75)
+        assert frames[2].fractal.c_imag == pytest.approx(0.2)
+        assert frames[2].view.center_x == 0.0
+
+    @pytest.mark.parametrize("keyframes", [
+        [],
+        [Keyframe(0, 0.0, 0.0, 1.0, 50), Keyframe(0, 0.0, 0.0, 2.0, 50)],
+        [Keyframe(0, 0.0, 0.0, 0.0, 50)],
+    ])
+    def test_invalid_keyframes(self, base, keyframes):
+        with pytest.raises(ValueError):
+            interpolate_keyframes(MandelbrotSet(), keyframes, base)
+
+    def test_full_scale_references_match_direct_renders(self, base, renderer):
+        fractal = JuliaSet(max_iter=60)
+        keyframes = [Keyframe(0, 0.0, 0.0, 1.0, 40), Keyframe(5, 0.1, 0.05, 3.0, 60)]
+        with AnimationRenderer(workers=2, max_pending=2, reference_scale=1.0) as animation:
+            frames = list(animation.render(fractal, keyframes, base, FractalExporter.shade))
+        expected = [
+            FractalExporter.shade(renderer.render(frame.fractal, frame.view, output="smooth"), frame.fractal.max_iter)
+            for frame in interpolate_keyframes(fractal, keyframes, base)
+        ]
+        assert len(frames) == 6
+        for frame, direct in zip(frames, expected):
+            assert np.array_equal(frame, direct)
+
+    def test_zoom_frames_are_resampled_from_shared_references(self, base):
+        keyframes = [Keyframe(0, -0.5, 0.0, 1.0, 50), Keyframe(8, -0.5, 0.0, 4.0, 50)]
+        with AnimationRenderer(workers=2) as animation:
+            frames = list(animation.render(MandelbrotSet(max_iter=50), keyframes, base, FractalExporter.shade))
+            references = len(animation.cache)
+        assert len(frames) == 9
+        assert all(frame.shape == (32, 48) and frame.dtype == np.uint8 for frame in frames)
+        # One 2x reference per halving of the width: frames 0, 4 and 8
+        tiles_per_reference = len(TiledRenderer(TileCache()).tile_keys(MandelbrotSet(), View(-0.5, 0.0, 1.75, 1.0, 96, 64)))
+        assert references <= 3 * tiles_per_reference
+
+    def test_resample_frame_preserves_constant_frames(self):
+        base = View(0.0, 0.0, 1.0, 1.0, 40, 40)
+        frame = np.full((40, 40), 7, dtype=np.uint8)
+        out = resample_frame(base, frame, View(0.3, -0.2, 0.4, 0.4, 25, 25))
+        assert out.shape == (25, 25) and out.dtype == np.uint8
+        assert np.all(out == 7)
+
+    def test_closing_the_generator_stops_rendering(self, base):
+        keyframes = [Keyframe(0, -0.5, 0.0, 1.0, 50), Keyframe(40, -0.5, 0.0, 1e6, 50)]
+        with AnimationRenderer(workers=2, max_pending=2) as animation:
+            frames = animation.render(MandelbrotSet(max_iter=50), keyframes, base, FractalExporter.shade)
+            next(frames)
+            frames.close()
+
+    def test_invalid_options(self):
+        with pytest.raises(ValueError):
+            AnimationRenderer(reference_scale=0.5)
+        with pytest.raises(ValueError):
+            AnimationRenderer(max_pending=0)
+
+
+class TestPosterRenderer:
+    # Tests for tile-by-tile rendering into a streaming sink
+
+    class Sink:
+        def __init__(self, view, channels=()):
+            self.image = np.zeros(view.shape + channels, dtype=np.uint8)
+            self.order = []
+
+        def write_tile(self, top, left, tile):
+            self.order.append((top, left))
+            self.image[top:top + tile.shape[0], left:left + tile.shape[1]] = tile
+
+    def test_tiles_cover_the_view(self, view):
+        tiles = poster_tiles(view, 32)
+        assert len(tiles) == 3 * 2
+        assert sum(tile.height * tile.width for tile in tiles) == view.width * view.height
+        assert tiles[-1] == (32, 64, 21, 26)
+
+    @pytest.mark.parametrize("fractal", [MandelbrotSet(max_iter=60), JuliaSet(max_iter=60)])
+    def test_matches_a_single_render_in_row_order(self, view, renderer, fractal):
+        sink = self.Sink(view)
+        progress = []
+        with PosterRenderer(workers=3, tile_size=16, max_pending=2) as poster:
+            assert poster.render(fractal, view, sink, FractalExporter.shade, progress=lambda done, total: progress.append(done))
+        expected = FractalExporter.shade(renderer.render(fractal, view, output="smooth"), fractal.max_iter)
+        assert np.array_equal(sink.image, expected)
+        assert sink.order == [(tile.top, tile.left) for tile in poster_tiles(view, 16)]
+        assert progress == list(range(1, len(sink.order) + 1))
+
+    @pytest.mark.parametrize("samples", [1, 3])
+    def test_equalized_poster_matches_a_single_render(self, view, renderer, samples):
+        fractal = MandelbrotSet(max_iter=60)
+        colormap = ColorMap("grayscale")
+        sink = self.Sink(view, (3,))
+        progress = []
+        with PosterRenderer(workers=3, tile_size=16, max_pending=2) as poster:
+            assert poster.render(
+                fractal, view, sink, colormap, progress=lambda done, total: progress.append((done, total)),
+                antialias=samples, equalize=colormap.equalized
+            )
+        smooth = renderer.render(fractal, view, output="smooth")
+        plain = colormap.equalized(iteration_histogram(smooth, fractal.max_iter))(smooth, fractal.max_iter)
+        if samples == 1:
+            assert np.array_equal(sink.image, plain)
+        else:
+            # Only the supersampled edge pixels differ from the plain equalized frame
+            mask = refine_mask(smooth, fractal.max_iter)
+            assert np.array_equal(sink.image[~mask], plain[~mask])
+        tiles = len(poster_tiles(view, 16))
+        assert progress == [(done, 2 * tiles) for done in range(1, 2 * tiles + 1)]
+
+    def test_cancel(self, view):
+        cancel = threading.Event()
+        cancel.set()
+        with PosterRenderer(workers=2, tile_size=16) as poster:
+            assert not poster.render(MandelbrotSet(), view, self.Sink(view), FractalExporter.shade, cancel=cancel)
+            assert not poster.render(
+                MandelbrotSet(), view, self.Sink(view), FractalExporter.shade, cancel=cancel,
+                equalize=lambda histogram: FractalExporter.shade
+            )
+
+    def test_invalid_options(self):
+        with pytest.raises(ValueError):
+            PosterRenderer(tile_size=0)
+        with pytest.raises(ValueError):
+            PosterRenderer(max_pending=0)
+
+
+class TestHistogram:
+    # Tests for iteration histograms and their cumulative distribution
+
+    def test_counts_escaping_points_at_whole_counts(self):
+        counts = np.array([[0, 1, 1], [3, 4, 4]], dtype=np.uint16)
+        assert iteration_histogram(counts, 4).tolist() == [1, 2, 0, 1]
+        smooth = np.array([0.5, 1.2, 1.9, 3.99, 4.0, 7.5], dtype=np.float32)
+        assert iteration_histogram(smooth, 4).tolist() == [1, 2, 0, 1]
+        with pytest.raises(ValueError):
+            iteration_histogram(counts, 0)
+
+    def test_histograms_of_tiles_add_up(self, view, renderer):
+        fractal = MandelbrotSet(max_iter=60)
+        smooth = renderer.render(fractal, view, output="smooth")
+        parts = sum(iteration_histogram(smooth[top:top + 16], 60) for top in range(0, view.height, 16))
+        assert np.array_equal(parts, iteration_histogram(smooth, 60))
+        assert parts.sum() == np.count_nonzero(smooth < 60)
+
+    def test_cumulative_distribution(self):
+        below, share = cumulative_distribution(np.array([1, 0, 3]))
+        assert below.tolist() == pytest.approx([0.0, 0.25, 0.25])
+        assert share.tolist() == pytest.approx([0.25, 0.0, 0.75])
+        below, share = cumulative_distribution(np.zeros(3, dtype=np.int64))
+        assert not below.any() and not share.any()
+
+
+class TestAntialias:
+    # Tests for variance-driven adaptive supersampling
+
+    def dense(self, fractal, view, samples=8):
+        # Full supersampling of every pixel on a regular grid, as the reference
+        x, y = np.meshgrid(view.x_coords(np.float64), view.y_coords(np.float64))
+        means = supersample(
+            fractal, x.ravel(), y.ravel(), (view.column_step, view.row_step), FractalExporter.shade, samples,
+            jitter=False
+        )
+        return means.reshape(view.shape)
+
+    def test_local_variance(self):
+        values = np.zeros((5, 5))
+        values[2, 2] = 9.0
+        variance = local_variance(values)
+        assert variance[0, 0] == 0.0
+        assert variance[1, 1] == pytest.approx(8.0)
+        assert variance[2, 2] == pytest.approx(8.0)
+
+    def test_mask_follows_the_boundary(self, view, renderer):
+        fractal = MandelbrotSet(max_iter=80)
+        smooth = renderer.render(fractal, view, output="smooth")
+        mask = refine_mask(smooth, fractal.max_iter)
+        interior = smooth >= fractal.max_iter
+        assert 0 < mask.mean() < 0.5
+        # Every interior pixel next to an exterior one is refined
+        boundary = interior & ~np.pad(interior, 1, mode="edge")[2:, 1:-1]
+        assert mask[boundary].all()
+
+    def test_single_sample_is_plain_shading(self, view, renderer):
+        fractal = JuliaSet(max_iter=60)
+        smooth = renderer.render(fractal, view, output="smooth")
+        pixels, stats = antialias(fractal, view, smooth, FractalExporter.shade, samples=1)
+        assert np.array_equal(pixels, FractalExporter.shade(smooth, 60))
+        assert (stats.refined, stats.samples) == (0, 0)
+
+    def test_approaches_full_supersampling(self, view, renderer):
+        fractal = MandelbrotSet(max_iter=100)
+        smooth = renderer.render(fractal, view, output="smooth")
+        reference = self.dense(fractal, view)
+        pixels, stats = antialias(fractal, view, smooth, FractalExporter.shade, samples=4)
+        plain = np.abs(FractalExporter.shade(smooth, 100) - reference).mean()
+        assert np.abs(pixels - reference).mean() < 0.5 * plain
+        assert stats.refined_fraction < 0.5
+        assert stats.samples == 16 * stats.refined
+        again, _ = antialias(fractal, view, smooth, FractalExporter.shade, samples=4)
+        assert np.array_equal(pixels, again)
+
+    def test_cancel(self, view, renderer):
+        fractal = MandelbrotSet(max_iter=50)
+        smooth = renderer.render(fractal, view, output="smooth")
+        cancel = threading.Event()
+        cancel.set()
+        assert antialias(fractal, view, smooth, FractalExporter.shade, cancel=cancel) is None
+
+    def test_poster_tiles_see_across_borders(self, view, renderer):
+        fractal = MandelbrotSet(max_iter=80)
+        smooth = renderer.render(fractal, view, output="smooth")
+        plain = FractalExporter.shade(smooth, 80)
+        sink = TestPosterRenderer.Sink(view)
+        with PosterRenderer(workers=2, tile_size=16) as poster:
+            assert poster.render(fractal, view, sink, FractalExporter.shade, antialias=4)
+        changed = sink.image != plain
+        assert changed.any()
+        # Only pixels the whole-frame mask selects are supersampled, tile borders included
+        assert not (changed & ~refine_mask(smooth, 80)).any()